@@ -0,0 +1,57 @@
+"""Resumen desnormalizado de licitaciones por etapa
+
+Revision ID: 2b7e4c91d0a3
+Revises: 6930eb0fb90e
+Create Date: 2026-10-19 11:40:05.327816
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2b7e4c91d0a3'
+down_revision: Union[str, Sequence[str], None] = '6930eb0fb90e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('resumen_etapas',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('etapa', sa.String(), nullable=False),
+    sa.Column('codigo_estado', sa.Integer(), nullable=True),
+    sa.Column('tramo_puntaje', sa.Integer(), nullable=False),
+    sa.Column('cantidad', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_resumen_etapas_id'), 'resumen_etapas', ['id'], unique=False)
+    op.create_index(op.f('ix_resumen_etapas_etapa'), 'resumen_etapas', ['etapa'], unique=False)
+
+    # Carga inicial de los contadores. Los tramos replican LIMITES_TRAMOS_PUNTAJE
+    # (0, 1, 50, 100, 200); las ingestas posteriores los recalculan desde la aplicación.
+    op.execute("""
+        INSERT INTO resumen_etapas (etapa, codigo_estado, tramo_puntaje, cantidad)
+        SELECT COALESCE(etapa, 'candidata'), codigo_estado,
+               CASE
+                   WHEN COALESCE(puntaje, 0) < 0 THEN 0
+                   WHEN COALESCE(puntaje, 0) < 1 THEN 1
+                   WHEN puntaje < 50 THEN 2
+                   WHEN puntaje < 100 THEN 3
+                   WHEN puntaje < 200 THEN 4
+                   ELSE 5
+               END AS tramo,
+               COUNT(*)
+        FROM licitaciones
+        GROUP BY 1, 2, 3
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_resumen_etapas_etapa'), table_name='resumen_etapas')
+    op.drop_index(op.f('ix_resumen_etapas_id'), table_name='resumen_etapas')
+    op.drop_table('resumen_etapas')
@@ -0,0 +1,42 @@
+"""Archivo comprimido de respuestas crudas de la API
+
+Revision ID: 3d7f1e9a6c25
+Revises: 5e9b7c3a2f18
+Create Date: 2026-10-19 17:35:02.118430
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3d7f1e9a6c25'
+down_revision: Union[str, Sequence[str], None] = '5e9b7c3a2f18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('payloads_api',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('tipo', sa.String(), nullable=False),
+    sa.Column('clave', sa.String(), nullable=False),
+    sa.Column('compresion', sa.String(), nullable=False),
+    sa.Column('contenido', sa.LargeBinary(), nullable=False),
+    sa.Column('tamanio_original', sa.Integer(), nullable=False),
+    sa.Column('fecha_captura', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('tipo', 'clave', name='uq_payloads_api_tipo_clave')
+    )
+    op.create_index(op.f('ix_payloads_api_id'), 'payloads_api', ['id'], unique=False)
+    # El contenido ya está comprimido: evitamos que TOAST intente comprimirlo de nuevo
+    op.execute("ALTER TABLE payloads_api ALTER COLUMN contenido SET STORAGE EXTERNAL")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_payloads_api_id'), table_name='payloads_api')
+    op.drop_table('payloads_api')
@@ -0,0 +1,48 @@
+"""Items estructurados de licitaciones
+
+Revision ID: 5e9b7c3a2f18
+Revises: 8f3a2d6b1c47
+Create Date: 2026-10-19 16:48:10.271554
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e9b7c3a2f18'
+down_revision: Union[str, Sequence[str], None] = '8f3a2d6b1c47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Las licitaciones existentes solo conservan el texto formateado de productos;
+    # sus ítems se poblarán cuando se vuelva a descargar su ficha completa.
+    op.create_table('licitacion_items',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('licitacion_id', sa.Integer(), nullable=False),
+    sa.Column('correlativo', sa.Integer(), nullable=True),
+    sa.Column('codigo_producto', sa.String(), nullable=True),
+    sa.Column('codigo_categoria', sa.String(), nullable=True),
+    sa.Column('nombre_producto', sa.String(), nullable=True),
+    sa.Column('descripcion', sa.Text(), nullable=True),
+    sa.Column('unidad_medida', sa.String(), nullable=True),
+    sa.Column('cantidad', sa.Float(), nullable=True),
+    sa.ForeignKeyConstraint(['licitacion_id'], ['licitaciones.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_licitacion_items_id'), 'licitacion_items', ['id'], unique=False)
+    op.create_index(op.f('ix_licitacion_items_licitacion_id'), 'licitacion_items', ['licitacion_id'], unique=False)
+    op.create_index(op.f('ix_licitacion_items_codigo_producto'), 'licitacion_items', ['codigo_producto'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_licitacion_items_codigo_producto'), table_name='licitacion_items')
+    op.drop_index(op.f('ix_licitacion_items_licitacion_id'), table_name='licitacion_items')
+    op.drop_index(op.f('ix_licitacion_items_id'), table_name='licitacion_items')
+    op.drop_table('licitacion_items')
@@ -0,0 +1,39 @@
+"""Busqueda de texto completo en licitaciones
+
+Revision ID: 6930eb0fb90e
+Revises: a89730e624a7
+Create Date: 2026-10-19 09:12:41.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6930eb0fb90e'
+down_revision: Union[str, Sequence[str], None] = 'a89730e624a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Columna generada (PostgreSQL 12+): se recalcula sola en cada INSERT/UPDATE.
+    # Pesos: A = nombre, B = descripción, C = productos (afectan a ts_rank).
+    op.execute("""
+        ALTER TABLE licitaciones ADD COLUMN busqueda tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('spanish', coalesce(nombre, '')), 'A') ||
+            setweight(to_tsvector('spanish', coalesce(descripcion, '')), 'B') ||
+            setweight(to_tsvector('spanish', coalesce(detalle_productos, '')), 'C')
+        ) STORED
+    """)
+    op.create_index('ix_licitaciones_busqueda', 'licitaciones', ['busqueda'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_licitaciones_busqueda', table_name='licitaciones')
+    op.drop_column('licitaciones', 'busqueda')
@@ -0,0 +1,91 @@
+"""Separar textos extensos de licitaciones en licitacion_detalle
+
+Revision ID: 8f3a2d6b1c47
+Revises: c41d8a5f7e20
+Create Date: 2026-10-19 15:22:48.905132
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f3a2d6b1c47'
+down_revision: Union[str, Sequence[str], None] = 'c41d8a5f7e20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('licitacion_detalle',
+    sa.Column('licitacion_id', sa.Integer(), nullable=False),
+    sa.Column('descripcion', sa.Text(), nullable=True),
+    sa.Column('detalle_productos', sa.Text(), nullable=True),
+    sa.Column('justificacion_puntaje', sa.Text(), nullable=True),
+    sa.ForeignKeyConstraint(['licitacion_id'], ['licitaciones.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('licitacion_id')
+    )
+
+    # Solo se trasladan las filas que tienen algún texto que conservar
+    op.execute("""
+        INSERT INTO licitacion_detalle (licitacion_id, descripcion, detalle_productos, justificacion_puntaje)
+        SELECT id, descripcion, detalle_productos, justificacion_puntaje
+        FROM licitaciones
+        WHERE descripcion IS NOT NULL
+           OR detalle_productos IS NOT NULL
+           OR COALESCE(justificacion_puntaje, '') <> ''
+    """)
+
+    # La columna generada dependía de los textos que se eliminan de la tabla principal
+    op.drop_index('ix_licitaciones_busqueda', table_name='licitaciones')
+    op.drop_column('licitaciones', 'busqueda')
+    op.drop_column('licitaciones', 'descripcion')
+    op.drop_column('licitaciones', 'detalle_productos')
+    op.drop_column('licitaciones', 'justificacion_puntaje')
+
+    # Búsqueda de texto completo repartida: índice por expresión sobre el nombre (peso A)
+    # y columna generada en el detalle para descripción (B) y productos (C).
+    op.execute("""
+        CREATE INDEX ix_licitaciones_nombre_tsv ON licitaciones
+        USING gin (to_tsvector('spanish', coalesce(nombre, '')))
+    """)
+    op.execute("""
+        ALTER TABLE licitacion_detalle ADD COLUMN busqueda tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('spanish', coalesce(descripcion, '')), 'B') ||
+            setweight(to_tsvector('spanish', coalesce(detalle_productos, '')), 'C')
+        ) STORED
+    """)
+    op.create_index('ix_licitacion_detalle_busqueda', 'licitacion_detalle', ['busqueda'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_licitacion_detalle_busqueda', table_name='licitacion_detalle')
+    op.execute("DROP INDEX IF EXISTS ix_licitaciones_nombre_tsv")
+
+    op.add_column('licitaciones', sa.Column('justificacion_puntaje', sa.Text(), nullable=True))
+    op.add_column('licitaciones', sa.Column('detalle_productos', sa.Text(), nullable=True))
+    op.add_column('licitaciones', sa.Column('descripcion', sa.Text(), nullable=True))
+    op.execute("""
+        UPDATE licitaciones l
+        SET descripcion = d.descripcion,
+            detalle_productos = d.detalle_productos,
+            justificacion_puntaje = d.justificacion_puntaje
+        FROM licitacion_detalle d
+        WHERE d.licitacion_id = l.id
+    """)
+    op.drop_table('licitacion_detalle')
+
+    op.execute("""
+        ALTER TABLE licitaciones ADD COLUMN busqueda tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('spanish', coalesce(nombre, '')), 'A') ||
+            setweight(to_tsvector('spanish', coalesce(descripcion, '')), 'B') ||
+            setweight(to_tsvector('spanish', coalesce(detalle_productos, '')), 'C')
+        ) STORED
+    """)
+    op.create_index('ix_licitaciones_busqueda', 'licitaciones', ['busqueda'], unique=False, postgresql_using='gin')
@@ -0,0 +1,54 @@
+"""Bitácora de ingesta para reanudar extracciones por rango
+
+Revision ID: 9b2e6f4d8a13
+Revises: 3d7f1e9a6c25
+Create Date: 2026-10-19 18:42:37.604911
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b2e6f4d8a13'
+down_revision: Union[str, Sequence[str], None] = '3d7f1e9a6c25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('bitacora_ingesta_dias',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('fecha', sa.Date(), nullable=False),
+    sa.Column('estado', sa.String(), nullable=False),
+    sa.Column('total_licitaciones', sa.Integer(), nullable=False),
+    sa.Column('actualizado', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('fecha')
+    )
+    op.create_index(op.f('ix_bitacora_ingesta_dias_id'), 'bitacora_ingesta_dias', ['id'], unique=False)
+
+    op.create_table('bitacora_ingesta_licitaciones',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('fecha', sa.Date(), nullable=False),
+    sa.Column('codigo_externo', sa.String(), nullable=False),
+    sa.Column('etapa', sa.String(), nullable=False),
+    sa.Column('estado_descarga', sa.String(), nullable=True),
+    sa.Column('actualizado', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('fecha', 'codigo_externo', name='uq_bitacora_ingesta_fecha_codigo')
+    )
+    op.create_index(op.f('ix_bitacora_ingesta_licitaciones_id'), 'bitacora_ingesta_licitaciones', ['id'], unique=False)
+    op.create_index(op.f('ix_bitacora_ingesta_licitaciones_fecha'), 'bitacora_ingesta_licitaciones', ['fecha'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_bitacora_ingesta_licitaciones_fecha'), table_name='bitacora_ingesta_licitaciones')
+    op.drop_index(op.f('ix_bitacora_ingesta_licitaciones_id'), table_name='bitacora_ingesta_licitaciones')
+    op.drop_table('bitacora_ingesta_licitaciones')
+    op.drop_index(op.f('ix_bitacora_ingesta_dias_id'), table_name='bitacora_ingesta_dias')
+    op.drop_table('bitacora_ingesta_dias')
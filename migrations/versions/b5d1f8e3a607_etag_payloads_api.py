@@ -0,0 +1,28 @@
+"""ETag de las respuestas archivadas de la API
+
+Revision ID: b5d1f8e3a607
+Revises: e4a8c2f7b913
+Create Date: 2026-10-19 21:04:12.517306
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d1f8e3a607'
+down_revision: Union[str, Sequence[str], None] = 'e4a8c2f7b913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('payloads_api', sa.Column('etag', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('payloads_api', 'etag')
@@ -0,0 +1,52 @@
+"""Tabla de archivo para licitaciones no vigentes
+
+Revision ID: c41d8a5f7e20
+Revises: 2b7e4c91d0a3
+Create Date: 2026-10-19 13:05:22.640913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41d8a5f7e20'
+down_revision: Union[str, Sequence[str], None] = '2b7e4c91d0a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('licitaciones_archivo',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('codigo_externo', sa.String(), nullable=True),
+    sa.Column('nombre', sa.String(), nullable=True),
+    sa.Column('descripcion', sa.Text(), nullable=True),
+    sa.Column('puntaje', sa.Integer(), nullable=True),
+    sa.Column('justificacion_puntaje', sa.Text(), nullable=True),
+    sa.Column('etapa', sa.String(), nullable=True),
+    sa.Column('detalle_productos', sa.Text(), nullable=True),
+    sa.Column('fecha_cierre', sa.DateTime(), nullable=True),
+    sa.Column('fecha_inicio', sa.DateTime(), nullable=True),
+    sa.Column('fecha_publicacion', sa.DateTime(), nullable=True),
+    sa.Column('fecha_adjudicacion', sa.DateTime(), nullable=True),
+    sa.Column('codigo_estado', sa.Integer(), nullable=True),
+    sa.Column('codigo_organismo', sa.String(), nullable=True),
+    sa.Column('tiene_detalle', sa.Boolean(), nullable=True),
+    sa.Column('fecha_archivado', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['codigo_estado'], ['estados_licitacion.codigo'], ),
+    sa.ForeignKeyConstraint(['codigo_organismo'], ['organismos.codigo'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_licitaciones_archivo_id'), 'licitaciones_archivo', ['id'], unique=False)
+    op.create_index(op.f('ix_licitaciones_archivo_codigo_externo'), 'licitaciones_archivo', ['codigo_externo'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_licitaciones_archivo_codigo_externo'), table_name='licitaciones_archivo')
+    op.drop_index(op.f('ix_licitaciones_archivo_id'), table_name='licitaciones_archivo')
+    op.drop_table('licitaciones_archivo')
@@ -0,0 +1,42 @@
+"""Cola persistente de reintentos de fichas de detalle
+
+Revision ID: e4a8c2f7b913
+Revises: 9b2e6f4d8a13
+Create Date: 2026-10-19 19:27:51.330874
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a8c2f7b913'
+down_revision: Union[str, Sequence[str], None] = '9b2e6f4d8a13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('cola_reintentos_detalle',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('codigo_externo', sa.String(), nullable=False),
+    sa.Column('fecha_listado', sa.Date(), nullable=True),
+    sa.Column('intentos', sa.Integer(), nullable=False),
+    sa.Column('proximo_intento', sa.DateTime(), nullable=False),
+    sa.Column('ultimo_estado', sa.String(), nullable=True),
+    sa.Column('creado', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('codigo_externo')
+    )
+    op.create_index(op.f('ix_cola_reintentos_detalle_id'), 'cola_reintentos_detalle', ['id'], unique=False)
+    op.create_index(op.f('ix_cola_reintentos_detalle_proximo_intento'), 'cola_reintentos_detalle', ['proximo_intento'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_cola_reintentos_detalle_proximo_intento'), table_name='cola_reintentos_detalle')
+    op.drop_index(op.f('ix_cola_reintentos_detalle_id'), table_name='cola_reintentos_detalle')
+    op.drop_table('cola_reintentos_detalle')
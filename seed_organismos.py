@@ -1,75 +1,129 @@
+import sys
+import time
 import pandas as pd
-from src.bd.database import SessionLocal, engine
+from sqlalchemy import select, insert, update
+from src.bd.database import SessionLocal
 from src.bd.models import Organismo
+from src.config.constantes import TAMANIO_BLOQUE_SEMILLA_ORGANISMOS
 
-def cargar_organismos_desde_csv():
+ARCHIVO_CSV_POR_DEFECTO = "Listado organismos compradores.csv"
+COLUMNA_CODIGO = 'Código'
+COLUMNA_NOMBRE = 'Nombre de la institución'
+
+
+def _leer_bloques_csv(archivo_csv: str, tamanio_bloque: int):
+    """
+    Lee el directorio en bloques para acotar el uso de memoria con archivos
+    de cualquier tamaño. Solo se cargan las columnas relevantes y como texto,
+    evitando que pandas interprete los códigos como números.
+    """
+    return pd.read_csv(
+        archivo_csv, sep=';', encoding='utf-8-sig', dtype=str,
+        usecols=[COLUMNA_CODIGO, COLUMNA_NOMBRE], chunksize=tamanio_bloque
+    )
+
+
+def _clasificar_bloque(bloque: pd.DataFrame, existentes: dict):
+    """
+    Compara un bloque del CSV con el mapa en memoria {codigo: nombre} de la BD.
+    Retorna las filas a insertar, las renombradas y la cantidad sin cambios.
+    """
+    bloque = bloque.dropna(subset=[COLUMNA_CODIGO])
+    codigos = bloque[COLUMNA_CODIGO].str.strip()
+    nombres = bloque[COLUMNA_NOMBRE].fillna("").str.strip()
+
+    nuevos, renombrados = {}, {}
+    sin_cambios = 0
+    for codigo, nombre in zip(codigos, nombres):
+        if not codigo:
+            continue
+        if codigo not in existentes:
+            # Ante códigos repetidos en el archivo prevalece la última aparición
+            nuevos[codigo] = {"codigo": codigo, "nombre": nombre, "puntaje": 0}
+        elif existentes[codigo] != nombre:
+            renombrados[codigo] = {"codigo": codigo, "nombre": nombre}
+        else:
+            sin_cambios += 1
+
+    return list(nuevos.values()), list(renombrados.values()), sin_cambios
+
+
+def cargar_organismos_desde_csv(archivo_csv: str = ARCHIVO_CSV_POR_DEFECTO,
+                                session_factory=SessionLocal,
+                                tamanio_bloque: int = TAMANIO_BLOQUE_SEMILLA_ORGANISMOS):
+    """
+    Carga masiva del directorio de organismos compradores.
+
+    Los códigos existentes se obtienen en una única consulta y la comparación
+    se realiza en memoria. Cada bloque del CSV se persiste con un INSERT y un
+    UPDATE por clave primaria ejecutados como sentencias por lotes (executemany),
+    en lugar de un SELECT y un flush por fila.
+    """
     print("="*60)
     print("INICIANDO CARGA MASIVA DE ORGANISMOS")
     print("="*60)
-    
-    archivo_csv = "Listado organismos compradores.csv"
-    
+
+    resumen = {"nuevos": 0, "actualizados": 0, "sin_cambios": 0, "filas": 0}
+    session = None
+
     try:
-        # 1. Leer el CSV con Pandas
-        df = pd.read_csv(archivo_csv, sep=';', encoding='utf-8')
-        
-        print(f"Archivo leído correctamente. Filas encontradas: {len(df)}")
-        print("Columnas detectadas:", df.columns.tolist())
-        
-        # 2. Conectar a la Base de Datos
-        # Eliminada la instrucción Base.metadata.create_all()
+        bloques = _leer_bloques_csv(archivo_csv, tamanio_bloque)
+
         # La estructura de la base de datos debe gestionarse vía Alembic
-        session = SessionLocal()
-        
-        contador_nuevos = 0
-        contador_existentes = 0
-        
+        session = session_factory()
+
+        existentes = dict(session.execute(select(Organismo.codigo, Organismo.nombre)).all())
+        print(f"Organismos registrados en base de datos: {len(existentes)}")
         print("\nProcesando registros...")
-        
-        # 3. Iterar y Guardar
-        for index, row in df.iterrows():
-            codigo_str = str(row['Código']).strip()
-            nombre_org = str(row['Nombre de la institución']).strip()
-            
-            organismo_existente = session.query(Organismo).filter_by(codigo=codigo_str).first()
-            
-            if organismo_existente:
-                if organismo_existente.nombre != nombre_org:
-                    organismo_existente.nombre = nombre_org
-                contador_existentes += 1
-            else:
-                nuevo_org = Organismo(
-                    codigo=codigo_str,
-                    nombre=nombre_org,
-                    puntaje=0
-                )
-                session.add(nuevo_org)
-                contador_nuevos += 1
-            
-            # Guardamos por lotes cada 100 registros para no saturar la RAM
-            if index % 100 == 0:
-                session.commit()
-                print(f"   ... procesados {index} registros")
-        
-        # Commit final
-        session.commit()
-        
+
+        inicio = time.perf_counter()
+        for bloque in bloques:
+            nuevos, renombrados, sin_cambios = _clasificar_bloque(bloque, existentes)
+
+            if nuevos:
+                session.execute(insert(Organismo), nuevos)
+            if renombrados:
+                session.execute(update(Organismo), renombrados)
+            session.commit()
+
+            # El mapa en memoria se mantiene al día para los bloques siguientes
+            for fila in nuevos + renombrados:
+                existentes[fila["codigo"]] = fila["nombre"]
+
+            resumen["nuevos"] += len(nuevos)
+            resumen["actualizados"] += len(renombrados)
+            resumen["sin_cambios"] += sin_cambios
+            resumen["filas"] += len(bloque)
+
+            transcurrido = max(time.perf_counter() - inicio, 1e-9)
+            print(f"   ... procesados {resumen['filas']} registros "
+                  f"({resumen['filas'] / transcurrido:,.0f} filas/s)")
+
+        transcurrido = max(time.perf_counter() - inicio, 1e-9)
+
         print("\n" + "="*60)
         print("CARGA COMPLETADA EXITOSAMENTE")
-        print(f"   - Organismos Nuevos agregados: {contador_nuevos}")
-        print(f"   - Organismos Existentes actualizados: {contador_existentes}")
-        print(f"   - Total en base de datos: {session.query(Organismo).count()}")
+        print(f"   - Organismos Nuevos agregados: {resumen['nuevos']}")
+        print(f"   - Organismos Existentes renombrados: {resumen['actualizados']}")
+        print(f"   - Organismos sin cambios: {resumen['sin_cambios']}")
+        print(f"   - Rendimiento: {resumen['filas'] / transcurrido:,.0f} filas/s "
+              f"en {transcurrido:.2f} s")
+        print(f"   - Total en base de datos: {len(existentes)}")
         print("="*60)
-        
+
     except FileNotFoundError:
-        print(f"Error: No se encuentra el archivo '{archivo_csv}' en la raíz.")
+        print(f"Error: No se encuentra el archivo '{archivo_csv}'.")
     except Exception as e:
+        if session is not None:
+            session.rollback()
         print(f"Error crítico: {e}")
         import traceback
         traceback.print_exc()
     finally:
-        if 'session' in locals():
+        if session is not None:
             session.close()
 
+    return resumen
+
 if __name__ == "__main__":
-    cargar_organismos_desde_csv()
\ No newline at end of file
+    cargar_organismos_desde_csv(*sys.argv[1:2])
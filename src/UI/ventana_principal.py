@@ -8,6 +8,16 @@ from src.UI.widgets.tab_candidatas import TabCandidatas
 from src.UI.widgets.tab_seguimiento import TabSeguimiento
 from src.UI.widgets.tab_ofertadas import TabOfertadas
 from src.UI.widgets.tab_herramientas import TabHerramientas
+from src.repositories.licitaciones_repository import RepositorioLicitaciones
+from src.config.constantes import EtapaLicitacion
+
+# Opciones del menú lateral: (texto, etapa cuyo total se muestra como contador)
+OPCIONES_MENU = [
+    ("Licitaciones Candidatas", EtapaLicitacion.CANDIDATA.value),
+    ("Licitaciones en Seguimiento", EtapaLicitacion.SEGUIMIENTO.value),
+    ("Licitaciones Ofertadas", EtapaLicitacion.OFERTADA.value),
+    ("Herramientas del Sistema", None),
+]
 
 class VentanaPrincipal(QMainWindow):
     """
@@ -18,6 +28,7 @@ class VentanaPrincipal(QMainWindow):
         super().__init__()
         self.setWindowTitle("Monitor de Licitaciones - Sistema de Evaluación Automática")
         self.resize(1100, 750)
+        self.repositorio = RepositorioLicitaciones()
 
         self.widget_principal = QWidget()
         self.setCentralWidget(self.widget_principal)
@@ -51,10 +62,9 @@ class VentanaPrincipal(QMainWindow):
         self.lista_menu = QListWidget()
         self.lista_menu.setObjectName("MenuLista")
         
-        self.agregar_boton_menu("Licitaciones Candidatas")
-        self.agregar_boton_menu("Licitaciones en Seguimiento")
-        self.agregar_boton_menu("Licitaciones Ofertadas")
-        self.agregar_boton_menu("Herramientas del Sistema")
+        for texto, _ in OPCIONES_MENU:
+            self.agregar_boton_menu(texto)
+        self.actualizar_contadores_menu()
 
         layout_menu.addWidget(self.lista_menu)
         self.layout_principal.addWidget(self.contenedor_menu)
@@ -86,14 +96,36 @@ class VentanaPrincipal(QMainWindow):
         self.vista_ofertadas.datos_actualizados_global.connect(self.invalidar_caches)
         
         self.vista_herramientas.datos_actualizados_global.connect(self.invalidar_caches)
+
+        # Movimientos puntuales: solo se ensucia la vista de la etapa destino
+        for vista in (self.vista_candidatas, self.vista_seguimiento, self.vista_ofertadas):
+            vista.licitacion_movida.connect(self.registrar_movimiento)
         
         self.layout_principal.addWidget(self.pila_vistas)
 
+    def actualizar_contadores_menu(self):
+        """Muestra junto a cada etapa su total, leído desde la tabla resumen (consulta instantánea)."""
+        totales = self.repositorio.obtener_totales_etapas()
+        for fila, (texto, etapa) in enumerate(OPCIONES_MENU):
+            if etapa is not None:
+                self.lista_menu.item(fila).setText(f"{texto} ({totales.get(etapa, 0)})")
+
     def invalidar_caches(self):
         """Ensucia las banderas de las tablas. Forzará una recarga cuando el usuario las visite."""
         self.vista_candidatas.marcar_como_desactualizada()
         self.vista_seguimiento.marcar_como_desactualizada()
         self.vista_ofertadas.marcar_como_desactualizada()
+        self.actualizar_contadores_menu()
+
+    def registrar_movimiento(self, etapa_origen: str, etapa_destino: str):
+        """
+        Invalidación dirigida tras mover una licitación: la vista de origen ya retiró
+        la fila localmente, por lo que solo la de destino debe recargarse al visitarla.
+        """
+        for vista in (self.vista_candidatas, self.vista_seguimiento, self.vista_ofertadas):
+            if vista.etapa_vista == etapa_destino:
+                vista.marcar_como_desactualizada()
+        self.actualizar_contadores_menu()
 
     def cambiar_pagina(self, indice: int):
         """Alterna entre las diferentes vistas y delega la actualización condicional."""
@@ -2,7 +2,7 @@ import re
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                                QDateEdit, QSpinBox, QPushButton, QGroupBox,
                                QMessageBox, QDialog, QLineEdit, QComboBox,
-                               QDialogButtonBox)
+                               QDialogButtonBox, QCheckBox)
 from PySide6.QtCore import QDate, Qt, Signal
 from datetime import datetime
 
@@ -127,6 +127,12 @@ class SubTabExtraer(QWidget):
         layout_fechas.addWidget(self.fecha_hasta)
         layout_masivo.addLayout(layout_fechas)
 
+        self.check_reanudar = QCheckBox("Reanudar extracción anterior (omite días completados y "
+                                        "reintenta primero las fichas pendientes)")
+        # Opcional: volver a extraer un rango debe recoger cambios de estado (cierres, adjudicaciones)
+        self.check_reanudar.setChecked(False)
+        layout_masivo.addWidget(self.check_reanudar)
+
         # Fila de botones: Iniciar + Cancelar (cancelar oculto por defecto)
         fila_botones_masivo = QHBoxLayout()
 
@@ -204,7 +210,8 @@ class SubTabExtraer(QWidget):
         fecha_inicio_dt = datetime(fecha_inicio.year, fecha_inicio.month, fecha_inicio.day)
         fecha_termino_dt = datetime(fecha_termino.year, fecha_termino.month, fecha_termino.day)
 
-        self.trabajador = TrabajadorExtraccion(fecha_inicio_dt, fecha_termino_dt)
+        self.trabajador = TrabajadorExtraccion(fecha_inicio_dt, fecha_termino_dt,
+                                               reanudar=self.check_reanudar.isChecked())
         self.trabajador.progreso.connect(self.registrar_evento)
         self.trabajador.error.connect(self.desplegar_error)
         self.trabajador.finalizado.connect(self.notificar_finalizacion)
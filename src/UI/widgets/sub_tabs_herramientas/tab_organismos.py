@@ -1,136 +1,172 @@
-from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTreeWidget, QTreeWidgetItem, 
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTreeView,
                                QPushButton, QLineEdit, QMenu, QInputDialog, QMessageBox)
-from PySide6.QtCore import Qt
+from PySide6.QtGui import QStandardItemModel, QStandardItem
+from PySide6.QtCore import Qt, QTimer, QSortFilterProxyModel
 from src.UI.controllers.organismos_controller import ControladorOrganismos
+from src.utils.busqueda_texto import IndiceTrigramas
+
+# Milisegundos de inactividad del teclado antes de aplicar el filtro
+RETARDO_FILTRO_MS = 250
+
+
+class ProxyFiltroOrganismos(QSortFilterProxyModel):
+    """
+    Modelo proxy que muestra solo los organismos cuyo código está en el conjunto
+    permitido. Los grupos por letra se muestran automáticamente si algún hijo
+    coincide (filtrado recursivo de Qt).
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.codigos_visibles = None  # None = sin filtro activo
+        self.setRecursiveFilteringEnabled(True)
+
+    def establecer_codigos_visibles(self, codigos):
+        self.beginFilterChange()
+        self.codigos_visibles = codigos
+        self.endFilterChange(QSortFilterProxyModel.Direction.Rows)
+
+    def filterAcceptsRow(self, fila_origen, indice_padre):
+        if self.codigos_visibles is None:
+            return True
+        # Las ramas de agrupación no coinciden por sí mismas; se muestran vía recursión
+        if not indice_padre.isValid():
+            return False
+        indice = self.sourceModel().index(fila_origen, 0, indice_padre)
+        return indice.data(Qt.UserRole) in self.codigos_visibles
+
 
 class SubTabOrganismos(QWidget):
     """Interfaz para la gestión y ponderación de las instituciones compradoras."""
-    
+
     def __init__(self):
         super().__init__()
         self.controlador = ControladorOrganismos()
-        self.items_organismos = [] 
-        
+        self.indice_busqueda = IndiceTrigramas()
+
         self.layout_principal = QVBoxLayout(self)
-        
+
         barra_superior = QHBoxLayout()
-        
+
         self.input_buscar = QLineEdit()
-        self.input_buscar.setPlaceholderText("Ingrese nombre del organismo para filtrar...")
-        self.input_buscar.textChanged.connect(self.filtrar_lista) 
-        
+        self.input_buscar.setPlaceholderText("Ingrese nombre del organismo para filtrar (tolera tildes y errores de tipeo)...")
+
+        # Debounce: el filtro se aplica cuando el usuario deja de escribir
+        self.temporizador_filtro = QTimer(self)
+        self.temporizador_filtro.setSingleShot(True)
+        self.temporizador_filtro.setInterval(RETARDO_FILTRO_MS)
+        self.temporizador_filtro.timeout.connect(self.aplicar_filtro)
+        self.input_buscar.textChanged.connect(self.temporizador_filtro.start)
+
         boton_refrescar = QPushButton("Actualizar Directorio")
         boton_refrescar.clicked.connect(self.cargar_datos)
-        
+
         barra_superior.addWidget(self.input_buscar)
         barra_superior.addWidget(boton_refrescar)
         self.layout_principal.addLayout(barra_superior)
-        
-        self.arbol = QTreeWidget()
-        self.arbol.setHeaderLabels(["Nombre de Institución", "Código Interno", "Valoración Automática"])
-        self.arbol.setColumnWidth(0, 450) 
+
+        self.modelo = QStandardItemModel(self)
+        self.modelo.setHorizontalHeaderLabels(["Nombre de Institución", "Código Interno", "Valoración Automática"])
+        self.proxy = ProxyFiltroOrganismos(self)
+        self.proxy.setSourceModel(self.modelo)
+
+        self.arbol = QTreeView()
+        self.arbol.setModel(self.proxy)
+        self.arbol.setUniformRowHeights(True)
+        self.arbol.setEditTriggers(QTreeView.NoEditTriggers)
+        self.arbol.setColumnWidth(0, 450)
         self.arbol.setColumnWidth(1, 100)
-        self.arbol.setContextMenuPolicy(Qt.CustomContextMenu) 
+        self.arbol.setContextMenuPolicy(Qt.CustomContextMenu)
         self.arbol.customContextMenuRequested.connect(self.mostrar_menu_contextual)
-        
+
         self.layout_principal.addWidget(self.arbol)
         self.cargar_datos()
 
     def cargar_datos(self):
-        self.arbol.clear()
-        self.items_organismos = [] 
-        
+        self.modelo.removeRows(0, self.modelo.rowCount())
+        self.indice_busqueda = IndiceTrigramas()
+
         datos = self.controlador.obtener_todos()
-        
+
         grupos = {}
         for org in datos:
             if not org.nombre: continue
-            
+
             letra = org.nombre[0].upper()
-            if not letra.isalpha(): 
-                letra = "#" 
-            
+            if not letra.isalpha():
+                letra = "#"
+
             if letra not in grupos: grupos[letra] = []
             grupos[letra].append(org)
-            
+
         for letra in sorted(grupos.keys()):
-            rama_letra = QTreeWidgetItem(self.arbol)
-            rama_letra.setText(0, f"--- Grupo {letra} ---")
-            rama_letra.setExpanded(False) 
-            rama_letra.setBackground(0, Qt.lightGray)
-            
+            rama_letra = QStandardItem(f"--- Grupo {letra} ---")
+            rama_letra.setBackground(Qt.lightGray)
+
             for org in grupos[letra]:
-                hoja = QTreeWidgetItem(rama_letra)
-                hoja.setText(0, org.nombre)
-                hoja.setText(1, org.codigo)
-                hoja.setText(2, str(org.puntaje))
-                
-                if org.puntaje > 0:
-                    hoja.setForeground(2, Qt.darkGreen) 
-                elif org.puntaje < 0:
-                    hoja.setForeground(2, Qt.red) 
-
-                hoja.setData(0, Qt.UserRole, org.codigo)
-                self.items_organismos.append((hoja, org.nombre.lower()))
-
-    def filtrar_lista(self, texto: str):
-        texto = texto.lower()
+                item_nombre = QStandardItem(org.nombre)
+                item_nombre.setData(org.codigo, Qt.UserRole)
+                item_puntaje = QStandardItem(str(org.puntaje))
+                self._colorear_puntaje(item_puntaje, org.puntaje)
+
+                rama_letra.appendRow([item_nombre, QStandardItem(org.codigo), item_puntaje])
+                self.indice_busqueda.agregar(org.codigo, org.nombre)
+
+            self.modelo.appendRow([rama_letra, QStandardItem(), QStandardItem()])
+
+        self.aplicar_filtro()
+
+    def aplicar_filtro(self):
+        """Consulta el índice de trigramas y delega la visibilidad al modelo proxy."""
+        texto = self.input_buscar.text().strip()
         if not texto:
-            for i in range(self.arbol.topLevelItemCount()):
-                self.arbol.topLevelItem(i).setHidden(False)
+            self.proxy.establecer_codigos_visibles(None)
             return
 
-        for i in range(self.arbol.topLevelItemCount()):
-            rama = self.arbol.topLevelItem(i)
-            rama_visible = False
-            
-            for j in range(rama.childCount()):
-                hijo = rama.child(j)
-                nombre_org = hijo.text(0).lower()
-                
-                if texto in nombre_org:
-                    hijo.setHidden(False)
-                    rama_visible = True 
-                else:
-                    hijo.setHidden(True)
-            
-            rama.setHidden(not rama_visible)
-            if rama_visible:
-                rama.setExpanded(True) 
+        self.proxy.establecer_codigos_visibles(set(self.indice_busqueda.buscar(texto)))
+        self.arbol.expandAll()
+
+    def _colorear_puntaje(self, item: QStandardItem, puntaje: int):
+        if puntaje > 0:
+            item.setForeground(Qt.darkGreen)
+        elif puntaje < 0:
+            item.setForeground(Qt.red)
+        else:
+            item.setForeground(Qt.black)
 
     def mostrar_menu_contextual(self, posicion):
-        item = self.arbol.itemAt(posicion)
-        if not item or item.childCount() > 0: return
+        indice_proxy = self.arbol.indexAt(posicion)
+        if not indice_proxy.isValid() or not indice_proxy.parent().isValid(): return
+
+        indice_origen = self.proxy.mapToSource(indice_proxy)
+        rama = self.modelo.itemFromIndex(indice_origen.parent())
+        item_nombre = rama.child(indice_origen.row(), 0)
+        item_puntaje = rama.child(indice_origen.row(), 2)
 
         menu = QMenu()
         accion_prioritario = menu.addAction("[Asignar] Prioritario (+)")
         accion_no_deseado = menu.addAction("[Asignar] No Deseado (-)")
         accion_neutro = menu.addAction("[Asignar] Neutro (0)")
-        
+
         accion_seleccionada = menu.exec(self.arbol.viewport().mapToGlobal(posicion))
-        
-        codigo = item.data(0, Qt.UserRole)
+
+        codigo = item_nombre.data(Qt.UserRole)
         nuevo_puntaje = None
-        
+
         if accion_seleccionada == accion_prioritario:
             puntos, ok = QInputDialog.getInt(self, "Valoración Positiva", "Puntaje a incrementar:", 100, 1, 1000)
             if ok: nuevo_puntaje = puntos
-            
+
         elif accion_seleccionada == accion_no_deseado:
             puntos, ok = QInputDialog.getInt(self, "Valoración Negativa", "Puntaje a penalizar:", -100, -1000, -1)
             if ok: nuevo_puntaje = puntos
-            
+
         elif accion_seleccionada == accion_neutro:
             nuevo_puntaje = 0
-            
+
         if nuevo_puntaje is not None:
             if self.controlador.actualizar_puntaje(codigo, nuevo_puntaje):
-                item.setText(2, str(nuevo_puntaje))
-                if nuevo_puntaje > 0:
-                    item.setForeground(2, Qt.darkGreen)
-                elif nuevo_puntaje < 0:
-                    item.setForeground(2, Qt.red)
-                else:
-                    item.setForeground(2, Qt.black)
+                item_puntaje.setText(str(nuevo_puntaje))
+                self._colorear_puntaje(item_puntaje, nuevo_puntaje)
             else:
-                QMessageBox.warning(self, "Error de Sistema", "No fue posible registrar la actualización.")
\ No newline at end of file
+                QMessageBox.warning(self, "Error de Sistema", "No fue posible registrar la actualización.")
@@ -4,6 +4,8 @@ from PySide6.QtCore import Qt, QTime, QTimer, QDateTime
 from datetime import datetime, timedelta
 
 from src.UI.workers.scraping_worker import TrabajadorExtraccion
+from src.UI.workers.archivado_worker import TrabajadorArchivado
+from src.UI.workers.reintentos_worker import TrabajadorReintentos
 from src.config.constantes import PILOTO_MAX_REINTENTOS, PILOTO_MINUTOS_REINTENTOS_BASE
 
 class SubTabPilotoAutomatico(QWidget):
@@ -22,6 +24,8 @@ class SubTabPilotoAutomatico(QWidget):
         self.fecha_ultima_operacion_exitosa = None 
         self.intentos_actuales = 0
         self.trabajador = None
+        self.trabajador_archivado = None
+        self.trabajador_reintentos = None
         
         # UI Components
         self._configurar_interfaz()
@@ -104,6 +108,9 @@ class SubTabPilotoAutomatico(QWidget):
             if self.fecha_ultima_operacion_exitosa != ahora.date():
                 self.intentos_actuales = 0 # Reset de intentos para el nuevo día
                 self.lanzar_extraccion_programada(ahora)
+                return
+
+        self.lanzar_drenado_reintentos()
 
     def lanzar_extraccion_programada(self, fecha_base: datetime):
         """Inicia el Worker de extracción para el día anterior."""
@@ -113,7 +120,13 @@ class SubTabPilotoAutomatico(QWidget):
         if self.intentos_actuales > 0:
             self.etiqueta_estado.setText(self.etiqueta_estado.text() + f" (Reintento {self.intentos_actuales})")
         
-        self.trabajador = TrabajadorExtraccion(dia_objetivo, dia_objetivo) 
+        # Los reintentos continúan desde la bitácora en lugar de repetir el día completo
+        # La cola se detiene para no competir con la extracción por el presupuesto de peticiones
+        if self.trabajador_reintentos and self.trabajador_reintentos.isRunning():
+            self.trabajador_reintentos.stop()
+
+        self.trabajador = TrabajadorExtraccion(dia_objetivo, dia_objetivo,
+                                               reanudar=self.intentos_actuales > 0)
         self.trabajador.progreso.connect(self.actualizar_registro_visual)
         self.trabajador.error.connect(self.registrar_fallo)
         self.trabajador.finalizado.connect(self.notificar_culminacion)
@@ -144,6 +157,33 @@ class SubTabPilotoAutomatico(QWidget):
         hora_obj = self.selector_hora.time().toString("HH:mm")
         self.etiqueta_estado.setText(f"[ESTADO: ACTIVO] - Tarea completada. Siguiente: {hora_obj}")
         self.etiqueta_registro.setText("Día procesado correctamente.")
+        self.lanzar_archivado()
+
+    def lanzar_archivado(self):
+        """Tras la extracción diaria, traslada al archivo las licitaciones que dejaron de estar vigentes."""
+        if self.trabajador_archivado and self.trabajador_archivado.isRunning():
+            return
+        self.trabajador_archivado = TrabajadorArchivado()
+        self.trabajador_archivado.finalizado.connect(self.notificar_archivado)
+        self.trabajador_archivado.start()
+
+    def notificar_archivado(self, cantidad: int):
+        if cantidad > 0:
+            self.etiqueta_registro.setText(f"Día procesado correctamente. {cantidad} licitaciones no vigentes archivadas.")
+
+    def lanzar_drenado_reintentos(self):
+        """Con el servicio activo y sin extracción en curso, recupera las fichas pendientes vencidas."""
+        if self.trabajador and self.trabajador.isRunning():
+            return
+        if self.trabajador_reintentos and self.trabajador_reintentos.isRunning():
+            return
+        self.trabajador_reintentos = TrabajadorReintentos()
+        self.trabajador_reintentos.finalizado.connect(self.notificar_reintentos)
+        self.trabajador_reintentos.start()
+
+    def notificar_reintentos(self, cantidad: int):
+        if cantidad > 0:
+            self.etiqueta_registro.setText(f"{cantidad} fichas pendientes recuperadas desde la cola de reintentos.")
 
     def actualizar_registro_visual(self, mensaje: str):
         texto_limpio = mensaje.strip().split('\n')[-1]
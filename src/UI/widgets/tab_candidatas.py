@@ -5,6 +5,8 @@ from src.UI.widgets.tab_listado_base import TabListadoBase
 
 class TabCandidatas(TabListadoBase):  
     """Vista principal para las licitaciones recién evaluadas y filtradas."""
+    etapa_vista = EtapaLicitacion.CANDIDATA.value
+
     def __init__(self):
         super().__init__()
         
@@ -18,16 +20,16 @@ class TabCandidatas(TabListadoBase):
         item = self.tabla.itemAt(posicion)
         if not item: return
         
+        codigos = self.codigos_seleccionados(item)
+        sufijo = f" ({len(codigos)})" if len(codigos) > 1 else ""
+
         menu = QMenu()
-        accion_seguimiento = menu.addAction("[Mover] A Seguimiento")
-        accion_ofertada = menu.addAction("[Mover] A Ofertadas")
+        accion_seguimiento = menu.addAction(f"[Mover] A Seguimiento{sufijo}")
+        accion_ofertada = menu.addAction(f"[Mover] A Ofertadas{sufijo}")
         
         accion_seleccionada = menu.exec(self.tabla.viewport().mapToGlobal(posicion))
         
-        fila = item.row()
-        codigo = self.tabla.item(fila, 1).text()
-        
         if accion_seleccionada == accion_seguimiento:
-            self.mover_etapa(codigo, EtapaLicitacion.SEGUIMIENTO.value)
+            self.mover_etapas(codigos, EtapaLicitacion.SEGUIMIENTO.value)
         elif accion_seleccionada == accion_ofertada:
-            self.mover_etapa(codigo, EtapaLicitacion.OFERTADA.value)
\ No newline at end of file
+            self.mover_etapas(codigos, EtapaLicitacion.OFERTADA.value)
\ No newline at end of file
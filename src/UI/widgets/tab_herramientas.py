@@ -1,11 +1,12 @@
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QTabWidget, QLabel)
-from PySide6.QtCore import Signal
+from PySide6.QtCore import Signal, QTimer
 
 # Importaciones de subpestañas (Ajustadas al estándar de nomenclatura que aplicaremos)
 from src.UI.widgets.sub_tabs_herramientas.tab_extraer import SubTabExtraer
 from src.UI.widgets.sub_tabs_herramientas.tab_exportar import SubTabExportar
 from src.UI.widgets.sub_tabs_herramientas.tab_puntajes import SubTabPuntajes
 from src.UI.widgets.sub_tabs_herramientas.tab_piloto_automatico import SubTabPilotoAutomatico
+from src.bd.database import obtener_estadisticas_pool
 
 class TabHerramientas(QWidget):
     """
@@ -25,6 +26,16 @@ class TabHerramientas(QWidget):
         etiqueta_titulo.setStyleSheet("font-size: 24px; font-weight: bold; color: #333;")
         self.layout_principal.addWidget(etiqueta_titulo)
 
+        # Indicador de uso del pool de conexiones (GUI, extracción y exportación lo comparten)
+        self.etiqueta_pool = QLabel("")
+        self.etiqueta_pool.setStyleSheet("color: #777; font-size: 11px;")
+        self.layout_principal.addWidget(self.etiqueta_pool)
+
+        self.temporizador_pool = QTimer(self)
+        self.temporizador_pool.timeout.connect(self.actualizar_estado_pool)
+        self.temporizador_pool.start(5000)
+        self.actualizar_estado_pool()
+
         self.pestañas_internas = QTabWidget()
         self.layout_principal.addWidget(self.pestañas_internas)
 
@@ -43,6 +54,15 @@ class TabHerramientas(QWidget):
         
         self.aplicar_estilo_pestañas()
 
+    def actualizar_estado_pool(self):
+        """Refresca el resumen de conexiones en uso, desborde y esperas del pool."""
+        estadisticas = obtener_estadisticas_pool()
+        self.etiqueta_pool.setText(
+            f"Conexiones BD: {estadisticas['en_uso']} en uso / {estadisticas['tamanio']} base "
+            f"| Desborde: {estadisticas['desborde']} "
+            f"| Esperas: {estadisticas['esperas']} ({estadisticas['segundos_espera']:.1f}s)"
+        )
+
     def aplicar_estilo_pestañas(self):
         """Aplica las reglas CSS específicas para la navegación de subpestañas."""
         self.pestañas_internas.setStyleSheet("""
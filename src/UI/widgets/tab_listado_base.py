@@ -1,9 +1,11 @@
+import math
 from PySide6.QtWidgets import (QHBoxLayout, QLabel, QPushButton, QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, 
-                               QHeaderView, QMessageBox)
-from PySide6.QtCore import Qt, Signal
+                               QHeaderView, QMessageBox, QLineEdit)
+from PySide6.QtCore import Qt, Signal, QEvent
 
 from src.repositories.licitaciones_repository import RepositorioLicitaciones
 from src.UI.widgets.tab_detalle_licitacion import DialogoDetalleLicitacion
+from src.UI.workers.movimiento_worker import TrabajadorMovimiento
 from src.config.constantes import TAMANIO_PAGINA_TABLAS
 
 class TabListadoBase(QWidget):
@@ -14,16 +16,29 @@ class TabListadoBase(QWidget):
     
     # Señal de transmisión: Avisará a la ventana principal cuando un registro cambie de etapa
     datos_actualizados_global = Signal()
+    # Señal específica de movimiento confirmado en BD: (etapa_origen, etapa_destino)
+    licitacion_movida = Signal(str, str)
+
+    # Etapa que representa la vista (definida por cada clase hija)
+    etapa_vista = None
 
     def __init__(self):
         super().__init__()
         self.layout_principal = QVBoxLayout(self)
         self.layout_principal.setContentsMargins(20, 20, 20, 20) 
         self.repositorio = RepositorioLicitaciones()
+
+        # Referencias a los hilos de movimiento en curso (evita su recolección prematura)
+        self.trabajadores_movimiento = []
         
         # Estado de paginación
         self.pagina_actual = 0
         self.necesita_actualizacion = True
+
+        # Estado de búsqueda de texto completo (cadena vacía = listado paginado normal)
+        self.busqueda_activa = ""
+        self.color_puntaje_actual = Qt.black
+        self.crear_barra_busqueda()
         
         self.tabla = QTableWidget()
         self.configurar_tabla()
@@ -32,6 +47,58 @@ class TabListadoBase(QWidget):
         # Controles de navegación de página
         self.crear_barra_paginacion()
 
+    def crear_barra_busqueda(self):
+        """Construye el buscador de texto completo sobre nombre, descripción y productos."""
+        layout_busqueda = QHBoxLayout()
+
+        self.input_busqueda = QLineEdit()
+        self.input_busqueda.setPlaceholderText("Buscar por nombre, descripción o productos (Enter para buscar)...")
+        self.input_busqueda.returnPressed.connect(self.ejecutar_busqueda)
+
+        boton_buscar = QPushButton("Buscar")
+        boton_buscar.setFixedWidth(90)
+        boton_buscar.clicked.connect(self.ejecutar_busqueda)
+
+        self.boton_limpiar_busqueda = QPushButton("Limpiar")
+        self.boton_limpiar_busqueda.setFixedWidth(90)
+        self.boton_limpiar_busqueda.setEnabled(False)
+        self.boton_limpiar_busqueda.clicked.connect(self.limpiar_busqueda)
+
+        layout_busqueda.addWidget(self.input_busqueda)
+        layout_busqueda.addWidget(boton_buscar)
+        layout_busqueda.addWidget(self.boton_limpiar_busqueda)
+        self.layout_principal.addLayout(layout_busqueda)
+
+    def ejecutar_busqueda(self):
+        """Reemplaza el listado paginado por los resultados rankeados de la búsqueda."""
+        texto = self.input_busqueda.text().strip()
+        if not texto:
+            self.limpiar_busqueda()
+            return
+
+        self.busqueda_activa = texto
+        resultados = self.repositorio.buscar_licitaciones(texto, etapa=self.etapa_vista)
+        self.poblar_tabla([licitacion for licitacion, _, _ in resultados], self.color_puntaje_actual)
+
+        # El fragmento resaltado se muestra como tooltip enriquecido sobre el nombre
+        for fila, (_, _, fragmento) in enumerate(resultados):
+            if fragmento:
+                self.tabla.item(fila, 2).setToolTip(f"<p>{fragmento}</p>")
+
+        self.etiqueta_pagina.setText(f"Resultados: {len(resultados)}")
+        self.boton_anterior.setEnabled(False)
+        self.boton_siguiente.setEnabled(False)
+        self.boton_limpiar_busqueda.setEnabled(True)
+
+    def limpiar_busqueda(self):
+        """Vuelve al listado paginado normal de la etapa."""
+        self.input_busqueda.clear()
+        self.busqueda_activa = ""
+        self.boton_limpiar_busqueda.setEnabled(False)
+        self.pagina_actual = 0
+        self.cargar_datos()
+        self.actualizar_estado_paginacion()
+
     def crear_barra_paginacion(self):
         """Construye la botonera inferior para navegar entre páginas de resultados."""
         layout_paginacion = QHBoxLayout()
@@ -68,17 +135,28 @@ class TabListadoBase(QWidget):
     
     def actualizar_estado_paginacion(self):
         """Refresca las etiquetas y el estado de los botones de navegación."""
-        self.etiqueta_pagina.setText(f"Página: {self.pagina_actual + 1}")
         self.boton_anterior.setEnabled(self.pagina_actual > 0)
-        
-        # Si la tabla tiene menos registros que el tamaño de página, asumimos que es la última
-        self.boton_siguiente.setEnabled(self.tabla.rowCount() == TAMANIO_PAGINA_TABLAS)
+
+        # El total proviene de la tabla resumen (sin COUNT(*) sobre licitaciones)
+        total = self.repositorio.obtener_totales_etapas().get(self.etapa_vista) if self.etapa_vista else None
+        if not isinstance(total, int):
+            # Sin contadores para la etapa: si la tabla tiene menos registros que el tamaño
+            # de página, asumimos que es la última
+            self.etiqueta_pagina.setText(f"Página: {self.pagina_actual + 1}")
+            self.boton_siguiente.setEnabled(self.tabla.rowCount() == TAMANIO_PAGINA_TABLAS)
+            return
+
+        total_paginas = max(1, math.ceil(total / TAMANIO_PAGINA_TABLAS))
+        self.etiqueta_pagina.setText(f"Página {self.pagina_actual + 1} de {total_paginas} ({total} registros)")
+        self.boton_siguiente.setEnabled(self.pagina_actual + 1 < total_paginas)
 
     def configurar_tabla(self):
         columnas = ["Puntaje", "Código Externo", "Nombre de Licitación", "Fecha de Cierre", "Estado"]
         self.tabla.setColumnCount(len(columnas))
         self.tabla.setHorizontalHeaderLabels(columnas)
         self.tabla.setSelectionBehavior(QTableWidget.SelectRows)
+        # Selección múltiple (Ctrl/Shift) para mover lotes de licitaciones de una sola vez
+        self.tabla.setSelectionMode(QTableWidget.ExtendedSelection)
         self.tabla.setEditTriggers(QTableWidget.NoEditTriggers)
         self.tabla.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.tabla.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeToContents)
@@ -86,6 +164,22 @@ class TabListadoBase(QWidget):
         self.tabla.setContextMenuPolicy(Qt.CustomContextMenu)
         self.tabla.customContextMenuRequested.connect(self.mostrar_menu_contextual)
         self.tabla.cellDoubleClicked.connect(self.abrir_ficha_tecnica)
+
+        # La auditoría del puntaje se consulta al pasar el cursor, no al poblar la página
+        self.tabla.viewport().installEventFilter(self)
+
+    def eventFilter(self, objeto, evento):
+        """
+        Carga diferida del tooltip del puntaje: la justificación vive en 'licitacion_detalle'
+        y solo se consulta la primera vez que el usuario posa el cursor sobre la celda.
+        """
+        if evento.type() == QEvent.ToolTip and objeto is self.tabla.viewport():
+            item = self.tabla.itemAt(evento.pos())
+            if item is not None and item.column() == 0 and not item.toolTip():
+                item_codigo = self.tabla.item(item.row(), 1)
+                justificacion = self.repositorio.obtener_justificacion(item_codigo.text()) if item_codigo else None
+                item.setToolTip(justificacion or "Sin análisis detallado.")
+        return super().eventFilter(objeto, evento)
     
     def abrir_ficha_tecnica(self, fila: int, columna: int):
         item_codigo = self.tabla.item(fila, 1) 
@@ -102,6 +196,7 @@ class TabListadoBase(QWidget):
 
     def poblar_tabla(self, licitaciones: list, color_puntaje: Qt.GlobalColor):
         """Llena la cuadrícula con los datos inyectados por la clase hija."""
+        self.color_puntaje_actual = color_puntaje
         self.tabla.setRowCount(0)
         self.tabla.setRowCount(len(licitaciones))
         
@@ -109,7 +204,6 @@ class TabListadoBase(QWidget):
             item_puntaje = QTableWidgetItem(str(licitacion.puntaje))
             item_puntaje.setForeground(color_puntaje)
             item_puntaje.setTextAlignment(Qt.AlignCenter)
-            item_puntaje.setToolTip(licitacion.justificacion_puntaje or "Sin análisis detallado.")
             
             self.tabla.setItem(fila, 0, item_puntaje)
             self.tabla.setItem(fila, 1, QTableWidgetItem(licitacion.codigo_externo))
@@ -125,17 +219,82 @@ class TabListadoBase(QWidget):
         self.necesita_actualizacion = False
 
     def mover_etapa(self, codigo: str, nueva_etapa: str):
-        if self.repositorio.mover_licitacion(codigo, nueva_etapa):
-            # 1. Recargamos la pestaña actual para que el registro desaparezca
-            self.cargar_datos() 
-            # 2. Emitimos la señal para informar al sistema que hubo un movimiento
-            self.datos_actualizados_global.emit()
-        else:
-            QMessageBox.warning(self, "Error de Sistema", f"No fue posible actualizar el registro {codigo}.")
+        """Atajo para mover una única licitación."""
+        self.mover_etapas([codigo], nueva_etapa)
+
+    def mover_etapas(self, codigos: list, nueva_etapa: str):
+        """
+        Movimiento optimista: las filas desaparecen de inmediato y la actualización
+        en BD (un único UPDATE) se ejecuta en segundo plano. Si falla, las filas
+        se restituyen en sus posiciones originales.
+        """
+        filas = sorted(f for f in (self._buscar_fila_por_codigo(c) for c in codigos) if f is not None)
+        if not filas:
+            return
+
+        # Retiramos los ítems (no se destruyen) para poder restaurarlos ante un fallo.
+        # Se eliminan de abajo hacia arriba para no desplazar los índices pendientes.
+        filas_retiradas = []
+        for fila in reversed(filas):
+            items_fila = [self.tabla.takeItem(fila, columna) for columna in range(self.tabla.columnCount())]
+            self.tabla.removeRow(fila)
+            filas_retiradas.insert(0, (fila, items_fila))
+
+        trabajador = TrabajadorMovimiento(self.repositorio, codigos, nueva_etapa)
+        trabajador.finalizado.connect(
+            lambda afectadas: self._consolidar_movimiento(trabajador, afectadas, nueva_etapa, filas_retiradas)
+        )
+        self.trabajadores_movimiento.append(trabajador)
+        trabajador.start()
+
+    def _consolidar_movimiento(self, trabajador, afectadas: int, nueva_etapa: str, filas_retiradas: list):
+        """Recibe la confirmación del hilo y consolida o revierte el cambio visual."""
+        if trabajador in self.trabajadores_movimiento:
+            self.trabajadores_movimiento.remove(trabajador)
+        trabajador.deleteLater()
+
+        if afectadas > 0:
+            # Solo la etapa destino necesita recargarse; esta vista ya fue corregida en memoria
+            if not self.busqueda_activa:
+                self.actualizar_estado_paginacion()
+            self.licitacion_movida.emit(self.etapa_vista or "", nueva_etapa)
+            return
+
+        # Se reinsertan de arriba hacia abajo para recuperar las posiciones originales
+        for fila, items_fila in filas_retiradas:
+            fila_restaurada = min(fila, self.tabla.rowCount())
+            self.tabla.insertRow(fila_restaurada)
+            for columna, item in enumerate(items_fila):
+                if item is not None:
+                    self.tabla.setItem(fila_restaurada, columna, item)
+
+        codigos = ", ".join(items[1].text() for _, items in filas_retiradas if items[1] is not None)
+        QMessageBox.warning(self, "Error de Sistema", f"No fue posible actualizar los registros: {codigos}.")
+
+    def codigos_seleccionados(self, item_bajo_cursor) -> list:
+        """
+        Códigos sobre los que actúa el menú contextual: la selección completa si la fila
+        bajo el cursor forma parte de ella, o solo esa fila en caso contrario.
+        """
+        filas = sorted({indice.row() for indice in self.tabla.selectionModel().selectedRows()})
+        if item_bajo_cursor.row() not in filas:
+            filas = [item_bajo_cursor.row()]
+        return [self.tabla.item(fila, 1).text() for fila in filas if self.tabla.item(fila, 1)]
+
+    def _buscar_fila_por_codigo(self, codigo: str):
+        """Localiza la fila actual de una licitación (las posiciones cambian con cada movimiento)."""
+        for fila in range(self.tabla.rowCount()):
+            item_codigo = self.tabla.item(fila, 1)
+            if item_codigo and item_codigo.text() == codigo:
+                return fila
+        return None
             
     def actualizar_datos(self):
         """Método de entrada al cambiar de pestaña. Evaluación condicional."""
         if self.necesita_actualizacion:
+            if self.busqueda_activa:
+                self.ejecutar_busqueda()
+                return
             # Al forzar una actualización desde fuera (movimiento de etapa), reiniciamos a página 0
             self.pagina_actual = 0
             self.cargar_datos()
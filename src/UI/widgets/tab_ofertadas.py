@@ -5,6 +5,8 @@ from src.UI.widgets.tab_listado_base import TabListadoBase
 
 class TabOfertadas(TabListadoBase):  
     """Vista de archivo y control para las licitaciones en las que ya se presentó oferta."""
+    etapa_vista = EtapaLicitacion.OFERTADA.value
+
     def __init__(self):
         super().__init__()
         
@@ -18,16 +20,16 @@ class TabOfertadas(TabListadoBase):
         item = self.tabla.itemAt(posicion)
         if not item: return
         
+        codigos = self.codigos_seleccionados(item)
+        sufijo = f" ({len(codigos)})" if len(codigos) > 1 else ""
+
         menu = QMenu()
-        accion_candidata = menu.addAction("[Mover] A Candidatas")
-        accion_seguimiento = menu.addAction("[Mover] A Seguimiento")
+        accion_candidata = menu.addAction(f"[Mover] A Candidatas{sufijo}")
+        accion_seguimiento = menu.addAction(f"[Mover] A Seguimiento{sufijo}")
         
         accion_seleccionada = menu.exec(self.tabla.viewport().mapToGlobal(posicion))
         
-        fila = item.row()
-        codigo = self.tabla.item(fila, 1).text()
-        
         if accion_seleccionada == accion_candidata:
-            self.mover_etapa(codigo, EtapaLicitacion.CANDIDATA.value)
+            self.mover_etapas(codigos, EtapaLicitacion.CANDIDATA.value)
         elif accion_seleccionada == accion_seguimiento:
-            self.mover_etapa(codigo, EtapaLicitacion.SEGUIMIENTO.value)
\ No newline at end of file
+            self.mover_etapas(codigos, EtapaLicitacion.SEGUIMIENTO.value)
\ No newline at end of file
@@ -5,6 +5,8 @@ from src.UI.widgets.tab_listado_base import TabListadoBase
 
 class TabSeguimiento(TabListadoBase):  
     """Vista operativa para las licitaciones marcadas para evaluación profunda o seguimiento."""
+    etapa_vista = EtapaLicitacion.SEGUIMIENTO.value
+
     def __init__(self):
         super().__init__()
 
@@ -17,16 +19,16 @@ class TabSeguimiento(TabListadoBase):
         item = self.tabla.itemAt(posicion)
         if not item: return
         
+        codigos = self.codigos_seleccionados(item)
+        sufijo = f" ({len(codigos)})" if len(codigos) > 1 else ""
+
         menu = QMenu()
-        accion_candidata = menu.addAction("[Mover] A Candidatas")
-        accion_ofertada = menu.addAction("[Mover] A Ofertadas")
+        accion_candidata = menu.addAction(f"[Mover] A Candidatas{sufijo}")
+        accion_ofertada = menu.addAction(f"[Mover] A Ofertadas{sufijo}")
         
         accion_seleccionada = menu.exec(self.tabla.viewport().mapToGlobal(posicion))
         
-        fila = item.row()
-        codigo = self.tabla.item(fila, 1).text()
-        
         if accion_seleccionada == accion_candidata:
-            self.mover_etapa(codigo, EtapaLicitacion.CANDIDATA.value)
+            self.mover_etapas(codigos, EtapaLicitacion.CANDIDATA.value)
         elif accion_seleccionada == accion_ofertada:
-            self.mover_etapa(codigo, EtapaLicitacion.OFERTADA.value)
\ No newline at end of file
+            self.mover_etapas(codigos, EtapaLicitacion.OFERTADA.value)
\ No newline at end of file
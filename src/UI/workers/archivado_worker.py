@@ -0,0 +1,29 @@
+import traceback
+from PySide6.QtCore import QThread, Signal
+
+from src.services.archivador import ArchivadorLicitaciones
+from src.utils.logger import configurar_logger
+
+logger = configurar_logger("trabajador_archivado")
+
+
+class TrabajadorArchivado(QThread):
+    """
+    Hilo que ejecuta el traslado de licitaciones no vigentes hacia la tabla de archivo.
+
+    Lo lanza el Piloto Automático tras cada extracción nocturna exitosa.
+    Emite 'finalizado' con la cantidad de licitaciones archivadas.
+    """
+    finalizado = Signal(int)
+
+    def __init__(self):
+        super().__init__()
+        self.archivador = ArchivadorLicitaciones()
+
+    def run(self):
+        try:
+            archivadas = self.archivador.archivar()
+        except Exception as error_general:
+            logger.error(f"Falla crítica en el hilo de archivado: {error_general}\n{traceback.format_exc()}")
+            archivadas = 0
+        self.finalizado.emit(archivadas)
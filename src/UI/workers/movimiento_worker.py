@@ -0,0 +1,33 @@
+import traceback
+from PySide6.QtCore import QThread, Signal
+
+from src.utils.logger import configurar_logger
+
+logger = configurar_logger("trabajador_movimiento")
+
+
+class TrabajadorMovimiento(QThread):
+    """
+    Hilo que persiste el cambio de etapa de una o varias licitaciones en segundo plano.
+
+    La vista ya retiró las filas de forma optimista; este hilo solo confirma
+    la operación en la base de datos (un único UPDATE para todo el conjunto) y
+    emite 'finalizado' con la cantidad de registros afectados para que la vista
+    consolide o revierta el cambio visual.
+    """
+    finalizado = Signal(int)
+
+    def __init__(self, repositorio, codigos: list, nueva_etapa: str):
+        super().__init__()
+        self.repositorio = repositorio
+        self.codigos = list(codigos)
+        self.nueva_etapa = nueva_etapa
+
+    def run(self):
+        try:
+            afectadas = self.repositorio.mover_licitaciones(self.codigos, self.nueva_etapa)
+        except Exception as error_general:
+            logger.error(f"Falla moviendo {len(self.codigos)} licitaciones a {self.nueva_etapa}: "
+                         f"{error_general}\n{traceback.format_exc()}")
+            afectadas = 0
+        self.finalizado.emit(afectadas)
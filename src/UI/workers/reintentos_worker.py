@@ -0,0 +1,37 @@
+import traceback
+from PySide6.QtCore import QThread, Signal
+
+from src.services.orquestador import OrquestadorIngesta
+from src.utils.logger import configurar_logger
+
+logger = configurar_logger("trabajador_reintentos")
+
+
+class TrabajadorReintentos(QThread):
+    """
+    Hilo que drena la cola persistente de fichas pendientes.
+
+    El Piloto Automático lo lanza periódicamente mientras no hay una extracción en curso.
+    Comparte el limitador de tasa del recolector, por lo que nunca supera el presupuesto
+    de peticiones del ticket. Emite 'finalizado' con la cantidad de fichas recuperadas.
+    """
+    finalizado = Signal(int)
+
+    def __init__(self):
+        super().__init__()
+        self.ejecutando = True
+        self.orquestador = OrquestadorIngesta()
+
+    def run(self):
+        try:
+            resultado = self.orquestador.drenar_cola_reintentos(
+                verificador_ejecucion=lambda: self.ejecutando
+            )
+            recuperadas = resultado['recuperadas']
+        except Exception as error_general:
+            logger.error(f"Falla crítica en el hilo de reintentos: {error_general}\n{traceback.format_exc()}")
+            recuperadas = 0
+        self.finalizado.emit(recuperadas)
+
+    def stop(self):
+        self.ejecutando = False
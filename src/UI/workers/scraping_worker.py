@@ -5,6 +5,7 @@ from PySide6.QtCore import QThread, Signal
 
 from src.utils.logger import configurar_logger
 from src.services.orquestador import OrquestadorIngesta
+from src.utils.metricas import formatear_resumen
 
 logger = configurar_logger("trabajador_extraccion")
 
@@ -16,10 +17,12 @@ class TrabajadorExtraccion(QThread):
     finalizado = Signal()
     error = Signal(str)
 
-    def __init__(self, fecha_inicio, fecha_fin):
+    def __init__(self, fecha_inicio, fecha_fin, reanudar: bool = False):
         super().__init__()
         self.fecha_inicio = fecha_inicio
         self.fecha_fin = fecha_fin
+        # Retoma desde la bitácora de ingesta en lugar de reprocesar el rango completo
+        self.reanudar = reanudar
         self.ejecutando = True
         self.orquestador = OrquestadorIngesta()
 
@@ -35,7 +38,8 @@ class TrabajadorExtraccion(QThread):
                 self.fecha_inicio,
                 self.fecha_fin,
                 callback_progreso=reportar_progreso,
-                verificador_ejecucion=verificar_ejecucion
+                verificador_ejecucion=verificar_ejecucion,
+                reanudar=self.reanudar
             )
 
             self.progreso.emit(f"\n{'='*60}")
@@ -45,6 +49,9 @@ class TrabajadorExtraccion(QThread):
             self.progreso.emit(f"   - Descargas exitosas: {estadisticas['detalles_exitosos']}")
             self.progreso.emit(f"   - Elementos pendientes: {estadisticas['detalles_pendientes']}")
             self.progreso.emit(f"   - Elementos ignorados: {estadisticas['detalles_omitidos']}")
+            self.progreso.emit("[TIEMPOS] Desglose de la ejecución por etapa:")
+            for linea in formatear_resumen(estadisticas['tiempos']):
+                self.progreso.emit(linea)
             self.finalizado.emit()
 
         except Exception as error_general:
@@ -1,9 +1,82 @@
+import time
+import threading
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
-from src.config.config import DATABASE_URL
+from sqlalchemy.pool import QueuePool
+from src.config.config import (
+    DATABASE_URL,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+    DB_POOL_PRE_PING,
+    DB_STATEMENT_TIMEOUT_MS
+)
+
+
+class PoolConMetricas(QueuePool):
+    """
+    QueuePool que además contabiliza cuántas veces un hilo tuvo que esperar
+    por una conexión libre (pool y desborde agotados) y el tiempo acumulado de espera.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.esperas = 0
+        self.segundos_espera = 0.0
+        self._cerrojo_metricas = threading.Lock()
+
+    def _do_get(self):
+        agotado = (
+            self._max_overflow > -1
+            and self.checkedin() == 0
+            and self.overflow() >= self._max_overflow
+        )
+        if not agotado:
+            return super()._do_get()
+
+        inicio = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            with self._cerrojo_metricas:
+                self.esperas += 1
+                self.segundos_espera += time.perf_counter() - inicio
+
+
+def _construir_opciones_motor(url: str) -> dict:
+    """
+    Traduce la configuración del .env a argumentos de create_engine.
+    Los parámetros de pool solo aplican a PostgreSQL; otros motores (SQLite en pruebas)
+    conservan la configuración por defecto de SQLAlchemy.
+    """
+    opciones = {"echo": False}
+    url_parseada = make_url(url)
+    if url_parseada.get_backend_name() != "postgresql":
+        return opciones
+
+    opciones.update(
+        poolclass=PoolConMetricas,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+    )
+
+    # Agrupa los INSERT/UPDATE masivos en sentencias multi-VALUES (psycopg2)
+    if url_parseada.get_driver_name() == "psycopg2":
+        opciones["executemany_mode"] = "values_plus_batch"
+
+    if DB_STATEMENT_TIMEOUT_MS > 0:
+        opciones["connect_args"] = {"options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"}
+
+    return opciones
+
 
 # Motor de la base de datos
-engine = create_engine(DATABASE_URL, echo=False)
+engine = create_engine(DATABASE_URL, **_construir_opciones_motor(DATABASE_URL))
 
 # Fábrica de sesiones
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -20,4 +93,24 @@ def obtener_sesion_bd():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+def obtener_estadisticas_pool(motor=engine) -> dict:
+    """
+    Retorna una fotografía del estado del pool de conexiones para diagnóstico en la UI.
+    Los valores que el tipo de pool no expone (ej. SQLite en memoria) se informan como 0.
+    """
+    pool = motor.pool
+
+    def _leer(metodo: str) -> int:
+        funcion = getattr(pool, metodo, None)
+        return funcion() if callable(funcion) else 0
+
+    return {
+        "tamanio": _leer("size"),
+        "en_uso": _leer("checkedout"),
+        "disponibles": _leer("checkedin"),
+        "desborde": max(_leer("overflow"), 0),
+        "esperas": getattr(pool, "esperas", 0),
+        "segundos_espera": round(getattr(pool, "segundos_espera", 0.0), 3),
+    }
@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Text
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Boolean, Text, Float, LargeBinary, UniqueConstraint
 from sqlalchemy.orm import relationship
+from sqlalchemy.ext.associationproxy import association_proxy
 from src.bd.database import Base
 
 class EstadoLicitacion(Base):
@@ -31,11 +32,8 @@ class Licitacion(Base):
     id = Column(Integer, primary_key=True, index=True)
     codigo_externo = Column(String, unique=True, index=True)
     nombre = Column(String)
-    descripcion = Column(Text, nullable=True)
     puntaje = Column(Integer, default=0)
-    justificacion_puntaje = Column(Text, nullable=True)
     etapa = Column(String, default="candidata")
-    detalle_productos = Column(Text, nullable=True)
     
     # Fechas
     fecha_cierre = Column(DateTime)
@@ -50,9 +48,160 @@ class Licitacion(Base):
     # Bandera de control de descarga (False = Listado básico, True = Ficha completa)
     tiene_detalle = Column(Boolean, default=False) 
 
+    # Nota: la búsqueda de texto completo usa un índice GIN por expresión sobre 'nombre' y la
+    # columna generada 'licitacion_detalle.busqueda', ambos exclusivos de PostgreSQL
+    # (ver migración 8f3a2d6b1c47) y no mapeados aquí para mantener compatibilidad con SQLite.
+
     estado = relationship("EstadoLicitacion", back_populates="licitaciones")
     organismo = relationship("Organismo", back_populates="licitaciones")
 
+    # Textos extensos en tabla 1:1 aparte: los listados no los leen. Se cargan solo
+    # con joinedload explícito (ficha técnica) o bajo demanda dentro de una sesión.
+    detalle = relationship("LicitacionDetalle", uselist=False, back_populates="licitacion",
+                           cascade="all, delete-orphan", passive_deletes=True)
+
+    # Ítems estructurados de la ficha completa (orden de la API según 'correlativo')
+    items = relationship("LicitacionItem", back_populates="licitacion", order_by="LicitacionItem.correlativo",
+                         cascade="all, delete-orphan", passive_deletes=True)
+
+    descripcion = association_proxy(
+        "detalle", "descripcion", creator=lambda valor: LicitacionDetalle(descripcion=valor))
+    detalle_productos = association_proxy(
+        "detalle", "detalle_productos", creator=lambda valor: LicitacionDetalle(detalle_productos=valor))
+    justificacion_puntaje = association_proxy(
+        "detalle", "justificacion_puntaje", creator=lambda valor: LicitacionDetalle(justificacion_puntaje=valor))
+
+
+class LicitacionDetalle(Base):
+    """Textos extensos de una licitación (descripción, productos y auditoría del puntaje)."""
+    __tablename__ = "licitacion_detalle"
+
+    licitacion_id = Column(Integer, ForeignKey("licitaciones.id", ondelete="CASCADE"), primary_key=True)
+    descripcion = Column(Text, nullable=True)
+    detalle_productos = Column(Text, nullable=True)
+    justificacion_puntaje = Column(Text, nullable=True)
+
+    licitacion = relationship("Licitacion", back_populates="detalle")
+
+
+class LicitacionItem(Base):
+    """Producto o servicio solicitado en una licitación (Items.Listado de la API)."""
+    __tablename__ = "licitacion_items"
+
+    id = Column(Integer, primary_key=True, index=True)
+    licitacion_id = Column(Integer, ForeignKey("licitaciones.id", ondelete="CASCADE"), nullable=False, index=True)
+    correlativo = Column(Integer, nullable=True)
+    codigo_producto = Column(String, nullable=True, index=True)
+    codigo_categoria = Column(String, nullable=True)
+    nombre_producto = Column(String, nullable=True)
+    descripcion = Column(Text, nullable=True)
+    unidad_medida = Column(String, nullable=True)
+    cantidad = Column(Float, nullable=True)
+
+    licitacion = relationship("Licitacion", back_populates="items")
+
+
+class LicitacionArchivada(Base):
+    """
+    Licitaciones cerradas, desiertas o adjudicadas retiradas de la tabla principal
+    por el archivador. Conserva las mismas columnas que 'licitaciones' para que
+    las vistas de detalle y las exportaciones las traten igual.
+    """
+    __tablename__ = "licitaciones_archivo"
+
+    id = Column(Integer, primary_key=True, index=True)
+    codigo_externo = Column(String, unique=True, index=True)
+    nombre = Column(String)
+    descripcion = Column(Text, nullable=True)
+    puntaje = Column(Integer, default=0)
+    justificacion_puntaje = Column(Text, nullable=True)
+    etapa = Column(String)
+    detalle_productos = Column(Text, nullable=True)
+
+    fecha_cierre = Column(DateTime)
+    fecha_inicio = Column(DateTime, nullable=True)
+    fecha_publicacion = Column(DateTime, nullable=True)
+    fecha_adjudicacion = Column(DateTime, nullable=True)
+
+    codigo_estado = Column(Integer, ForeignKey("estados_licitacion.codigo"))
+    codigo_organismo = Column(String, ForeignKey("organismos.codigo"), nullable=True)
+    tiene_detalle = Column(Boolean, default=False)
+
+    # Momento en que el registro fue trasladado al archivo
+    fecha_archivado = Column(DateTime, nullable=False)
+
+    estado = relationship("EstadoLicitacion")
+    organismo = relationship("Organismo")
+
+
+class ResumenEtapa(Base):
+    """
+    Contadores desnormalizados por etapa, estado y tramo de puntaje.
+    Permiten mostrar totales e histogramas sin ejecutar COUNT(*) sobre 'licitaciones'.
+    """
+    __tablename__ = "resumen_etapas"
+
+    id = Column(Integer, primary_key=True, index=True)
+    etapa = Column(String, nullable=False, index=True)
+    codigo_estado = Column(Integer, nullable=True)
+    tramo_puntaje = Column(Integer, nullable=False)
+    cantidad = Column(Integer, nullable=False, default=0)
+
+
+class PayloadApi(Base):
+    """
+    Respuesta JSON cruda de la API (listado diario o ficha de detalle), comprimida.
+    Permite reprocesar la ingesta con nuevas reglas sin volver a consultar la API.
+    """
+    __tablename__ = "payloads_api"
+    __table_args__ = (UniqueConstraint("tipo", "clave", name="uq_payloads_api_tipo_clave"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    tipo = Column(String, nullable=False)            # 'listado' o 'detalle'
+    clave = Column(String, nullable=False)           # Fecha ddmmaaaa del listado o código externo
+    compresion = Column(String, nullable=False)      # Códec usado: 'zstd' o 'zlib'
+    contenido = Column(LargeBinary, nullable=False)
+    tamanio_original = Column(Integer, nullable=False)
+    fecha_captura = Column(DateTime, nullable=False)
+    etag = Column(String, nullable=True)             # Validador HTTP de la respuesta, si la API lo envió
+
+
+class BitacoraDiaIngesta(Base):
+    """Avance de la extracción de un día del listado diario (permite reanudar rangos)."""
+    __tablename__ = "bitacora_ingesta_dias"
+
+    id = Column(Integer, primary_key=True, index=True)
+    fecha = Column(Date, nullable=False, unique=True)
+    estado = Column(String, nullable=False)           # 'en_curso' o 'completado'
+    total_licitaciones = Column(Integer, nullable=False, default=0)
+    actualizado = Column(DateTime, nullable=False)
+
+
+class BitacoraLicitacionIngesta(Base):
+    """Avance de una licitación del listado diario: listada, ficha descargada o persistida."""
+    __tablename__ = "bitacora_ingesta_licitaciones"
+    __table_args__ = (UniqueConstraint("fecha", "codigo_externo", name="uq_bitacora_ingesta_fecha_codigo"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    fecha = Column(Date, nullable=False, index=True)
+    codigo_externo = Column(String, nullable=False)
+    etapa = Column(String, nullable=False)
+    estado_descarga = Column(String, nullable=True)   # Mismo valor que '_EstadoDescarga' del orquestador
+    actualizado = Column(DateTime, nullable=False)
+
+
+class ReintentoDetalle(Base):
+    """Ficha de detalle cuya descarga falló por red o servidor y debe reintentarse."""
+    __tablename__ = "cola_reintentos_detalle"
+
+    id = Column(Integer, primary_key=True, index=True)
+    codigo_externo = Column(String, nullable=False, unique=True)
+    fecha_listado = Column(Date, nullable=True)       # Día de la bitácora donde quedó pendiente
+    intentos = Column(Integer, nullable=False, default=0)
+    proximo_intento = Column(DateTime, nullable=False, index=True)
+    ultimo_estado = Column(String, nullable=True)
+    creado = Column(DateTime, nullable=False)
+
 
 class PalabraClave(Base):
     """Modelo para las reglas de negocio y cálculo de puntajes."""
@@ -21,6 +21,8 @@ load_dotenv(ruta_archivo_env, encoding="utf-8")
 # Extracción de variables críticas para el funcionamiento de la aplicación
 DATABASE_URL = os.getenv("DATABASE_URL")
 TICKET_MERCADO_PUBLICO = os.getenv("TICKET_MERCADO_PUBLICO")
+# Opcional: varios tickets separados por coma; el recolector reparte las peticiones entre ellos
+TICKETS_MERCADO_PUBLICO = os.getenv("TICKETS_MERCADO_PUBLICO")
 
 # Validación estricta de configuración inicial.
 # La aplicación no debe arrancar si faltan estas credenciales esenciales.
@@ -30,8 +32,45 @@ if not DATABASE_URL:
         f"Verifique el archivo .env en: {ruta_archivo_env}"
     )
 
-if not TICKET_MERCADO_PUBLICO:
+if not TICKET_MERCADO_PUBLICO and not TICKETS_MERCADO_PUBLICO:
     raise ValueError(
-        f"[CRITICAL] La variable TICKET_MERCADO_PUBLICO no está configurada. "
+        f"[CRITICAL] La variable TICKET_MERCADO_PUBLICO (o TICKETS_MERCADO_PUBLICO) no está configurada. "
         f"Verifique el archivo .env en: {ruta_archivo_env}"
-    )
\ No newline at end of file
+    )
+
+def _leer_entero_entorno(nombre: str, valor_defecto: int) -> int:
+    """Lee una variable de entorno numérica opcional, validando su formato."""
+    valor = os.getenv(nombre)
+    if valor is None or valor.strip() == "":
+        return valor_defecto
+    try:
+        return int(valor)
+    except ValueError:
+        raise ValueError(
+            f"[CRITICAL] La variable {nombre} debe ser un número entero (valor actual: '{valor}'). "
+            f"Verifique el archivo .env en: {ruta_archivo_env}"
+        )
+
+
+# Parámetros opcionales del pool de conexiones a PostgreSQL.
+# La interfaz, el hilo de extracción y el de exportación comparten el mismo motor,
+# por lo que el tamaño del pool debe cubrir la concurrencia de los tres.
+DB_POOL_SIZE = _leer_entero_entorno("DB_POOL_SIZE", 5)
+DB_MAX_OVERFLOW = _leer_entero_entorno("DB_MAX_OVERFLOW", 10)
+DB_POOL_TIMEOUT = _leer_entero_entorno("DB_POOL_TIMEOUT", 30)            # Segundos esperando una conexión libre
+DB_POOL_RECYCLE = _leer_entero_entorno("DB_POOL_RECYCLE", 1800)          # Segundos de vida máxima de una conexión
+DB_STATEMENT_TIMEOUT_MS = _leer_entero_entorno("DB_STATEMENT_TIMEOUT_MS", 0)  # 0 = sin límite
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").strip().lower() in ("1", "true", "si", "sí", "yes")
+
+# Procesos para transformar licitaciones durante la ingesta masiva (0 = sin pool).
+# Conviene en cargas históricas grandes: descarga a la interfaz del trabajo de CPU.
+INGESTA_PROCESOS_TRANSFORMACION = _leer_entero_entorno("INGESTA_PROCESOS_TRANSFORMACION", 0)
+
+# Listados diarios descargados por adelantado mientras se procesa el día en curso.
+INGESTA_DIAS_ADELANTADOS = _leer_entero_entorno("INGESTA_DIAS_ADELANTADOS", 1)
+# Horas durante las que un listado archivado de un día ya cerrado se reutiliza sin
+# consultar la API (0 = siempre se consulta, con petición condicional si hay ETag).
+INGESTA_HORAS_CACHE_LISTADO = _leer_entero_entorno("INGESTA_HORAS_CACHE_LISTADO", 24)
+# Fichas de detalle que una ejecución puede pedir a la API (0 = sin límite). Se
+# reparten de mayor a menor puntaje de título; las restantes quedan pendientes.
+INGESTA_PRESUPUESTO_FICHAS = _leer_entero_entorno("INGESTA_PRESUPUESTO_FICHAS", 0)
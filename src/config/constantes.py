@@ -12,6 +12,16 @@ class EtapaLicitacion(Enum):
     OFERTADA = "ofertada"
     IGNORADA = "ignorada"
 
+# Avance de cada licitación dentro de la bitácora de ingesta (reanudación de rangos)
+class EtapaBitacora(Enum):
+    LISTADA = "listada"
+    FICHA_DESCARGADA = "ficha_descargada"
+    PERSISTIDA = "persistida"
+
+# Estados de un día dentro de la bitácora de ingesta
+DIA_BITACORA_EN_CURSO = "en_curso"
+DIA_BITACORA_COMPLETADO = "completado"
+
 # Estados de Licitación (API Mercado Público)
 ESTADO_LICITACION_ACTIVA = 5
 
@@ -22,6 +32,11 @@ LIMITE_CANDIDATAS_VISIBLES = 1000
 # Umbrales de evaluación
 UMBRAL_PUNTAJE_CANDIDATA = 0
 
+# Límites inferiores de los tramos del histograma de puntajes (tabla resumen_etapas).
+# El tramo 0 agrupa los puntajes bajo el primer límite. Deben incluir el primer entero
+# sobre el umbral de candidatas para poder contarlas sin recorrer 'licitaciones'.
+LIMITES_TRAMOS_PUNTAJE = (UMBRAL_PUNTAJE_CANDIDATA, UMBRAL_PUNTAJE_CANDIDATA + 1, 50, 100, 200)
+
 # Configuraciones de red y resiliencia
 PAUSA_ENTRE_DIAS_EXTRACCION = 5  # Segundos
 
@@ -29,10 +44,44 @@ TAMANIO_PAGINA_TABLAS = 50
 
 TAMANIO_CHUNK_EXPORTACION = 2000
 
+# Textos de fecha distintos recordados por la conversión ISO de la ingesta
+TAMANIO_CACHE_FECHAS = 4096
+
+# Licitaciones confirmadas por transacción en la escritura masiva de la ingesta
+TAMANIO_BLOQUE_LOTE_MASIVO = 100
+
+# Filas del CSV de organismos procesadas por cada sentencia masiva
+TAMANIO_BLOQUE_SEMILLA_ORGANISMOS = 5000
+
+# Presupuesto de memoria para la caché de páginas del repositorio
+LIMITE_MEMORIA_CACHE_PAGINAS = 16 * 1024 * 1024  # Bytes
+
+# Archivado de licitaciones no vigentes (cerradas, desiertas, adjudicadas...)
+DIAS_ANTIGUEDAD_ARCHIVO = 90       # Días desde la fecha de cierre antes de archivar
+TAMANIO_LOTE_ARCHIVO = 1000        # Registros trasladados por transacción
+
+# Archivo de respuestas crudas de la API (tabla payloads_api)
+TIPO_PAYLOAD_LISTADO = "listado"
+TIPO_PAYLOAD_DETALLE = "detalle"
+
 # Resiliencia del Piloto Automático
 PILOTO_MAX_REINTENTOS = 3
 PILOTO_MINUTOS_REINTENTOS_BASE = 5
 
+# Cola persistente de fichas pendientes (errores de red o servidor)
+COLA_REINTENTOS_MAX_INTENTOS = 6          # Intentos antes de abandonar la ficha
+COLA_REINTENTOS_MINUTOS_BASE = 10         # Espera tras el primer fallo; se duplica en cada intento
+COLA_REINTENTOS_TAMANIO_LOTE = 50         # Fichas recuperadas por escritura masiva
+COLA_REINTENTOS_LIMITE_DRENADO = 200      # Fichas consultadas como máximo en cada drenado
+
+# Pipeline de ingesta por rango de fechas (etapas concurrentes unidas por colas acotadas)
+PIPELINE_CAPACIDAD_COLA = 200             # Licitaciones en espera entre dos etapas
+PIPELINE_HILOS_DESCARGA = 2               # Hilos de fichas; comparten el limitador de tasa
+PIPELINE_LOTE_ESCRITURA = 200             # Registros por confirmación...
+PIPELINE_SEGUNDOS_ESCRITURA = 5.0         # ...o segundos desde la última confirmación
+PIPELINE_LOTE_TRANSFORMACION = 100        # Licitaciones por envío al pool de transformación
+PIPELINE_ESPERA_LOTE_TRANSFORMACION = 0.2 # Segundos máximos para completar un envío
+
 # Diccionario oficial de estados de Mercado Público
 ESTADOS_MERCADO_PUBLICO = {
     5: "Publicada",
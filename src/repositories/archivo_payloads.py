@@ -0,0 +1,137 @@
+from datetime import datetime, timedelta
+from sqlalchemy import select, update
+from src.bd.database import SessionLocal
+from src.bd.models import PayloadApi
+from src.utils.compresion import comprimir_json, descomprimir_json
+from src.utils.logger import configurar_logger
+from src.config.constantes import TIPO_PAYLOAD_LISTADO, TIPO_PAYLOAD_DETALLE
+
+logger = configurar_logger("archivo_payloads")
+
+
+class ArchivoPayloads:
+    """
+    Almacén de las respuestas JSON crudas de la API de Mercado Público,
+    comprimidas en la tabla 'payloads_api'.
+
+    Guarda la última versión de cada listado diario y de cada ficha de detalle,
+    de modo que un cambio en las reglas de puntaje o en la transformación pueda
+    reprocesarse sin consumir la cuota de peticiones de la API.
+
+    Los listados de días ya cerrados sirven además de caché: mientras sean recientes
+    se reutilizan sin consultar la API, y su ETag permite revalidarlos con una
+    petición condicional en vez de descargarlos completos.
+
+    Un fallo al archivar nunca interrumpe la ingesta: se registra y se continúa.
+    """
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+
+    def guardar_listado(self, fecha_cadena: str, listado: list, etag: str = None):
+        self._guardar(TIPO_PAYLOAD_LISTADO, fecha_cadena, listado, etag)
+
+    def guardar_detalle(self, codigo_externo: str, datos: dict):
+        self._guardar(TIPO_PAYLOAD_DETALLE, codigo_externo, datos)
+
+    def obtener_listado(self, fecha_cadena: str):
+        return self._obtener(TIPO_PAYLOAD_LISTADO, fecha_cadena)
+
+    def obtener_detalle(self, codigo_externo: str):
+        return self._obtener(TIPO_PAYLOAD_DETALLE, codigo_externo)
+
+    def obtener_listado_vigente(self, fecha_cadena: str, horas_vigencia: int):
+        """
+        Retorna el listado archivado si aún puede usarse sin consultar la API, o None.
+
+        Solo se considera vigente si se capturó después de terminado su día (el de hoy
+        sigue creciendo) y hace menos de 'horas_vigencia' horas, pues el listado de
+        licitaciones activas cambia a medida que estas cierran.
+        """
+        if horas_vigencia <= 0:
+            return None
+        try:
+            fecha = datetime.strptime(fecha_cadena, "%d%m%Y").date()
+        except (TypeError, ValueError):
+            return None
+
+        fecha_captura = self._fecha_captura(TIPO_PAYLOAD_LISTADO, fecha_cadena)
+        if fecha_captura is None or fecha_captura.date() <= fecha:
+            return None
+        if datetime.now() - fecha_captura >= timedelta(hours=horas_vigencia):
+            return None
+        return self.obtener_listado(fecha_cadena)
+
+    def etag_listado(self, fecha_cadena: str):
+        """ETag de la última versión archivada del listado, para una petición condicional."""
+        with self.session_factory() as sesion:
+            try:
+                return sesion.scalar(
+                    select(PayloadApi.etag).filter_by(tipo=TIPO_PAYLOAD_LISTADO, clave=fecha_cadena)
+                )
+            except Exception as e:
+                logger.error(f"Error leyendo el ETag del listado '{fecha_cadena}': {e}")
+                return None
+
+    def renovar_listado(self, fecha_cadena: str):
+        """La API confirmó que el listado no cambió: se reinicia su antigüedad."""
+        with self.session_factory() as sesion:
+            try:
+                sesion.execute(
+                    update(PayloadApi)
+                    .where(PayloadApi.tipo == TIPO_PAYLOAD_LISTADO, PayloadApi.clave == fecha_cadena)
+                    .values(fecha_captura=datetime.now())
+                )
+                sesion.commit()
+            except Exception as e:
+                sesion.rollback()
+                logger.error(f"Error renovando el listado archivado '{fecha_cadena}': {e}")
+
+    def _fecha_captura(self, tipo: str, clave: str):
+        with self.session_factory() as sesion:
+            try:
+                return sesion.scalar(select(PayloadApi.fecha_captura).filter_by(tipo=tipo, clave=clave))
+            except Exception as e:
+                logger.error(f"Error leyendo la captura del payload {tipo} '{clave}': {e}")
+                return None
+
+    def _guardar(self, tipo: str, clave: str, datos, etag: str = None):
+        if not clave:
+            return
+
+        codec, contenido, tamanio_original = comprimir_json(datos)
+        with self.session_factory() as sesion:
+            try:
+                payload = sesion.query(PayloadApi).filter_by(tipo=tipo, clave=clave).first()
+                if payload is None:
+                    payload = PayloadApi(tipo=tipo, clave=clave)
+                    sesion.add(payload)
+
+                payload.compresion = codec
+                payload.contenido = contenido
+                payload.tamanio_original = tamanio_original
+                payload.fecha_captura = datetime.now()
+                payload.etag = etag
+                sesion.commit()
+            except Exception as e:
+                sesion.rollback()
+                logger.error(f"Error archivando payload {tipo} '{clave}': {e}")
+
+    def _obtener(self, tipo: str, clave: str):
+        """Retorna el JSON descomprimido o None si no fue archivado."""
+        with self.session_factory() as sesion:
+            try:
+                payload = sesion.query(PayloadApi.compresion, PayloadApi.contenido)\
+                    .filter_by(tipo=tipo, clave=clave)\
+                    .first()
+            except Exception as e:
+                logger.error(f"Error leyendo payload {tipo} '{clave}': {e}")
+                return None
+
+        if payload is None:
+            return None
+        try:
+            return descomprimir_json(payload.compresion, payload.contenido)
+        except Exception as e:
+            logger.error(f"Payload {tipo} '{clave}' ilegible: {e}")
+            return None
@@ -0,0 +1,143 @@
+from datetime import datetime, date
+from sqlalchemy import select, insert, update, bindparam
+from src.bd.database import SessionLocal
+from src.bd.models import BitacoraDiaIngesta, BitacoraLicitacionIngesta
+from src.utils.logger import configurar_logger
+from src.config.constantes import EtapaBitacora, DIA_BITACORA_EN_CURSO, DIA_BITACORA_COMPLETADO
+
+logger = configurar_logger("bitacora_ingesta")
+
+# Estados de descarga que justifican reintentar la ficha (fallos transitorios de la API)
+PREFIJO_DESCARGA_PENDIENTE = "pendiente_"
+
+
+class BitacoraIngesta:
+    """
+    Registro persistente del avance de las extracciones por rango de fechas.
+
+    Anota por día si el listado fue recibido y completado, y por licitación si fue
+    listada, si su ficha se descargó y si quedó persistida. Con esa información el
+    orquestador puede reanudar una ejecución detenida, caída o agotada sin volver
+    a descargar lo ya procesado. Las escrituras se agrupan por día o por lote,
+    salvo la marca de ficha descargada, cuyo costo es despreciable frente a la petición.
+
+    Un fallo de la bitácora nunca detiene la ingesta: se registra y se continúa.
+    """
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+
+    def iniciar_dia(self, fecha: date, codigos_externos: list):
+        """Registra el listado del día; las licitaciones ya conocidas conservan su avance."""
+        ahora = datetime.now()
+        with self.session_factory() as sesion:
+            try:
+                dia = sesion.query(BitacoraDiaIngesta).filter_by(fecha=fecha).first()
+                if dia is None:
+                    sesion.add(BitacoraDiaIngesta(fecha=fecha, estado=DIA_BITACORA_EN_CURSO,
+                                                  total_licitaciones=len(codigos_externos), actualizado=ahora))
+                else:
+                    dia.estado = DIA_BITACORA_EN_CURSO
+                    dia.total_licitaciones = len(codigos_externos)
+                    dia.actualizado = ahora
+
+                conocidos = set(sesion.scalars(
+                    select(BitacoraLicitacionIngesta.codigo_externo)
+                    .where(BitacoraLicitacionIngesta.fecha == fecha)
+                ))
+                nuevos = [
+                    {"fecha": fecha, "codigo_externo": codigo, "etapa": EtapaBitacora.LISTADA.value,
+                     "actualizado": ahora}
+                    for codigo in dict.fromkeys(codigos_externos) if codigo and codigo not in conocidos
+                ]
+                if nuevos:
+                    sesion.execute(insert(BitacoraLicitacionIngesta), nuevos)
+                sesion.commit()
+            except Exception as e:
+                sesion.rollback()
+                logger.error(f"Error registrando listado del {fecha} en la bitácora: {e}")
+
+    def marcar_ficha_descargada(self, fecha: date, codigo_externo: str):
+        self._actualizar(fecha, {codigo_externo: None}, EtapaBitacora.FICHA_DESCARGADA.value)
+
+    def marcar_persistidas(self, fecha: date, estados_descarga: dict):
+        """Recibe {código externo: estado de descarga} de las licitaciones ya guardadas."""
+        self._actualizar(fecha, estados_descarga, EtapaBitacora.PERSISTIDA.value)
+
+    def completar_dia(self, fecha: date):
+        with self.session_factory() as sesion:
+            try:
+                sesion.execute(
+                    update(BitacoraDiaIngesta)
+                    .where(BitacoraDiaIngesta.fecha == fecha)
+                    .values(estado=DIA_BITACORA_COMPLETADO, actualizado=datetime.now())
+                )
+                sesion.commit()
+            except Exception as e:
+                sesion.rollback()
+                logger.error(f"Error completando el día {fecha} en la bitácora: {e}")
+
+    def plan_reanudacion(self, fecha: date) -> dict:
+        """
+        Resume el avance registrado de un día:
+          - 'conocido': el día ya fue listado en alguna ejecución anterior.
+          - 'completo': día terminado y sin fichas pendientes; puede omitirse.
+          - 'persistidas': códigos ya guardados que no requieren nada más.
+          - 'pendientes': códigos cuya ficha falló por red o servidor; se reintentan primero.
+          - 'fichas_descargadas': fichas obtenidas pero no persistidas (recuperables del archivo).
+        """
+        plan = {"conocido": False, "completo": False,
+                "persistidas": set(), "pendientes": set(), "fichas_descargadas": set()}
+        with self.session_factory() as sesion:
+            try:
+                estado_dia = sesion.scalar(
+                    select(BitacoraDiaIngesta.estado).where(BitacoraDiaIngesta.fecha == fecha)
+                )
+                if estado_dia is None:
+                    return plan
+
+                filas = sesion.query(
+                    BitacoraLicitacionIngesta.codigo_externo,
+                    BitacoraLicitacionIngesta.etapa,
+                    BitacoraLicitacionIngesta.estado_descarga,
+                ).filter_by(fecha=fecha).all()
+            except Exception as e:
+                logger.error(f"Error leyendo la bitácora del {fecha}: {e}")
+                return plan
+
+        for codigo, etapa, estado_descarga in filas:
+            if (estado_descarga or "").startswith(PREFIJO_DESCARGA_PENDIENTE):
+                plan["pendientes"].add(codigo)
+            elif etapa == EtapaBitacora.PERSISTIDA.value:
+                plan["persistidas"].add(codigo)
+            elif etapa == EtapaBitacora.FICHA_DESCARGADA.value:
+                plan["fichas_descargadas"].add(codigo)
+
+        plan["conocido"] = True
+        plan["completo"] = estado_dia == DIA_BITACORA_COMPLETADO and not plan["pendientes"]
+        return plan
+
+    def _actualizar(self, fecha: date, estados_descarga: dict, etapa: str):
+        if not estados_descarga:
+            return
+
+        tabla = BitacoraLicitacionIngesta.__table__
+        ahora = datetime.now()
+        # Sentencia Core con executemany: una sola ida y vuelta para todo el lote
+        sentencia = update(tabla).where(
+            tabla.c.fecha == fecha,
+            tabla.c.codigo_externo == bindparam("b_codigo"),
+        ).values(etapa=etapa, actualizado=ahora)
+        if etapa == EtapaBitacora.PERSISTIDA.value:
+            sentencia = sentencia.values(estado_descarga=bindparam("b_estado"))
+
+        with self.session_factory() as sesion:
+            try:
+                sesion.execute(sentencia, [
+                    {"b_codigo": codigo, "b_estado": estado}
+                    for codigo, estado in estados_descarga.items()
+                ])
+                sesion.commit()
+            except Exception as e:
+                sesion.rollback()
+                logger.error(f"Error actualizando la bitácora del {fecha} ({etapa}): {e}")
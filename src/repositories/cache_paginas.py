@@ -0,0 +1,141 @@
+import sys
+import threading
+from collections import OrderedDict
+from sqlalchemy import inspect
+from sqlalchemy.orm import MANYTOONE
+from sqlalchemy.orm.attributes import set_committed_value
+from src.config.constantes import EtapaLicitacion, LIMITE_MEMORIA_CACHE_PAGINAS
+
+
+class CachePaginas:
+    """
+    Caché de lectura (read-through) de páginas de licitaciones por etapa.
+
+    Cada entrada se indexa por (etapa, límite, desplazamiento) y guarda copias
+    desacopladas de los objetos; cada lectura entrega copias nuevas, de modo que
+    ningún llamador comparte instancias con otro. La expulsión es LRU y está acotada
+    por una estimación del consumo de memoria, no por cantidad de páginas.
+
+    Es seguro entre hilos: la interfaz lee mientras el hilo de extracción
+    puede invalidar al terminar de persistir un lote. Cada invalidación avanza la
+    'generacion'; una página consultada antes de una invalidación no se almacena.
+    """
+
+    def __init__(self, limite_bytes: int = LIMITE_MEMORIA_CACHE_PAGINAS):
+        self.limite_bytes = limite_bytes
+        self._paginas = OrderedDict()
+        self._bytes_en_uso = 0
+        self._generacion = 0
+        self.cerrojo = threading.Lock()
+
+    @property
+    def generacion(self) -> int:
+        """Se lee antes de consultar la base de datos y se entrega luego a guardar()."""
+        with self.cerrojo:
+            return self._generacion
+
+    @staticmethod
+    def normalizar_etapa(etapa) -> str:
+        """Las licitaciones sin etapa se consideran candidatas (misma regla que la consulta)."""
+        return etapa or EtapaLicitacion.CANDIDATA.value
+
+    def obtener(self, etapa: str, limite: int, desplazamiento: int):
+        """Retorna una copia de la página almacenada o None si no existe."""
+        clave = (self.normalizar_etapa(etapa), limite, desplazamiento)
+        with self.cerrojo:
+            entrada = self._paginas.get(clave)
+            if entrada is None:
+                return None
+            self._paginas.move_to_end(clave)
+            pagina = entrada[0]
+        return [_copiar(objeto) for objeto in pagina]
+
+    def guardar(self, etapa: str, limite: int, desplazamiento: int, resultados: list,
+                generacion: int = None):
+        """
+        Almacena una copia de la página y expulsa las menos usadas si se excede el
+        presupuesto de memoria. Con 'generacion', se descarta si hubo una invalidación
+        desde que se leyó (la página podría estar obsoleta).
+        """
+        clave = (self.normalizar_etapa(etapa), limite, desplazamiento)
+        copias = [_copiar(objeto) for objeto in resultados]
+        tamanio = self._estimar_tamanio(copias)
+        if tamanio > self.limite_bytes:
+            return
+
+        with self.cerrojo:
+            if generacion is not None and generacion != self._generacion:
+                return
+            anterior = self._paginas.pop(clave, None)
+            if anterior is not None:
+                self._bytes_en_uso -= anterior[1]
+
+            self._paginas[clave] = (copias, tamanio)
+            self._bytes_en_uso += tamanio
+
+            while self._bytes_en_uso > self.limite_bytes and self._paginas:
+                _, (_, tamanio_expulsado) = self._paginas.popitem(last=False)
+                self._bytes_en_uso -= tamanio_expulsado
+
+    def invalidar_etapas(self, *etapas):
+        """Descarta únicamente las páginas de las etapas indicadas."""
+        etapas_normalizadas = {self.normalizar_etapa(etapa) for etapa in etapas}
+        with self.cerrojo:
+            self._generacion += 1
+            for clave in [c for c in self._paginas if c[0] in etapas_normalizadas]:
+                _, tamanio = self._paginas.pop(clave)
+                self._bytes_en_uso -= tamanio
+
+    def invalidar_todo(self):
+        """Vacía la caché completa (ej. tras una ingesta masiva que afecta a todas las etapas)."""
+        with self.cerrojo:
+            self._generacion += 1
+            self._paginas.clear()
+            self._bytes_en_uso = 0
+
+    @property
+    def bytes_en_uso(self) -> int:
+        return self._bytes_en_uso
+
+    @staticmethod
+    def _estimar_tamanio(resultados: list) -> int:
+        """
+        Aproximación del consumo en RAM de una página: suma el tamaño de los atributos
+        cargados en cada objeto (los textos largos dominan el total).
+        """
+        total = sys.getsizeof(resultados)
+        for objeto in resultados:
+            atributos = getattr(objeto, "__dict__", {})
+            total += sys.getsizeof(objeto)
+            total += sum(sys.getsizeof(valor) for valor in atributos.values())
+        return total
+
+
+def _copiar(objeto):
+    """
+    Copia desacoplada de una entidad: columnas cargadas y relaciones muchos-a-uno ya
+    cargadas (p. ej. 'estado'), sin recorrer otras relaciones.
+    """
+    estado = inspect(objeto, raiseerr=False)
+    if estado is None:
+        return objeto
+    return _copiar_entidad(estado, profundidad=1)
+
+
+def _copiar_entidad(estado, profundidad: int):
+    copia = estado.mapper.class_manager.new_instance()
+    cargados = estado.dict
+    for atributo in estado.mapper.column_attrs:
+        if atributo.key in cargados:
+            set_committed_value(copia, atributo.key, cargados[atributo.key])
+    if profundidad:
+        for relacion in estado.mapper.relationships:
+            if relacion.direction is MANYTOONE and relacion.key in cargados:
+                relacionado = cargados[relacion.key]
+                set_committed_value(copia, relacion.key, None if relacionado is None
+                                    else _copiar_entidad(inspect(relacionado), profundidad - 1))
+    return copia
+
+
+# Instancia compartida por todos los repositorios de la aplicación (ver src/services/instancias.py)
+cache_paginas_compartida = CachePaginas()
@@ -0,0 +1,117 @@
+from datetime import datetime, timedelta, date
+from sqlalchemy import select, insert, delete
+from src.bd.database import SessionLocal
+from src.bd.models import ReintentoDetalle
+from src.utils.logger import configurar_logger
+from src.config.constantes import COLA_REINTENTOS_MAX_INTENTOS, COLA_REINTENTOS_MINUTOS_BASE
+
+logger = configurar_logger("cola_reintentos")
+
+
+class ColaReintentosDetalle:
+    """
+    Cola persistente de fichas de detalle pendientes por errores de red o servidor.
+
+    Cada entrada lleva la cuenta de intentos y la fecha del próximo intento, que se
+    aleja exponencialmente con cada fallo. Tras COLA_REINTENTOS_MAX_INTENTOS la ficha
+    se abandona y la licitación conserva su puntaje por título.
+    """
+
+    def __init__(self, session_factory=SessionLocal,
+                 max_intentos: int = COLA_REINTENTOS_MAX_INTENTOS,
+                 minutos_base: int = COLA_REINTENTOS_MINUTOS_BASE):
+        self.session_factory = session_factory
+        self.max_intentos = max_intentos
+        self.minutos_base = minutos_base
+
+    def encolar(self, fecha_listado: date, estados_descarga: dict):
+        """
+        Agrega las fichas pendientes del lote ({código: estado}). Las que ya estaban
+        en la cola conservan su calendario de reintentos.
+        """
+        if not estados_descarga:
+            return
+
+        ahora = datetime.now()
+        with self.session_factory() as sesion:
+            try:
+                existentes = set(sesion.scalars(
+                    select(ReintentoDetalle.codigo_externo)
+                    .where(ReintentoDetalle.codigo_externo.in_(list(estados_descarga)))
+                ))
+                nuevas = [
+                    {"codigo_externo": codigo, "fecha_listado": fecha_listado, "intentos": 0,
+                     "proximo_intento": ahora + timedelta(minutes=self.minutos_base),
+                     "ultimo_estado": estado, "creado": ahora}
+                    for codigo, estado in estados_descarga.items() if codigo not in existentes
+                ]
+                if nuevas:
+                    sesion.execute(insert(ReintentoDetalle), nuevas)
+                sesion.commit()
+            except Exception as e:
+                sesion.rollback()
+                logger.error(f"Error encolando {len(estados_descarga)} fichas pendientes: {e}")
+
+    def obtener_vencidas(self, limite: int) -> list:
+        """Entradas cuyo próximo intento ya llegó, las más atrasadas primero."""
+        with self.session_factory() as sesion:
+            try:
+                return sesion.execute(
+                    select(ReintentoDetalle.codigo_externo, ReintentoDetalle.fecha_listado)
+                    .where(ReintentoDetalle.proximo_intento <= datetime.now())
+                    .order_by(ReintentoDetalle.proximo_intento)
+                    .limit(limite)
+                ).all()
+            except Exception as e:
+                logger.error(f"Error leyendo la cola de reintentos: {e}")
+                return []
+
+    def registrar_fallos(self, estados_descarga: dict):
+        """Reprograma las fichas que volvieron a fallar; abandona las que agotaron sus intentos."""
+        if not estados_descarga:
+            return
+
+        ahora = datetime.now()
+        with self.session_factory() as sesion:
+            try:
+                entradas = sesion.query(ReintentoDetalle)\
+                    .filter(ReintentoDetalle.codigo_externo.in_(list(estados_descarga)))\
+                    .all()
+                for entrada in entradas:
+                    entrada.intentos += 1
+                    entrada.ultimo_estado = estados_descarga[entrada.codigo_externo]
+                    if entrada.intentos >= self.max_intentos:
+                        logger.warning(f"Ficha {entrada.codigo_externo} abandonada tras {entrada.intentos} intentos "
+                                       f"({entrada.ultimo_estado}).")
+                        sesion.delete(entrada)
+                    else:
+                        espera = self.minutos_base * (2 ** entrada.intentos)
+                        entrada.proximo_intento = ahora + timedelta(minutes=espera)
+                sesion.commit()
+            except Exception as e:
+                sesion.rollback()
+                logger.error(f"Error reprogramando reintentos: {e}")
+
+    def quitar(self, codigos_externos: list):
+        """Retira de la cola las fichas ya recuperadas o que no requieren más intentos."""
+        if not codigos_externos:
+            return
+
+        with self.session_factory() as sesion:
+            try:
+                sesion.execute(
+                    delete(ReintentoDetalle)
+                    .where(ReintentoDetalle.codigo_externo.in_(list(codigos_externos)))
+                )
+                sesion.commit()
+            except Exception as e:
+                sesion.rollback()
+                logger.error(f"Error retirando fichas de la cola de reintentos: {e}")
+
+    def contar(self) -> int:
+        with self.session_factory() as sesion:
+            try:
+                return sesion.query(ReintentoDetalle).count()
+            except Exception as e:
+                logger.error(f"Error contando la cola de reintentos: {e}")
+                return 0
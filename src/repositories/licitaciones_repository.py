@@ -1,7 +1,16 @@
+import re
 from sqlalchemy.orm import joinedload
-from sqlalchemy import or_
+from sqlalchemy import or_, update, any_, bindparam, text, String
+from sqlalchemy.dialects.postgresql import ARRAY
 from src.bd.database import SessionLocal
-from src.bd.models import Licitacion
+from src.bd.models import Licitacion, LicitacionArchivada, LicitacionDetalle, LicitacionItem
+from src.repositories.cache_paginas import cache_paginas_compartida
+from src.repositories.resumen_etapas import (
+    ajustar_resumen_movimiento,
+    contar_visibles_por_etapa,
+    histograma_puntajes
+)
+from src.utils.busqueda_texto import IndiceInvertido, tokenizar, resaltar_fragmento
 from src.utils.logger import configurar_logger
 from src.config.constantes import (
     ESTADO_LICITACION_ACTIVA,
@@ -14,15 +23,97 @@ from src.config.constantes import (
 
 logger = configurar_logger("repositorio_licitaciones")
 
+# Búsqueda de texto completo repartida en dos índices GIN: la expresión tsvector del nombre
+# (peso A) y la columna generada 'licitacion_detalle.busqueda' (pesos B y C). Como en el
+# respaldo local, cada licitación se evalúa sobre la unión de ambos vectores, de modo que los
+# términos pueden repartirse entre nombre y detalle. Los índices preseleccionan con la
+# disyunción de los lexemas positivos de la consulta (querytree descarta negaciones y
+# conserva los lexemas de las frases), que nunca descarta una licitación que coincida
+# completa. Una consulta solo de negaciones no tiene lexemas que indexar y recorre la tabla.
+# El fragmento resaltado (ts_headline) solo se calcula para los mejores resultados.
+SQL_ARBOL_CONSULTA_TEXTO = "SELECT querytree(websearch_to_tsquery('spanish', :texto))"
+
+SQL_PRESELECCION_INDEXADA = """
+    preseleccion AS (
+        SELECT l.id
+        FROM licitaciones l
+        WHERE to_tsvector('spanish', coalesce(l.nombre, '')) @@ CAST(:prefiltro AS tsquery)
+        UNION
+        SELECT d.licitacion_id
+        FROM licitacion_detalle d
+        WHERE d.busqueda @@ CAST(:prefiltro AS tsquery)
+    ),"""
+
+SQL_PRESELECCION_COMPLETA = """
+    preseleccion AS (
+        SELECT l.id FROM licitaciones l
+    ),"""
+
+SQL_BUSQUEDA_TEXTO_COMPLETO = """
+    WITH consulta AS (
+        SELECT websearch_to_tsquery('spanish', :texto) AS q
+    ),{preseleccion}
+    documentos AS (
+        SELECT l.id,
+               setweight(to_tsvector('spanish', coalesce(l.nombre, '')), 'A')
+                   || coalesce(d.busqueda, ''::tsvector) AS documento
+        FROM preseleccion p
+        JOIN licitaciones l ON l.id = p.id
+        LEFT JOIN licitacion_detalle d ON d.licitacion_id = l.id
+        WHERE (:etapa IS NULL OR COALESCE(l.etapa, :etapa_candidata) = :etapa)
+          AND (NOT :solo_candidatas
+               OR (l.puntaje > :umbral_candidata AND l.codigo_estado = :estado_activo))
+    ),
+    mejores AS (
+        SELECT doc.id, ts_rank(doc.documento, consulta.q) AS rango
+        FROM documentos doc, consulta
+        WHERE doc.documento @@ consulta.q
+        ORDER BY rango DESC
+        LIMIT :limite
+    )
+    SELECT m.id, m.rango,
+           ts_headline('spanish',
+                       concat_ws(' ', l.nombre, d.descripcion, d.detalle_productos),
+                       consulta.q,
+                       'StartSel=<b>, StopSel=</b>, MaxWords=25, MinWords=8, MaxFragments=2')
+    FROM mejores m
+    JOIN licitaciones l ON l.id = m.id
+    LEFT JOIN licitacion_detalle d ON d.licitacion_id = m.id
+    CROSS JOIN consulta
+    ORDER BY m.rango DESC
+"""
+
+
+def _prefiltro_lexemas(arbol: str):
+    """
+    Disyunción tsquery de los lexemas citados en la salida de querytree, o None si la
+    consulta no tiene lexemas positivos ('T' cuando todo está negado).
+    """
+    lexemas = list(dict.fromkeys(re.findall(r"'(?:[^']|'')*'", arbol or "")))
+    return " | ".join(lexemas) or None
+
+
+def _filtros_candidatas() -> tuple:
+    """Predicado de la bandeja de candidatas; la búsqueda restringida a esa etapa usa el mismo."""
+    return (
+        Licitacion.puntaje > UMBRAL_PUNTAJE_CANDIDATA,
+        or_(Licitacion.etapa == EtapaLicitacion.CANDIDATA.value, Licitacion.etapa.is_(None)),
+        Licitacion.codigo_estado == ESTADO_LICITACION_ACTIVA,
+    )
+
 
 class RepositorioLicitaciones:
     """
     Gestiona las transacciones y consultas de base de datos para las licitaciones.
     Centraliza la lógica de filtrado y cambio de etapas del modelo MVC.
+
+    Las páginas de cada etapa se sirven desde una caché compartida de lectura
+    que solo se invalida para las etapas afectadas por cada movimiento.
     """
 
-    def __init__(self, session_factory=SessionLocal):
+    def __init__(self, session_factory=SessionLocal, cache=cache_paginas_compartida):
         self.session_factory = session_factory
+        self.cache = cache
 
     def obtener_licitaciones_activas(self) -> list:
         with self.session_factory() as sesion:
@@ -42,66 +133,254 @@ class RepositorioLicitaciones:
         Transfiere una licitación específica hacia una nueva etapa del flujo.
         Se espera que 'nueva_etapa' provenga de EtapaLicitacion.XXX.value
         """
+        return self.mover_licitaciones([codigo_externo], nueva_etapa) > 0
+
+    def mover_licitaciones(self, codigos_externos: list, nueva_etapa: str) -> int:
+        """
+        Transfiere un conjunto de licitaciones a una nueva etapa con un único UPDATE
+        (una sola transacción sin importar la cantidad de registros).
+        Retorna la cantidad de filas afectadas (0 ante error).
+        """
+        if not codigos_externos:
+            return 0
+
         with self.session_factory() as sesion:
             try:
-                licitacion = sesion.query(Licitacion).filter_by(codigo_externo=codigo_externo).first()
-                if licitacion:
-                    licitacion.etapa = nueva_etapa
-                    sesion.commit()
-                    return True
-                return False
+                filtro_codigos = self._filtro_codigos(sesion, codigos_externos)
+
+                # Estado previo de las filas: etapas de origen para invalidar solo las páginas
+                # afectadas en la caché y datos para ajustar los contadores del resumen
+                filas_movidas = sesion.query(
+                    Licitacion.etapa, Licitacion.codigo_estado, Licitacion.puntaje
+                ).filter(filtro_codigos).all()
+                etapas_origen = {etapa for etapa, _, _ in filas_movidas}
+
+                resultado = sesion.execute(
+                    update(Licitacion)
+                    .where(filtro_codigos)
+                    .values(etapa=nueva_etapa)
+                    .execution_options(synchronize_session=False)
+                )
+                ajustar_resumen_movimiento(sesion, filas_movidas, nueva_etapa)
+                sesion.commit()
+
+                self.cache.invalidar_etapas(*etapas_origen, nueva_etapa)
+                return resultado.rowcount
             except Exception as e:
                 sesion.rollback()
-                logger.error(f"Error al mover la licitación {codigo_externo} a {nueva_etapa}: {e}")
-                return False
+                logger.error(f"Error al mover {len(codigos_externos)} licitaciones a {nueva_etapa}: {e}")
+                return 0
+
+    def _filtro_codigos(self, sesion, codigos_externos: list):
+        """
+        Condición de pertenencia por código externo. En PostgreSQL se envía la lista
+        como un único parámetro de tipo arreglo (= ANY(:codigos)); otros motores usan IN.
+        """
+        if sesion.get_bind().dialect.name == "postgresql":
+            parametro = bindparam("codigos", list(codigos_externos), type_=ARRAY(String))
+            return Licitacion.codigo_externo == any_(parametro)
+        return Licitacion.codigo_externo.in_(list(codigos_externos))
 
     def obtener_candidatas(self, limit=TAMANIO_PAGINA_TABLAS, offset=0) -> list:
         """Recupera licitaciones candidatas con soporte para paginación."""
+        def consulta(sesion):
+            # Aplicamos filtros de puntaje, etapa y ESTADO ACTIVO, ordenando por relevancia
+            return sesion.query(Licitacion)\
+                .options(joinedload(Licitacion.estado))\
+                .filter(*_filtros_candidatas())\
+                .order_by(Licitacion.puntaje.desc())\
+                .limit(limit).offset(offset).all()
+
+        return self._obtener_pagina(EtapaLicitacion.CANDIDATA.value, limit, offset, consulta)
+
+    def obtener_seguimiento(self, limit=TAMANIO_PAGINA_TABLAS, offset=0) -> list:
+        """Recupera licitaciones en seguimiento con soporte para paginación."""
+        def consulta(sesion):
+            return sesion.query(Licitacion)\
+                .options(joinedload(Licitacion.estado))\
+                .filter(Licitacion.etapa == EtapaLicitacion.SEGUIMIENTO.value)\
+                .order_by(Licitacion.puntaje.desc())\
+                .limit(limit).offset(offset).all()
+
+        return self._obtener_pagina(EtapaLicitacion.SEGUIMIENTO.value, limit, offset, consulta)
+
+    def obtener_ofertadas(self, limit=TAMANIO_PAGINA_TABLAS, offset=0) -> list:
+        """Recupera licitaciones ofertadas con soporte para paginación."""
+        def consulta(sesion):
+            return sesion.query(Licitacion)\
+                .options(joinedload(Licitacion.estado))\
+                .filter(Licitacion.etapa == EtapaLicitacion.OFERTADA.value)\
+                .order_by(Licitacion.puntaje.desc())\
+                .limit(limit).offset(offset).all()
+
+        return self._obtener_pagina(EtapaLicitacion.OFERTADA.value, limit, offset, consulta)
+
+    def obtener_totales_etapas(self) -> dict:
+        """
+        Totales de licitaciones visibles por etapa, leídos desde la tabla resumen
+        (no recorre 'licitaciones'). Retorna {} ante error.
+        """
         with self.session_factory() as sesion:
             try:
-                # Aplicamos filtros de puntaje, etapa y ESTADO ACTIVO, ordenando por relevancia
-                return sesion.query(Licitacion)\
-                    .options(joinedload(Licitacion.estado))\
-                    .filter(Licitacion.puntaje > UMBRAL_PUNTAJE_CANDIDATA)\
-                    .filter(or_(Licitacion.etapa == EtapaLicitacion.CANDIDATA.value, Licitacion.etapa.is_(None)))\
-                    .filter(Licitacion.codigo_estado == ESTADO_LICITACION_ACTIVA)\
-                    .order_by(Licitacion.puntaje.desc())\
-                    .limit(limit).offset(offset).all()
+                return contar_visibles_por_etapa(sesion)
+            except Exception as e:
+                logger.error(f"Error obteniendo totales por etapa: {e}")
+                return {}
+
+    def obtener_histograma_puntajes(self, etapa: str) -> list:
+        """Distribución de puntajes de una etapa según los tramos de LIMITES_TRAMOS_PUNTAJE."""
+        with self.session_factory() as sesion:
+            try:
+                return histograma_puntajes(sesion, etapa)
             except Exception as e:
-                logger.error(f"Error obteniendo candidatas paginadas: {e}")
+                logger.error(f"Error obteniendo histograma de la etapa '{etapa}': {e}")
                 return []
 
-    def obtener_seguimiento(self, limit=TAMANIO_PAGINA_TABLAS, offset=0) -> list:
-        """Recupera licitaciones en seguimiento con soporte para paginación."""
+    def _obtener_pagina(self, etapa: str, limit: int, offset: int, consulta) -> list:
+        """
+        Lectura a través de la caché: si la página de la etapa ya fue consultada
+        y no ha sido invalidada, se retorna sin tocar la base de datos.
+        Los errores no se almacenan para que el siguiente intento vuelva a consultar,
+        ni las páginas leídas antes de una invalidación concurrente.
+        """
+        resultados = self.cache.obtener(etapa, limit, offset)
+        if resultados is not None:
+            return resultados
+
+        generacion = self.cache.generacion
         with self.session_factory() as sesion:
             try:
-                return sesion.query(Licitacion)\
-                    .options(joinedload(Licitacion.estado))\
-                    .filter(Licitacion.etapa == EtapaLicitacion.SEGUIMIENTO.value)\
-                    .order_by(Licitacion.puntaje.desc())\
-                    .limit(limit).offset(offset).all()
+                resultados = consulta(sesion)
             except Exception as e:
-                logger.error(f"Error obteniendo licitaciones en seguimiento (paginación): {e}")
+                logger.error(f"Error obteniendo licitaciones en etapa '{etapa}' (paginación): {e}")
                 return []
 
-    def obtener_ofertadas(self, limit=TAMANIO_PAGINA_TABLAS, offset=0) -> list:
-        """Recupera licitaciones ofertadas con soporte para paginación."""
+        self.cache.guardar(etapa, limit, offset, resultados, generacion)
+        return resultados
+
+    def buscar_licitaciones(self, texto: str, etapa: str = None, limit=TAMANIO_PAGINA_TABLAS) -> list:
+        """
+        Búsqueda de texto completo sobre nombre, descripción y productos.
+        Retorna [(licitacion, rango, fragmento_resaltado)] ordenado por relevancia,
+        opcionalmente restringido a una etapa del flujo (la de candidatas con el mismo
+        criterio de puntaje y estado que su bandeja).
+
+        PostgreSQL usa el índice GIN del tsvector en configuración 'spanish';
+        otros motores recurren a un índice invertido local construido al vuelo.
+        """
+        if not texto or not texto.strip():
+            return []
+
+        with self.session_factory() as sesion:
+            try:
+                if sesion.get_bind().dialect.name == "postgresql":
+                    coincidencias = self._buscar_texto_postgresql(sesion, texto, etapa, limit)
+                else:
+                    coincidencias = self._buscar_texto_local(sesion, texto, etapa, limit)
+
+                if not coincidencias:
+                    return []
+
+                ids = [identificador for identificador, _, _ in coincidencias]
+                licitaciones = {
+                    lic.id: lic for lic in sesion.query(Licitacion)
+                    .options(joinedload(Licitacion.estado))
+                    .filter(Licitacion.id.in_(ids)).all()
+                }
+                return [
+                    (licitaciones[identificador], rango, fragmento)
+                    for identificador, rango, fragmento in coincidencias
+                    if identificador in licitaciones
+                ]
+            except Exception as e:
+                logger.error(f"Error en búsqueda de texto '{texto}': {e}")
+                return []
+
+    def _buscar_texto_postgresql(self, sesion, texto: str, etapa: str, limit: int) -> list:
+        prefiltro = _prefiltro_lexemas(sesion.execute(text(SQL_ARBOL_CONSULTA_TEXTO), {"texto": texto}).scalar())
+        preseleccion = SQL_PRESELECCION_INDEXADA if prefiltro else SQL_PRESELECCION_COMPLETA
+        filas = sesion.execute(text(SQL_BUSQUEDA_TEXTO_COMPLETO.format(preseleccion=preseleccion)), {
+            "texto": texto,
+            "prefiltro": prefiltro,
+            "etapa": etapa,
+            "etapa_candidata": EtapaLicitacion.CANDIDATA.value,
+            "solo_candidatas": etapa == EtapaLicitacion.CANDIDATA.value,
+            "umbral_candidata": UMBRAL_PUNTAJE_CANDIDATA,
+            "estado_activo": ESTADO_LICITACION_ACTIVA,
+            "limite": limit,
+        })
+        return [(fila[0], float(fila[1]), fila[2]) for fila in filas]
+
+    def _buscar_texto_local(self, sesion, texto: str, etapa: str, limit: int) -> list:
+        consulta = sesion.query(Licitacion.id, Licitacion.nombre,
+                                LicitacionDetalle.descripcion, LicitacionDetalle.detalle_productos)\
+            .outerjoin(LicitacionDetalle)
+        if etapa == EtapaLicitacion.CANDIDATA.value:
+            consulta = consulta.filter(*_filtros_candidatas())
+        elif etapa:
+            consulta = consulta.filter(Licitacion.etapa == etapa)
+
+        # Pesos equivalentes a setweight A/B/C de la columna tsvector
+        indice = IndiceInvertido(pesos_campos=(1.0, 0.4, 0.2))
+        textos = {}
+        for identificador, nombre, descripcion, productos in consulta:
+            indice.agregar(identificador, nombre, descripcion, productos)
+            textos[identificador] = " ".join(t for t in (nombre, descripcion, productos) if t)
+
+        terminos = set(tokenizar(texto))
+        return [
+            (identificador, rango, resaltar_fragmento(textos[identificador], terminos))
+            for identificador, rango in indice.buscar(texto, limit)
+        ]
+
+    def obtener_justificacion(self, codigo_externo: str):
+        """Auditoría del puntaje de una licitación, consultada bajo demanda (tooltip de los listados)."""
+        with self.session_factory() as sesion:
+            try:
+                return sesion.query(LicitacionDetalle.justificacion_puntaje)\
+                    .join(Licitacion)\
+                    .filter(Licitacion.codigo_externo == codigo_externo)\
+                    .scalar()
+            except Exception as e:
+                logger.error(f"Error obteniendo justificación de {codigo_externo}: {e}")
+                return None
+
+    def obtener_licitaciones_por_producto(self, codigo_producto: str, limit=TAMANIO_PAGINA_TABLAS) -> list:
+        """
+        Licitaciones que solicitan un producto del catálogo ONU (CodigoProducto),
+        resuelto con el índice de 'licitacion_items' en lugar de buscar en el texto.
+        """
         with self.session_factory() as sesion:
             try:
                 return sesion.query(Licitacion)\
                     .options(joinedload(Licitacion.estado))\
-                    .filter(Licitacion.etapa == EtapaLicitacion.OFERTADA.value)\
+                    .filter(Licitacion.id.in_(
+                        sesion.query(LicitacionItem.licitacion_id)
+                        .filter(LicitacionItem.codigo_producto == str(codigo_producto))
+                    ))\
                     .order_by(Licitacion.puntaje.desc())\
-                    .limit(limit).offset(offset).all()
+                    .limit(limit).all()
             except Exception as e:
-                logger.error(f"Error obteniendo licitaciones ofertadas (paginación): {e}")
+                logger.error(f"Error buscando licitaciones por producto {codigo_producto}: {e}")
                 return []
 
     def obtener_licitacion_por_codigo(self, codigo_externo: str):
+        """
+        Busca primero en la tabla principal y, si no está, en el archivo de
+        licitaciones no vigentes (ambos modelos exponen los mismos atributos).
+        """
         with self.session_factory() as sesion:
             try:
-                return sesion.query(Licitacion)\
-                    .options(joinedload(Licitacion.estado), joinedload(Licitacion.organismo))\
+                licitacion = sesion.query(Licitacion)\
+                    .options(joinedload(Licitacion.estado), joinedload(Licitacion.organismo),
+                             joinedload(Licitacion.detalle))\
+                    .filter_by(codigo_externo=codigo_externo)\
+                    .first()
+                if licitacion is not None:
+                    return licitacion
+
+                return sesion.query(LicitacionArchivada)\
+                    .options(joinedload(LicitacionArchivada.estado), joinedload(LicitacionArchivada.organismo))\
                     .filter_by(codigo_externo=codigo_externo)\
                     .first()
             except Exception as e:
@@ -0,0 +1,146 @@
+"""
+Mantenimiento de la tabla desnormalizada 'resumen_etapas'.
+
+Las funciones reciben la sesión del llamador para que los contadores se
+actualicen dentro de la misma transacción que modifica 'licitaciones'.
+"""
+from bisect import bisect_right
+from collections import Counter
+from sqlalchemy import func, delete, insert, update, text
+from sqlalchemy.orm import Session
+from src.bd.models import Licitacion, ResumenEtapa
+from src.config.constantes import (
+    LIMITES_TRAMOS_PUNTAJE,
+    UMBRAL_PUNTAJE_CANDIDATA,
+    ESTADO_LICITACION_ACTIVA,
+    EtapaLicitacion
+)
+
+# Primer tramo cuyos puntajes superan el umbral de candidatas
+TRAMO_MINIMO_CANDIDATA = bisect_right(LIMITES_TRAMOS_PUNTAJE, UMBRAL_PUNTAJE_CANDIDATA) + 1
+
+
+def tramo_puntaje(puntaje) -> int:
+    """Índice del tramo del histograma al que pertenece un puntaje (None cuenta como 0)."""
+    return bisect_right(LIMITES_TRAMOS_PUNTAJE, puntaje or 0)
+
+
+def _etapa_normalizada(etapa) -> str:
+    # Los registros sin etapa se listan como candidatas
+    return etapa or EtapaLicitacion.CANDIDATA.value
+
+
+def _clave_resumen(etapa, codigo_estado, puntaje) -> tuple:
+    # La API entrega el código de estado como texto; la tabla lo guarda como entero
+    try:
+        codigo_estado = int(codigo_estado) if codigo_estado is not None else None
+    except (ValueError, TypeError):
+        pass
+    return _etapa_normalizada(etapa), codigo_estado, tramo_puntaje(puntaje)
+
+
+def fila_resumen(licitacion) -> tuple:
+    """(etapa, codigo_estado, puntaje) de una licitación, tal como la cuentan los contadores."""
+    return licitacion.etapa, licitacion.codigo_estado, licitacion.puntaje
+
+
+def recalcular_resumen(sesion: Session):
+    """
+    Reconstruye los contadores completos con un único GROUP BY sobre 'licitaciones'.
+
+    Es una reconciliación puntual (al final de una ingesta): las escrituras corrientes
+    ajustan los contadores de forma incremental con ajustar_resumen_cambios.
+    """
+    if sesion.get_bind().dialect.name == "postgresql":
+        # Los ajustes incrementales concurrentes esperan al recuento en vez de perderse
+        sesion.execute(text("LOCK TABLE resumen_etapas IN EXCLUSIVE MODE"))
+
+    conteos = Counter()
+    filas = sesion.query(Licitacion.etapa, Licitacion.codigo_estado, Licitacion.puntaje, func.count())\
+        .group_by(Licitacion.etapa, Licitacion.codigo_estado, Licitacion.puntaje)
+
+    for etapa, codigo_estado, puntaje, cantidad in filas:
+        conteos[_clave_resumen(etapa, codigo_estado, puntaje)] += cantidad
+
+    sesion.execute(delete(ResumenEtapa))
+    if conteos:
+        sesion.execute(insert(ResumenEtapa), [
+            {"etapa": etapa, "codigo_estado": codigo_estado, "tramo_puntaje": tramo, "cantidad": cantidad}
+            for (etapa, codigo_estado, tramo), cantidad in conteos.items()
+        ])
+
+
+def ajustar_resumen_movimiento(sesion: Session, filas_movidas: list, etapa_destino: str):
+    """
+    Actualización incremental tras un cambio de etapa.
+    'filas_movidas' contiene (etapa_origen, codigo_estado, puntaje) de cada licitación movida.
+    """
+    ajustar_resumen_cambios(
+        sesion, filas_movidas,
+        [(etapa_destino, codigo_estado, puntaje) for _, codigo_estado, puntaje in filas_movidas]
+    )
+
+
+def ajustar_resumen_cambios(sesion: Session, filas_anteriores: list, filas_nuevas: list):
+    """
+    Actualización incremental tras insertar, modificar o eliminar licitaciones.
+    Cada fila es (etapa, codigo_estado, puntaje): las anteriores restan y las nuevas
+    suman, de modo que una inserción solo aporta su fila nueva y una eliminación
+    solo su fila anterior.
+    """
+    deltas = Counter()
+    for fila in filas_anteriores:
+        deltas[_clave_resumen(*fila)] -= 1
+    for fila in filas_nuevas:
+        deltas[_clave_resumen(*fila)] += 1
+
+    for (etapa, codigo_estado, tramo), delta in deltas.items():
+        if delta == 0:
+            continue
+        condicion = (
+            (ResumenEtapa.etapa == etapa)
+            & ResumenEtapa.codigo_estado.is_not_distinct_from(codigo_estado)
+            & (ResumenEtapa.tramo_puntaje == tramo)
+        )
+        # El incremento se resuelve en la BD para no perder actualizaciones concurrentes
+        resultado = sesion.execute(
+            update(ResumenEtapa).where(condicion)
+            .values(cantidad=ResumenEtapa.cantidad + delta)
+            .execution_options(synchronize_session=False)
+        )
+        if resultado.rowcount == 0 and delta > 0:
+            # Se inserta de inmediato (no con sesion.add): con autoflush=False, un ajuste
+            # posterior de la misma transacción no vería la fila y crearía un duplicado
+            sesion.execute(insert(ResumenEtapa).values(
+                etapa=etapa, codigo_estado=codigo_estado, tramo_puntaje=tramo, cantidad=delta
+            ))
+
+    # Los tramos que quedan vacíos se eliminan, igual que en un recálculo completo
+    sesion.execute(delete(ResumenEtapa).where(ResumenEtapa.cantidad <= 0))
+
+
+def contar_visibles_por_etapa(sesion: Session) -> dict:
+    """
+    Totales con los mismos criterios que los listados del repositorio:
+    las candidatas exigen estado activo y puntaje sobre el umbral.
+    """
+    totales = {}
+    for etapa, codigo_estado, tramo, cantidad in sesion.query(
+            ResumenEtapa.etapa, ResumenEtapa.codigo_estado,
+            ResumenEtapa.tramo_puntaje, ResumenEtapa.cantidad):
+        if etapa == EtapaLicitacion.CANDIDATA.value and (
+                codigo_estado != ESTADO_LICITACION_ACTIVA or tramo < TRAMO_MINIMO_CANDIDATA):
+            continue
+        totales[etapa] = totales.get(etapa, 0) + cantidad
+    return totales
+
+
+def histograma_puntajes(sesion: Session, etapa: str) -> list:
+    """Cantidad de licitaciones de la etapa por tramo de puntaje (un valor por tramo)."""
+    histograma = [0] * (len(LIMITES_TRAMOS_PUNTAJE) + 1)
+    filas = sesion.query(ResumenEtapa.tramo_puntaje, func.sum(ResumenEtapa.cantidad))\
+        .filter(ResumenEtapa.etapa == _etapa_normalizada(etapa))\
+        .group_by(ResumenEtapa.tramo_puntaje)
+    for tramo, cantidad in filas:
+        histograma[tramo] = int(cantidad or 0)
+    return histograma
@@ -1,69 +1,301 @@
 import os
 import time
+import threading
 from datetime import datetime
 import requests
+from src.utils.json_rapido import decodificar_json
 from src.utils.logger import configurar_logger
 
 logger = configurar_logger("recolector_api")
 
+URL_API_MERCADO_PUBLICO = "https://api.mercadopublico.cl/servicios/v1/publico/licitaciones.json"
+# Las esperas largas se duermen por tramos para atender una detención a tiempo
+TRAMO_ESPERA_S = 0.25
+
+
+class LimitadorTasa:
+    """
+    Reparte los turnos de petición entre todos los recolectores que comparten un ticket.
+    Cada llamador reserva su turno bajo el cerrojo y duerme fuera de él, de modo
+    que la extracción diaria y el drenado de reintentos respetan un único presupuesto.
+
+    También lleva la salud del ticket: un 429 aislado solo posterga su próximo turno;
+    al agotar su cuota se suspende y queda fuera del pool hasta que vence la suspensión.
+    """
+
+    def __init__(self):
+        self.ultima_peticion = 0.0
+        self.suspensiones = 0  # Respuestas 429 consecutivas, sin una petición exitosa entre ellas
+        self.suspendido_hasta = 0.0
+        self.cerrojo = threading.Lock()
+
+    def reservar_turno(self, pausa_minima: float) -> float:
+        """Retorna los segundos que el llamador debe esperar antes de su petición."""
+        with self.cerrojo:
+            ahora = time.time()
+            turno = max(ahora, self.ultima_peticion + pausa_minima)
+            self.ultima_peticion = turno
+            return turno - ahora
+
+    def proximo_turno(self, pausa_minima: float) -> float:
+        """Momento (epoch) en que podría atenderse la siguiente petición, sin reservarlo."""
+        with self.cerrojo:
+            return max(time.time(), self.ultima_peticion + pausa_minima)
+
+    def pausar(self, segundos: float):
+        """Limitación transitoria: posterga el próximo turno sin retirar el ticket."""
+        with self.cerrojo:
+            self.suspensiones += 1
+            self.ultima_peticion = max(self.ultima_peticion, time.time() + segundos)
+
+    def suspender(self, segundos: float):
+        with self.cerrojo:
+            self.suspensiones += 1
+            self.ultima_peticion = max(self.ultima_peticion, time.time() + segundos)
+            self.suspendido_hasta = max(self.suspendido_hasta, time.time() + segundos)
+
+    def suspendido(self) -> bool:
+        with self.cerrojo:
+            return time.time() < self.suspendido_hasta
+
+    def restablecer(self):
+        with self.cerrojo:
+            self.suspensiones = 0
+
+
+# Un limitador por ticket, compartido por todos los recolectores de la aplicación
+_limitadores_por_ticket = {}
+_cerrojo_limitadores = threading.Lock()
+
+
+def limitador_de_ticket(ticket: str) -> LimitadorTasa:
+    with _cerrojo_limitadores:
+        return _limitadores_por_ticket.setdefault(ticket, LimitadorTasa())
+
+
+def tickets_configurados() -> list:
+    """
+    Tickets de la API definidos en el entorno: TICKETS_MERCADO_PUBLICO (separados por
+    coma, uno por unidad de negocio) o, en su defecto, el único TICKET_MERCADO_PUBLICO.
+    """
+    varios = os.getenv("TICKETS_MERCADO_PUBLICO") or ""
+    tickets = [ticket.strip() for ticket in varios.split(",") if ticket.strip()]
+    return tickets or [os.getenv("TICKET_MERCADO_PUBLICO")]
+
+
+class PoolTickets:
+    """
+    Conjunto de tickets con que un recolector reparte sus peticiones.
+
+    Cada petición va al ticket que puede atenderla antes, es decir, al menos cargado
+    de los que no están suspendidos; así el rendimiento escala con la cantidad de
+    tickets. Si todos están suspendidos no se reserva turno: esperar horas a que
+    se recupere la cuota no tiene sentido dentro de una ejecución.
+    """
+
+    def __init__(self, tickets: list, limitador: LimitadorTasa = None):
+        self.tickets = list(dict.fromkeys(ticket for ticket in tickets if ticket))
+        # Un limitador explícito (pruebas) se comparte entre todos los tickets del pool
+        self.limitadores = {ticket: limitador or limitador_de_ticket(ticket) for ticket in self.tickets}
+        self.cerrojo = threading.Lock()
+
+    @property
+    def cantidad(self) -> int:
+        return len(self.tickets)
+
+    def reservar(self, pausa_minima: float) -> tuple[str, float]:
+        """
+        Elige el ticket y reserva su turno. Retorna (ticket, segundos de espera),
+        o (None, 0.0) si todos los tickets están suspendidos.
+        """
+        with self.cerrojo:
+            disponibles = [ticket for ticket in self.tickets if not self.limitadores[ticket].suspendido()]
+            if not disponibles:
+                return None, 0.0
+            ticket = min(disponibles, key=lambda t: self.limitadores[t].proximo_turno(pausa_minima))
+            return ticket, self.limitadores[ticket].reservar_turno(pausa_minima)
+
+    def suspender(self, ticket: str, segundos_pausa: float, segundos_base: float,
+                  segundos_maximos: float, segundos_minimos: float = 0.0) -> tuple[float, bool]:
+        """
+        Registra un 429 del ticket. Retorna (segundos, suspendido).
+
+        El primero sin Retry-After se trata como limitación transitoria y solo posterga
+        el turno 'segundos_pausa'. Un Retry-After o un 429 repetido indican cuota agotada:
+        el ticket se suspende, duplicando la suspensión en cada 429 consecutivo.
+        """
+        limitador = self.limitadores[ticket]
+        if not limitador.suspensiones and not segundos_minimos:
+            limitador.pausar(segundos_pausa)
+            return segundos_pausa, False
+        escalado = segundos_base * 2 ** max(0, limitador.suspensiones - 1)
+        segundos = max(segundos_minimos, min(segundos_maximos, escalado))
+        limitador.suspender(segundos)
+        return segundos, True
+
+    def registrar_exito(self, ticket: str):
+        self.limitadores[ticket].restablecer()
+
+
+def _enmascarar(ticket: str) -> str:
+    """El ticket es una credencial: en los registros solo se muestra su inicio."""
+    return f"{ticket[:4]}…"
+
+
 class RecolectorMercadoPublico:
     """
     Clase encargada de interactuar con la API de Mercado Público.
     Implementa mecanismos de resiliencia como pausas controladas y 
     reintentos exponenciales para evitar bloqueos por exceso de peticiones.
+
+    Si recibe un ArchivoPayloads, guarda cada respuesta exitosa en bruto para
+    permitir reprocesarla más adelante sin volver a consultar la API.
+
+    Con varios tickets, cada uno tiene su propio límite de tasa y las peticiones
+    se reparten entre ellos; el que agota su cuota se suspende y la petición se
+    reintenta con otro. Con todos suspendidos, la ficha queda como 'cuota_agotada'.
+
+    Si se asigna 'verificador_ejecucion', las esperas lo consultan por tramos y se
+    abandonan cuando retorna False, de modo que detener la ingesta no queda bloqueado.
     """
 
-    def __init__(self):
-        self.ticket = os.getenv("TICKET_MERCADO_PUBLICO")
-        self.url_base = "https://api.mercadopublico.cl/servicios/v1/publico/licitaciones.json"
+    def __init__(self, archivo_payloads=None, url_base: str = URL_API_MERCADO_PUBLICO, medidor=None,
+                 limitador: LimitadorTasa = None, tickets: list = None):
+        self.archivo_payloads = archivo_payloads
+        # MedidorEtapas opcional para registrar el tiempo perdido en esperas de cortesía
+        self.medidor = medidor
+        self.url_base = url_base
         
-        # Configuración de límites de tasa (Rate Limiting)
+        # Configuración de límites de tasa (Rate Limiting), por ticket
         self.min_pausa_entre_peticiones = 2.0
-        self.ultima_peticion = 0.0
+        self.pool_tickets = PoolTickets(tickets or tickets_configurados(), limitador)
         
         # Configuración de resiliencia (Backoff)
         self.max_intentos = 4
         self.base_retraso = 1.5
+        # Pausa ante un 429 aislado y suspensión con la cuota agotada (se duplica en 429 consecutivos)
+        self.pausa_limitacion = 5.0
+        self.suspension_cuota = 60.0
+        self.suspension_cuota_maxima = 3600.0
+        self.verificador_ejecucion = None
 
-        if not self.ticket:
+        if not self.pool_tickets.cantidad:
             logger.error("[CRITICAL] TICKET_MERCADO_PUBLICO no está configurado.")
             raise ValueError("El ticket de la API es requerido para inicializar el recolector.")
     
-    def _esperar_limite_tasa(self):
-        """Bloquea la ejecución temporalmente para respetar los límites de la API."""
-        ahora = time.time()
-        tiempo_transcurrido = ahora - self.ultima_peticion
-        
-        if tiempo_transcurrido < self.min_pausa_entre_peticiones:
-            pausa_necesaria = self.min_pausa_entre_peticiones - tiempo_transcurrido
-            time.sleep(pausa_necesaria)
-            
-        self.ultima_peticion = time.time()
+    def _detenido(self) -> bool:
+        return self.verificador_ejecucion is not None and not self.verificador_ejecucion()
+
+    def _esperar(self, segundos: float) -> bool:
+        """Duerme 'segundos' por tramos. Retorna False si la ejecución se detuvo entretanto."""
+        if self.verificador_ejecucion is None:
+            if segundos > 0:
+                time.sleep(segundos)
+            return True
+        limite = time.monotonic() + segundos
+        while not self._detenido():
+            restante = limite - time.monotonic()
+            if restante <= 0:
+                return True
+            time.sleep(min(restante, TRAMO_ESPERA_S))
+        return False
+
+    def _esperar_limite_tasa(self) -> str:
+        """
+        Bloquea la ejecución temporalmente para respetar los límites de la API.
+        Retorna el ticket con que debe hacerse la petición, o None si todos están
+        suspendidos o la ejecución se detuvo durante la espera.
+        """
+        ticket, pausa_necesaria = self.pool_tickets.reservar(self.min_pausa_entre_peticiones)
+        if ticket is None:
+            return None
+        if not self._esperar(pausa_necesaria):
+            return None
+        if pausa_necesaria > 0 and self.medidor is not None:
+            self.medidor.registrar("espera_limite_tasa", pausa_necesaria)
+        return ticket
+
+    def _suspender_ticket(self, ticket: str, respuesta):
+        """Posterga o rota el ticket fuera del pool según la respuesta 429 (y su Retry-After)."""
+        reintentar_en = respuesta.headers.get("Retry-After") or ""
+        segundos, suspendido = self.pool_tickets.suspender(
+            ticket, self.pausa_limitacion, self.suspension_cuota, self.suspension_cuota_maxima,
+            float(reintentar_en) if reintentar_en.isdigit() else 0.0
+        )
+        if not suspendido:
+            logger.warning(f"Ticket {_enmascarar(ticket)} limitado (HTTP 429). Pausa de {segundos:.0f}s.")
+            if self.medidor is not None:
+                self.medidor.contar("ticket_limitado")
+            return
+        logger.warning(f"Ticket {_enmascarar(ticket)} con cuota agotada (HTTP 429). Suspendido {segundos:.0f}s.")
+        if self.medidor is not None:
+            self.medidor.contar("ticket_suspendido")
+
+    def _sin_turno(self) -> dict:
+        """Resultado de una ficha que no llegó a pedirse por detención o cuota agotada."""
+        return {'datos': None, 'estado': 'interrumpido' if self._detenido() else 'cuota_agotada'}
     
     def obtener_licitaciones_diarias(self, fecha_cadena: str = None) -> list:
         """
         Descarga el listado general de licitaciones publicadas en una fecha específica.
+
+        Si el listado ya está archivado con un ETag, la petición es condicional: ante
+        una respuesta 304 se reutiliza la copia archivada en vez de descargarla completa.
         """
         if not fecha_cadena:
             fecha_cadena = datetime.now().strftime("%d%m%Y")
         
         parametros = {
-            "ticket": self.ticket,
             "fecha": fecha_cadena,
             "estado": "activas"
         }
+        cabeceras = {}
+        if self.archivo_payloads is not None:
+            etag = self.archivo_payloads.etag_listado(fecha_cadena)
+            if etag:
+                cabeceras["If-None-Match"] = etag
 
         logger.info(f"Iniciando recolección de licitaciones para la fecha: {fecha_cadena}")
-        self._esperar_limite_tasa()
 
         try:
-            respuesta = requests.get(self.url_base, params=parametros, timeout=15)
+            # Ante un 429 se reintenta con otro ticket o tras la pausa, hasta que todos se suspendan
+            respuesta = None
+            for _ in range(self.max_intentos):
+                ticket = self._esperar_limite_tasa()
+                if ticket is None:
+                    break
+                parametros["ticket"] = ticket
+                respuesta = requests.get(self.url_base, params=parametros, headers=cabeceras, timeout=15)
+                if respuesta.status_code != 429:
+                    break
+                self._suspender_ticket(ticket, respuesta)
+
+            if respuesta is None or respuesta.status_code == 429:
+                logger.warning(f"Listado del {fecha_cadena} sin descargar: "
+                               f"{'ejecución detenida' if self._detenido() else 'tickets con cuota agotada'}.")
+                return []
+
+            if respuesta.status_code == 304:
+                listado = self.archivo_payloads.obtener_listado(fecha_cadena)
+                if listado is not None:
+                    logger.info(f"Listado del {fecha_cadena} sin cambios; se reutiliza la copia archivada.")
+                    self.archivo_payloads.renovar_listado(fecha_cadena)
+                    if self.medidor is not None:
+                        self.medidor.contar("listado_no_modificado")
+                    return listado
+                logger.warning(f"La API respondió 304 para {fecha_cadena}, pero no hay copia archivada.")
+                return []
+
             respuesta.raise_for_status()
-            datos = respuesta.json()
+            self.pool_tickets.registrar_exito(ticket)
+            datos = decodificar_json(respuesta.content)
 
             if "Listado" in datos: 
                 cantidad = datos.get("Cantidad", 0)
                 logger.info(f"Recolección exitosa. Licitaciones encontradas: {cantidad}")
+                if self.archivo_payloads is not None:
+                    self.archivo_payloads.guardar_listado(fecha_cadena, datos["Listado"],
+                                                          respuesta.headers.get("ETag"))
                 return datos["Listado"]
             else:
                 logger.warning("La respuesta de la API no contiene el nodo 'Listado'.")
@@ -72,6 +304,9 @@ class RecolectorMercadoPublico:
         except requests.RequestException as error_red:
             logger.error(f"Error de red al obtener listado diario: {error_red}")
             return []
+        except ValueError as error_json:
+            logger.error(f"Respuesta del listado diario no es JSON válido: {error_json}")
+            return []
         
     def obtener_detalle_licitacion(self, codigo_externo: str) -> dict:
         """
@@ -87,30 +322,43 @@ class RecolectorMercadoPublico:
         }
         
         parametros = {
-            "codigo": codigo_externo,
-            "ticket": self.ticket
+            "codigo": codigo_externo
         }
         
         for intento in range(self.max_intentos):
             try:
-                self._esperar_limite_tasa()
+                ticket = self._esperar_limite_tasa()
+                if ticket is None:
+                    return self._sin_turno()
+                parametros["ticket"] = ticket
                 respuesta = requests.get(self.url_base, params=parametros, headers=cabeceras, timeout=15)
                 
                 if respuesta.status_code == 200:
-                    datos = respuesta.json()
+                    self.pool_tickets.registrar_exito(ticket)
+                    datos = decodificar_json(respuesta.content)
                     if "Listado" in datos and len(datos["Listado"]) > 0:
+                        if self.archivo_payloads is not None:
+                            self.archivo_payloads.guardar_detalle(codigo_externo, datos["Listado"][0])
                         return {'datos': datos["Listado"][0], 'estado': 'exitoso'}
                     return {'datos': None, 'estado': 'no_encontrado'}
                 
                 elif respuesta.status_code == 404:
                     return {'datos': None, 'estado': 'no_encontrado'}
                 
+                elif respuesta.status_code == 429:
+                    # El siguiente turno rota a otro ticket; con todos suspendidos, queda pendiente
+                    self._suspender_ticket(ticket, respuesta)
+                    if intento < self.max_intentos - 1:
+                        continue
+                    return {'datos': None, 'estado': 'cuota_agotada'}
+                
                 elif 500 <= respuesta.status_code < 600:
                     if intento < self.max_intentos - 1:
                         import random
                         tiempo_espera = (self.base_retraso ** (intento + 1)) + random.uniform(0, 2)
                         logger.warning(f"Error servidor {respuesta.status_code}. Reintento {intento+1} en {tiempo_espera:.1f}s")
-                        time.sleep(tiempo_espera)
+                        if not self._esperar(tiempo_espera):
+                            return self._sin_turno()
                         continue
                     return {'datos': None, 'estado': 'error_servidor'}
                 
@@ -119,7 +367,8 @@ class RecolectorMercadoPublico:
                     
             except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
                 if intento < self.max_intentos - 1:
-                    time.sleep(self.base_retraso ** intento)
+                    if not self._esperar(self.base_retraso ** intento):
+                        return self._sin_turno()
                     continue
                 return {'datos': None, 'estado': 'error_red'}
             except Exception as e:
@@ -0,0 +1,30 @@
+from src.repositories.archivo_payloads import ArchivoPayloads
+from src.utils.logger import configurar_logger
+
+logger = configurar_logger("recolector_archivo")
+
+
+class RecolectorArchivo:
+    """
+    Sustituto del RecolectorMercadoPublico que responde desde 'payloads_api'.
+
+    Expone la misma interfaz (listado diario y ficha de detalle), por lo que el
+    orquestador puede reprocesar días ya descargados sin peticiones de red ni pausas.
+    """
+
+    def __init__(self, archivo_payloads: ArchivoPayloads = None):
+        self.archivo_payloads = archivo_payloads or ArchivoPayloads()
+
+    def obtener_licitaciones_diarias(self, fecha_cadena: str = None) -> list:
+        listado = self.archivo_payloads.obtener_listado(fecha_cadena)
+        if listado is None:
+            logger.warning(f"No hay listado archivado para la fecha {fecha_cadena}.")
+            return []
+        return listado
+
+    def obtener_detalle_licitacion(self, codigo_externo: str) -> dict:
+        datos = self.archivo_payloads.obtener_detalle(codigo_externo)
+        if datos is None:
+            # La ficha nunca se descargó (p. ej. las reglas nuevas elevan un título antes descartado)
+            return {'datos': None, 'estado': 'no_archivado'}
+        return {'datos': datos, 'estado': 'exitoso'}
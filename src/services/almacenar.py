@@ -1,9 +1,14 @@
-from datetime import datetime
-from sqlalchemy.orm import Session
+import time
+from sqlalchemy import insert, delete
+from sqlalchemy.orm import Session, joinedload
 from src.bd.database import SessionLocal
-from src.bd.models import Licitacion, EstadoLicitacion, Organismo
+from src.bd.models import Licitacion, LicitacionDetalle, LicitacionItem, EstadoLicitacion, Organismo
+from src.repositories.cache_paginas import cache_paginas_compartida
+from src.repositories.resumen_etapas import recalcular_resumen, ajustar_resumen_cambios, fila_resumen
+from src.services.registro_licitacion import RegistroLicitacion
+from src.services.transformador_api import TransformadorAPI
 from src.utils.logger import configurar_logger
-from src.config.constantes import EtapaLicitacion, ESTADOS_MERCADO_PUBLICO
+from src.config.constantes import EtapaLicitacion, ESTADOS_MERCADO_PUBLICO, TAMANIO_BLOQUE_LOTE_MASIVO
 
 logger = configurar_logger("almacenador_bd")
 
@@ -17,12 +22,14 @@ class AlmacenadorLicitaciones:
     el mantenimiento, la depuración y las pruebas unitarias independientes.
     """
 
-    def __init__(self, session_factory=SessionLocal):
+    def __init__(self, session_factory=SessionLocal, cache_paginas=cache_paginas_compartida):
         """
         Inicializa el almacenador mediante inyección de dependencias.
         Crucial para aislar transacciones durante las pruebas del scraper.
         """
         self.session_factory = session_factory
+        # Las ingestas pueden afectar cualquier etapa, por lo que invalidan la caché completa
+        self.cache_paginas = cache_paginas
 
     # =========================================================================
     # MÉTODO PÚBLICO PRINCIPAL
@@ -66,8 +73,9 @@ class AlmacenadorLicitaciones:
                 self._asegurar_estado(sesion, codigo_estado, descripcion_estado)
 
                 # 2. Transformar datos crudos en valores listos para persistir
-                fechas = self._parsear_fechas(datos_licitacion)
-                texto_productos = self._construir_texto_productos(datos_licitacion)
+                fechas = TransformadorAPI.parsear_fechas(datos_licitacion)
+                items = TransformadorAPI.extraer_items(datos_licitacion)
+                texto_productos = TransformadorAPI.formatear_texto_productos(items)
 
                 # 3. Extraer metadatos calculados por el orquestador
                 metadatos = self._extraer_metadatos(datos_licitacion)
@@ -80,188 +88,220 @@ class AlmacenadorLicitaciones:
                     datos_comprador=datos_comprador,
                     fechas=fechas,
                     texto_productos=texto_productos,
+                    items=items,
                     metadatos=metadatos
                 )
 
-                # 5. Confirmar toda la transacción en un único commit atómico
+                # 5. Confirmar en un único commit atómico (incluye el ajuste del resumen por etapa)
                 sesion.commit()
+                self.cache_paginas.invalidar_todo()
 
             except Exception as error_bd:
                 # Rollback obligatorio para no dejar la sesión en estado corrupto
                 sesion.rollback()
                 logger.error(f"Error guardando licitación {codigo_externo}: {error_bd}")
     
-    def guardar_lote_masivo(self, lote_licitaciones: list, lote_organismos: list, lote_estados: list):
+    def guardar_lote_masivo(self, lote_licitaciones: list[RegistroLicitacion], lote_organismos: list,
+                            lote_estados: list,
+                            tamanio_bloque: int = TAMANIO_BLOQUE_LOTE_MASIVO) -> dict:
         """
-        Procesa e inserta un lote completo de licitaciones y sus dependencias
-        en una única transacción de base de datos para maximizar el rendimiento.
+        Procesa e inserta un lote de RegistroLicitacion y sus dependencias en bloques de
+        'tamanio_bloque' registros, cada uno confirmado en su propia transacción para
+        acotar la memoria de la sesión.
+
+        Si un bloque falla, su SAVEPOINT se revierte y se reintenta registro a registro,
+        cada uno en su propio SAVEPOINT: la fila defectuosa se registra y se omite sin
+        perder el resto. Retorna {'guardadas', 'fallidas' (códigos), 'bloques' (tiempos)}.
         """
+        resultado = {"guardadas": 0, "fallidas": [], "bloques": []}
         if not lote_licitaciones:
-            return
+            return resultado
 
+        # Estados y organismos primero: sin ellos ningún bloque puede referenciarlos
         with self.session_factory() as sesion:
             try:
-                # 1. Asegurar Estados (con conversión segura de tipos)
-                for estado in lote_estados:
-                    codigo_estado_raw = estado.get("codigo")
-                    try:
-                        cod_est = int(codigo_estado_raw) if codigo_estado_raw is not None else None
-                    except (ValueError, TypeError):
-                        cod_est = codigo_estado_raw
-                        
-                    descripcion_oficial = ESTADOS_MERCADO_PUBLICO.get(
-                        cod_est, 
-                        estado.get("descripcion", "Desconocido")
-                    )
-                    self._asegurar_estado(sesion, cod_est, descripcion_oficial)
-
-                # 2. Asegurar Organismos
-                for org in lote_organismos:
-                    if not org.get("codigo"): 
-                        continue
-                    existe_org = sesion.query(Organismo).filter_by(codigo=org["codigo"]).first()
-                    if not existe_org:
-                        sesion.add(Organismo(codigo=org["codigo"], nombre=org["nombre"]))
-                
-                # Sincronizamos los IDs de estados y organismos antes de insertar licitaciones
-                sesion.flush()
-
-                # 3. Upsert Vectorizado de Licitaciones
-                for datos in lote_licitaciones:
-                    codigo_ext = datos.get("codigo_externo")
-                    if not codigo_ext:
-                        continue
-
-                    # Conversión de código de estado para este registro
-                    codigo_estado_raw = datos.get("codigo_estado")
-                    try:
-                        cod_est = int(codigo_estado_raw) if codigo_estado_raw is not None else None
-                    except (ValueError, TypeError):
-                        cod_est = codigo_estado_raw
-
-                    registro_existente = sesion.query(Licitacion).filter_by(codigo_externo=codigo_ext).first()
-
-                    if registro_existente:
-                        # Actualización de campos básicos
-                        registro_existente.nombre = datos.get("nombre") or registro_existente.nombre
-                        registro_existente.codigo_estado = cod_est
-                        registro_existente.fecha_cierre = datos.get("fecha_cierre") or registro_existente.fecha_cierre
-                        registro_existente.fecha_inicio = datos.get("fecha_inicio")
-                        registro_existente.fecha_publicacion = datos.get("fecha_publicacion")
-                        registro_existente.fecha_adjudicacion = datos.get("fecha_adjudicacion")
-                        registro_existente.puntaje = datos.get("puntaje", 0)
-                        registro_existente.justificacion_puntaje = datos.get("justificacion_puntaje", "")
-
-                        # Actualización condicional de detalles profundos
-                        if datos.get("tiene_detalle"):
-                            registro_existente.codigo_organismo = datos.get("codigo_organismo")
-                            registro_existente.descripcion = datos.get("descripcion")
-                            registro_existente.detalle_productos = datos.get("detalle_productos")
-                            registro_existente.tiene_detalle = True
-
-                        # Regla de ascenso de etapa
-                        if registro_existente.etapa == EtapaLicitacion.IGNORADA.value and datos.get("etapa") == EtapaLicitacion.CANDIDATA.value:
-                            registro_existente.etapa = EtapaLicitacion.CANDIDATA.value
-
-                    else:
-                        # Inserción de nuevo registro
-                        nuevo_registro = Licitacion(
-                            codigo_externo=codigo_ext,
-                            nombre=datos.get("nombre"),
-                            codigo_estado=cod_est,
-                            descripcion=datos.get("descripcion"),
-                            codigo_organismo=datos.get("codigo_organismo"),
-                            tiene_detalle=datos.get("tiene_detalle", False),
-                            puntaje=datos.get("puntaje", 0),
-                            justificacion_puntaje=datos.get("justificacion_puntaje", ""),
-                            etapa=datos.get("etapa", EtapaLicitacion.IGNORADA.value),
-                            detalle_productos=datos.get("detalle_productos"),
-                            fecha_cierre=datos.get("fecha_cierre"),
-                            fecha_inicio=datos.get("fecha_inicio"),
-                            fecha_publicacion=datos.get("fecha_publicacion"),
-                            fecha_adjudicacion=datos.get("fecha_adjudicacion"),
-                        )
-                        sesion.add(nuevo_registro)
-
-                # 4. Confirmar la transacción completa
+                self._asegurar_dependencias_lote(sesion, lote_organismos, lote_estados)
                 sesion.commit()
-                logger.info(f"Lote masivo sincronizado exitosamente: {len(lote_licitaciones)} registros.")
-
             except Exception as error_bd:
                 sesion.rollback()
-                logger.error(f"Fallo crítico durante inserción masiva: {error_bd}")
+                logger.error(f"Fallo crítico registrando dependencias del lote: {error_bd}")
                 raise error_bd
 
-    # =========================================================================
-    # MÉTODOS PRIVADOS DE TRANSFORMACIÓN (Sin acceso a BD, 100% testeables)
-    # =========================================================================
+        for inicio in range(0, len(lote_licitaciones), tamanio_bloque):
+            bloque = lote_licitaciones[inicio:inicio + tamanio_bloque]
+            cronometro = time.perf_counter()
+            fallidas = self._guardar_bloque(bloque)
+            segundos = time.perf_counter() - cronometro
 
-    def _parsear_fechas(self, datos: dict) -> dict:
-        """
-        Extrae y convierte todas las fechas del diccionario crudo de la API
-        desde formato ISO string hacia objetos datetime de Python.
-        
-        Retorna un diccionario con claves estandarizadas, con None
-        si la fecha no existe o no puede ser parseada.
-        """
-        objeto_fechas = datos.get("Fechas", {})
+            resultado["guardadas"] += len(bloque) - len(fallidas)
+            resultado["fallidas"].extend(fallidas)
+            resultado["bloques"].append({"registros": len(bloque), "fallidas": len(fallidas),
+                                         "segundos": round(segundos, 4)})
+            logger.info(f"Bloque {inicio // tamanio_bloque + 1}: {len(bloque) - len(fallidas)}/{len(bloque)} "
+                        f"registros en {segundos:.3f}s.")
 
-        def _convertir(texto_fecha: str):
-            """Convierte un string ISO a datetime, retornando None si falla."""
-            if not texto_fecha:
-                return None
-            try:
-                # Reemplazamos la 'Z' (Zulu time/UTC) por '+00:00' para que fromisoformat lo entienda,
-                # lo que nos protege si la API gubernamental actualiza su formato de salida.
-                texto_limpio = texto_fecha.replace("Z", "+00:00")
-                return datetime.fromisoformat(texto_limpio)
-            except ValueError:
-                logger.warning(f"Formato de fecha no reconocido: '{texto_fecha}'")
-                return None
+        self.cache_paginas.invalidar_todo()
 
-        return {
-            "cierre": _convertir(
-                datos.get("FechaCierre") or objeto_fechas.get("FechaCierre")
-            ),
-            "inicio": _convertir(objeto_fechas.get("FechaInicio")),
-            "publicacion": _convertir(objeto_fechas.get("FechaPublicacion")),
-            "adjudicacion": (
-                _convertir(objeto_fechas.get("FechaAdjudicacion"))
-                or _convertir(objeto_fechas.get("FechaEstimadaAdjudicacion"))
-            ),
-        }
+        logger.info(f"Lote masivo sincronizado: {resultado['guardadas']} registros, "
+                    f"{len(resultado['fallidas'])} rechazados, {len(resultado['bloques'])} bloques.")
+        return resultado
 
-    def _construir_texto_productos(self, datos: dict) -> str:
+    def reconciliar_resumen(self):
         """
-        Transforma el listado de ítems de la API en un texto formateado
-        y legible para su almacenamiento y posterior visualización.
-        
-        Retorna un string vacío si no hay productos en los datos.
+        Reconstruye el resumen por etapa desde 'licitaciones'. Las escrituras ya lo
+        ajustan de forma incremental; basta con llamarlo una vez al terminar una ingesta.
         """
-        objeto_items = datos.get("Items", {})
+        with self.session_factory() as sesion:
+            try:
+                recalcular_resumen(sesion)
+                sesion.commit()
+            except Exception as error_bd:
+                sesion.rollback()
+                logger.error(f"Error recalculando el resumen por etapa: {error_bd}")
 
-        # La API puede retornar Items como dict con "Listado" o directamente como lista
-        if isinstance(objeto_items, dict):
-            lista_productos = objeto_items.get("Listado", [])
-        elif isinstance(objeto_items, list):
-            lista_productos = objeto_items
-        else:
-            return ""
+    def _guardar_bloque(self, bloque: list) -> list:
+        """Escribe y confirma un bloque. Retorna los códigos de los registros rechazados."""
+        fallidas = []
+        with self.session_factory() as sesion:
+            try:
+                try:
+                    with sesion.begin_nested():
+                        self._escribir_bloque(sesion, bloque)
+                except Exception as error_bloque:
+                    logger.warning(f"Bloque rechazado ({error_bloque}); se aísla registro a registro.")
+                    for datos in bloque:
+                        try:
+                            with sesion.begin_nested():
+                                self._escribir_bloque(sesion, [datos])
+                        except Exception as error_fila:
+                            fallidas.append(datos.codigo_externo)
+                            logger.error(f"Licitación {datos.codigo_externo} omitida del lote: {error_fila}")
+                sesion.commit()
+            except Exception as error_bd:
+                sesion.rollback()
+                logger.error(f"Fallo confirmando bloque de {len(bloque)} licitaciones: {error_bd}")
+                return [datos.codigo_externo for datos in bloque]
+        return fallidas
+
+    def _asegurar_dependencias_lote(self, sesion: Session, lote_organismos: list, lote_estados: list):
+        """Registra los estados y organismos del lote que aún no existen."""
+        # 1. Asegurar Estados (con conversión segura de tipos)
+        for estado in lote_estados:
+            codigo_estado_raw = estado.get("codigo")
+            try:
+                cod_est = int(codigo_estado_raw) if codigo_estado_raw is not None else None
+            except (ValueError, TypeError):
+                cod_est = codigo_estado_raw
 
-        lineas = []
-        for producto in lista_productos:
-            nombre = producto.get("NombreProducto", "Producto genérico")
-            cantidad = producto.get("Cantidad", 0)
-            unidad = producto.get("UnidadMedida", "un")
-            descripcion = producto.get("Descripcion", "")
+            descripcion_oficial = ESTADOS_MERCADO_PUBLICO.get(
+                cod_est,
+                estado.get("descripcion", "Desconocido")
+            )
+            self._asegurar_estado(sesion, cod_est, descripcion_oficial)
+
+        # 2. Asegurar Organismos
+        for org in lote_organismos:
+            if not org.get("codigo"):
+                continue
+            existe_org = sesion.query(Organismo).filter_by(codigo=org["codigo"]).first()
+            if not existe_org:
+                sesion.add(Organismo(codigo=org["codigo"], nombre=org["nombre"]))
+
+    def _escribir_bloque(self, sesion: Session, bloque: list):
+        """Upsert de un bloque de licitaciones y de sus ítems, sin confirmar."""
+        # 3. Upsert Vectorizado de Licitaciones
+        # Los ítems de fichas completas se escriben después, en bloque, cuando ya hay IDs
+        items_por_registro = []
+        # Filas antes y después del upsert, para ajustar el resumen por etapa con deltas
+        filas_anteriores, filas_nuevas = [], []
+        for datos in bloque:
+            codigo_ext = datos.codigo_externo
+            if not codigo_ext:
+                continue
+
+            # Conversión de código de estado para este registro
+            codigo_estado_raw = datos.codigo_estado
+            try:
+                cod_est = int(codigo_estado_raw) if codigo_estado_raw is not None else None
+            except (ValueError, TypeError):
+                cod_est = codigo_estado_raw
+
+            registro_existente = sesion.query(Licitacion)\
+                .options(joinedload(Licitacion.detalle))\
+                .filter_by(codigo_externo=codigo_ext).first()
+
+            if registro_existente:
+                filas_anteriores.append(fila_resumen(registro_existente))
+                # Actualización de campos básicos
+                registro_existente.nombre = datos.nombre or registro_existente.nombre
+                registro_existente.codigo_estado = cod_est
+                registro_existente.fecha_cierre = datos.fecha_cierre or registro_existente.fecha_cierre
+                registro_existente.fecha_inicio = datos.fecha_inicio
+                registro_existente.fecha_publicacion = datos.fecha_publicacion
+                registro_existente.fecha_adjudicacion = datos.fecha_adjudicacion
+
+                # Un registro evaluado solo por título (presupuesto agotado, ficha no archivada)
+                # no reemplaza la evaluación de una ficha ya guardada: solo actualiza el listado
+                if self._conserva_evaluacion(registro_existente, datos.tiene_detalle):
+                    filas_nuevas.append(fila_resumen(registro_existente))
+                    continue
+                registro_existente.puntaje = datos.puntaje
+
+                # Actualización condicional de detalles profundos
+                if datos.tiene_detalle:
+                    registro_existente.codigo_organismo = datos.codigo_organismo
+                    registro_existente.tiene_detalle = True
+                    items_por_registro.append((registro_existente, datos.items))
+
+                self._asignar_detalle(
+                    registro_existente,
+                    justificacion=datos.justificacion_puntaje,
+                    tiene_detalle=datos.tiene_detalle,
+                    descripcion=datos.descripcion,
+                    detalle_productos=datos.detalle_productos,
+                )
 
-            lineas.append(f"- {nombre} ({cantidad} {unidad})")
+                # Regla de ascenso de etapa
+                if registro_existente.etapa == EtapaLicitacion.IGNORADA.value and datos.etapa == EtapaLicitacion.CANDIDATA.value:
+                    registro_existente.etapa = EtapaLicitacion.CANDIDATA.value
+                filas_nuevas.append(fila_resumen(registro_existente))
+
+            else:
+                # Inserción de nuevo registro
+                nuevo_registro = Licitacion(
+                    codigo_externo=codigo_ext,
+                    nombre=datos.nombre,
+                    codigo_estado=cod_est,
+                    codigo_organismo=datos.codigo_organismo,
+                    tiene_detalle=datos.tiene_detalle,
+                    puntaje=datos.puntaje,
+                    etapa=datos.etapa,
+                    fecha_cierre=datos.fecha_cierre,
+                    fecha_inicio=datos.fecha_inicio,
+                    fecha_publicacion=datos.fecha_publicacion,
+                    fecha_adjudicacion=datos.fecha_adjudicacion,
+                )
+                self._asignar_detalle(
+                    nuevo_registro,
+                    justificacion=datos.justificacion_puntaje,
+                    tiene_detalle=datos.tiene_detalle,
+                    descripcion=datos.descripcion,
+                    detalle_productos=datos.detalle_productos,
+                )
+                sesion.add(nuevo_registro)
+                filas_nuevas.append(fila_resumen(nuevo_registro))
+                if datos.tiene_detalle:
+                    items_por_registro.append((nuevo_registro, datos.items))
 
-            # Solo añadimos la descripción si aporta información adicional al nombre
-            if descripcion and descripcion.lower() != nombre.lower():
-                lineas.append(f"  Detalle: {descripcion}")
+        sesion.flush()
+        self._reemplazar_items_masivo(sesion, items_por_registro)
+        # Dentro del mismo SAVEPOINT: si el bloque se revierte, su ajuste también
+        ajustar_resumen_cambios(sesion, filas_anteriores, filas_nuevas)
+        sesion.flush()
 
-        return "\n".join(lineas)
+    # =========================================================================
+    # MÉTODOS PRIVADOS DE TRANSFORMACIÓN (Sin acceso a BD, 100% testeables)
+    # =========================================================================
 
     def _extraer_metadatos(self, datos: dict) -> dict:
         return {
@@ -308,7 +348,7 @@ class AlmacenadorLicitaciones:
 
     def _upsert_licitacion(self, sesion: Session, codigo_externo: str,
                            datos_licitacion: dict, datos_comprador: dict,
-                           fechas: dict, texto_productos: str, metadatos: dict):
+                           fechas: dict, texto_productos: str, items: list, metadatos: dict):
         """
         Ejecuta la operación UPSERT: actualiza el registro si ya existe,
         o inserta uno nuevo si es la primera vez que se ve este código.
@@ -316,21 +356,32 @@ class AlmacenadorLicitaciones:
         La lógica de ascenso de etapa ('ignorada' → 'candidata') también
         reside aquí para centralizar todas las reglas de negocio del UPSERT.
         """
-        registro_existente = sesion.query(Licitacion).filter_by(
-            codigo_externo=codigo_externo
-        ).first()
+        registro_existente = sesion.query(Licitacion)\
+            .options(joinedload(Licitacion.detalle))\
+            .filter_by(codigo_externo=codigo_externo)\
+            .first()
 
         if registro_existente:
+            fila_anterior = fila_resumen(registro_existente)
             self._actualizar_registro(
                 registro_existente, datos_licitacion, datos_comprador,
                 fechas, texto_productos, metadatos
             )
+            registro = registro_existente
         else:
-            nuevo_registro = self._crear_registro(
+            fila_anterior = None
+            registro = self._crear_registro(
                 codigo_externo, datos_licitacion, datos_comprador,
                 fechas, texto_productos, metadatos
             )
-            sesion.add(nuevo_registro)
+            sesion.add(registro)
+
+        # Contadores por etapa: inserción = +1; cambio de etapa, estado o tramo = -1/+1
+        ajustar_resumen_cambios(sesion, [fila_anterior] if fila_anterior else [], [fila_resumen(registro)])
+
+        # Los ítems estructurados solo se reemplazan con datos de una ficha completa
+        if metadatos["tiene_detalle"]:
+            registro.items = [LicitacionItem(**item) for item in items]
 
     def _actualizar_registro(self, registro: Licitacion, datos: dict,
                               datos_comprador: dict, fechas: dict,
@@ -339,7 +390,8 @@ class AlmacenadorLicitaciones:
         Aplica las actualizaciones sobre un registro de licitación existente.
         
         Regla de negocio: Los campos de detalle (descripción, productos, organismo)
-        solo se sobreescriben si la descarga actual trajo datos completos.
+        solo se sobreescriben si la descarga actual trajo datos completos, y una
+        evaluación solo por título no reemplaza la de una ficha ya guardada.
         Regla de ascenso: Una licitación 'ignorada' asciende a 'candidata' si
         al ser reevaluada obtiene un puntaje positivo.
         """
@@ -350,20 +402,33 @@ class AlmacenadorLicitaciones:
         registro.fecha_inicio = fechas["inicio"]
         registro.fecha_publicacion = fechas["publicacion"]
         registro.fecha_adjudicacion = fechas["adjudicacion"]
+
+        if self._conserva_evaluacion(registro, metadatos["tiene_detalle"]):
+            return
         registro.puntaje = metadatos["puntaje"]
-        registro.justificacion_puntaje = metadatos["justificacion"]
 
         # Campos de detalle: solo se actualizan si se descargó la ficha completa
         if metadatos["tiene_detalle"]:
             registro.codigo_organismo = datos_comprador.get("CodigoOrganismo")
-            registro.descripcion = datos.get("Descripcion")
-            registro.detalle_productos = texto_productos
             registro.tiene_detalle = True
 
+        self._asignar_detalle(
+            registro,
+            justificacion=metadatos["justificacion"],
+            tiene_detalle=metadatos["tiene_detalle"],
+            descripcion=datos.get("Descripcion"),
+            detalle_productos=texto_productos,
+        )
+
         # Regla de ascenso de etapa (nunca retrocede una etapa manualmente asignada)
         if registro.etapa == EtapaLicitacion.IGNORADA.value and metadatos["etapa"] == EtapaLicitacion.CANDIDATA.value:
             registro.etapa = EtapaLicitacion.CANDIDATA.value
 
+    @staticmethod
+    def _conserva_evaluacion(registro: Licitacion, tiene_detalle: bool) -> bool:
+        """Puntaje, justificación y etapa de una ficha guardada solo los reemplaza otra ficha."""
+        return bool(registro.tiene_detalle) and not tiene_detalle
+
     def _crear_registro(self, codigo_externo: str, datos: dict,
                          datos_comprador: dict, fechas: dict,
                          texto_productos: str, metadatos: dict) -> Licitacion:
@@ -371,19 +436,66 @@ class AlmacenadorLicitaciones:
         Construye y retorna una nueva instancia de Licitacion lista para ser
         añadida a la sesión. No ejecuta ninguna operación de BD directamente.
         """
-        return Licitacion(
+        registro = Licitacion(
             codigo_externo=codigo_externo,
             nombre=datos.get("Nombre"),
             codigo_estado=datos.get("CodigoEstado"),
-            descripcion=datos.get("Descripcion"),
             codigo_organismo=datos_comprador.get("CodigoOrganismo"),
             tiene_detalle=metadatos["tiene_detalle"],
             puntaje=metadatos["puntaje"],
-            justificacion_puntaje=metadatos["justificacion"],
             etapa=metadatos["etapa"],
-            detalle_productos=texto_productos,
             fecha_cierre=fechas["cierre"],
             fecha_inicio=fechas["inicio"],
             fecha_publicacion=fechas["publicacion"],
             fecha_adjudicacion=fechas["adjudicacion"],
-        )
\ No newline at end of file
+        )
+        self._asignar_detalle(
+            registro,
+            justificacion=metadatos["justificacion"],
+            tiene_detalle=metadatos["tiene_detalle"],
+            descripcion=datos.get("Descripcion"),
+            detalle_productos=texto_productos,
+        )
+        return registro
+
+    def _asignar_detalle(self, registro: Licitacion, justificacion: str, tiene_detalle: bool,
+                         descripcion: str = None, detalle_productos: str = None):
+        """
+        Escribe los textos extensos en la tabla 1:1 'licitacion_detalle'.
+
+        La fila de detalle solo se crea si se descargó la ficha completa o si hay una
+        justificación que mostrar; las licitaciones descartadas por título no la ocupan.
+        Descripción y productos solo se sobreescriben con datos de una ficha completa.
+        """
+        if registro.detalle is None:
+            if not (tiene_detalle or justificacion):
+                return
+            registro.detalle = LicitacionDetalle()
+
+        registro.detalle.justificacion_puntaje = justificacion
+        if tiene_detalle:
+            registro.detalle.descripcion = descripcion
+            registro.detalle.detalle_productos = detalle_productos
+
+    def _reemplazar_items_masivo(self, sesion: Session, items_por_registro: list):
+        """
+        Sustituye los ítems de las licitaciones del lote con un DELETE y un INSERT
+        ejecutados en bloque (executemany), evitando instanciar un objeto ORM por ítem.
+        """
+        if not items_por_registro:
+            return
+
+        ids_licitaciones = [registro.id for registro, _ in items_por_registro]
+        sesion.execute(
+            delete(LicitacionItem)
+            .where(LicitacionItem.licitacion_id.in_(ids_licitaciones))
+            .execution_options(synchronize_session=False)
+        )
+
+        filas = [
+            {**item, "licitacion_id": registro.id}
+            for registro, items in items_por_registro
+            for item in items
+        ]
+        if filas:
+            sesion.execute(insert(LicitacionItem), filas)
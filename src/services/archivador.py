@@ -0,0 +1,128 @@
+from datetime import datetime, timedelta
+from sqlalchemy import select, insert, delete, or_, literal
+from src.bd.database import SessionLocal
+from src.bd.models import Licitacion, LicitacionArchivada, LicitacionDetalle, LicitacionItem
+from src.repositories.cache_paginas import cache_paginas_compartida
+from src.repositories.resumen_etapas import ajustar_resumen_cambios
+from src.utils.logger import configurar_logger
+from src.config.constantes import (
+    ESTADO_LICITACION_ACTIVA,
+    DIAS_ANTIGUEDAD_ARCHIVO,
+    TAMANIO_LOTE_ARCHIVO,
+    EtapaLicitacion
+)
+
+logger = configurar_logger("archivador_licitaciones")
+
+# Columnas copiadas tal cual desde 'licitaciones' hacia 'licitaciones_archivo'
+COLUMNAS_ARCHIVO = [
+    "codigo_externo", "nombre", "puntaje", "etapa", "fecha_cierre", "fecha_inicio",
+    "fecha_publicacion", "fecha_adjudicacion", "codigo_estado", "codigo_organismo", "tiene_detalle",
+]
+# Textos extensos que provienen de 'licitacion_detalle' (el archivo los guarda en la misma fila)
+COLUMNAS_ARCHIVO_DETALLE = ["descripcion", "detalle_productos", "justificacion_puntaje"]
+
+# Etapas gestionadas activamente por el usuario: nunca se archivan
+ETAPAS_PROTEGIDAS = (EtapaLicitacion.SEGUIMIENTO.value, EtapaLicitacion.OFERTADA.value)
+
+
+class ArchivadorLicitaciones:
+    """
+    Traslada las licitaciones que ya no están vigentes (estado distinto de 'Publicada'
+    y cierre antiguo) desde la tabla principal hacia 'licitaciones_archivo'.
+
+    Mantiene pequeña la tabla consultada por los listados para que sus índices
+    quepan en memoria. Cada lote se copia y elimina dentro de una misma transacción.
+    """
+
+    def __init__(self, session_factory=SessionLocal, cache_paginas=cache_paginas_compartida):
+        self.session_factory = session_factory
+        self.cache_paginas = cache_paginas
+
+    def archivar(self, dias_antiguedad: int = DIAS_ANTIGUEDAD_ARCHIVO,
+                 tamanio_lote: int = TAMANIO_LOTE_ARCHIVO) -> int:
+        """
+        Archiva por lotes las licitaciones elegibles. Retorna la cantidad trasladada.
+        Un lote fallido se revierte completo y detiene el proceso.
+        """
+        fecha_limite = datetime.now() - timedelta(days=dias_antiguedad)
+        total_archivadas = 0
+
+        with self.session_factory() as sesion:
+            try:
+                while True:
+                    ids_lote = sesion.scalars(
+                        select(Licitacion.id)
+                        .where(self._condicion_archivable(fecha_limite))
+                        .order_by(Licitacion.id)
+                        .limit(tamanio_lote)
+                    ).all()
+                    if not ids_lote:
+                        break
+
+                    self._trasladar_lote(sesion, ids_lote)
+                    sesion.commit()
+                    total_archivadas += len(ids_lote)
+
+                if total_archivadas:
+                    self.cache_paginas.invalidar_todo()
+                    logger.info(f"Archivado completado: {total_archivadas} licitaciones trasladadas.")
+                return total_archivadas
+
+            except Exception as e:
+                sesion.rollback()
+                logger.error(f"Error archivando licitaciones (trasladadas antes del fallo: {total_archivadas}): {e}")
+                return total_archivadas
+
+    def _condicion_archivable(self, fecha_limite: datetime):
+        return (
+            (Licitacion.codigo_estado != ESTADO_LICITACION_ACTIVA)
+            & (Licitacion.fecha_cierre < fecha_limite)
+            & or_(Licitacion.etapa.is_(None), Licitacion.etapa.not_in(ETAPAS_PROTEGIDAS))
+        )
+
+    def _trasladar_lote(self, sesion, ids_lote: list):
+        """Copia el lote al archivo con un INSERT ... SELECT y lo elimina de la tabla principal."""
+        codigos_lote = select(Licitacion.codigo_externo).where(Licitacion.id.in_(ids_lote))
+
+        # Las filas trasladadas dejan de contar en el resumen, en la misma transacción
+        filas_lote = sesion.query(Licitacion.etapa, Licitacion.codigo_estado, Licitacion.puntaje)\
+            .filter(Licitacion.id.in_(ids_lote)).all()
+        ajustar_resumen_cambios(sesion, filas_lote, [])
+
+        # Una licitación reingresada tras ser archivada reemplaza su copia anterior
+        sesion.execute(
+            delete(LicitacionArchivada)
+            .where(LicitacionArchivada.codigo_externo.in_(codigos_lote))
+            .execution_options(synchronize_session=False)
+        )
+
+        origen = select(
+            *[getattr(Licitacion, columna) for columna in COLUMNAS_ARCHIVO],
+            *[getattr(LicitacionDetalle, columna) for columna in COLUMNAS_ARCHIVO_DETALLE],
+            literal(datetime.now()).label("fecha_archivado"),
+        ).outerjoin(LicitacionDetalle).where(Licitacion.id.in_(ids_lote))
+
+        sesion.execute(
+            insert(LicitacionArchivada).from_select(
+                COLUMNAS_ARCHIVO + COLUMNAS_ARCHIVO_DETALLE + ["fecha_archivado"], origen
+            )
+        )
+        # Borrado explícito del detalle y los ítems: no todos los motores aplican ON DELETE CASCADE.
+        # El archivo conserva solo el texto de productos, no los ítems estructurados.
+        sesion.execute(
+            delete(LicitacionItem)
+            .where(LicitacionItem.licitacion_id.in_(ids_lote))
+            .execution_options(synchronize_session=False)
+        )
+        sesion.execute(
+            delete(LicitacionDetalle)
+            .where(LicitacionDetalle.licitacion_id.in_(ids_lote))
+            .execution_options(synchronize_session=False)
+        )
+        sesion.execute(
+            delete(Licitacion)
+            .where(Licitacion.id.in_(ids_lote))
+            .execution_options(synchronize_session=False)
+        )
+
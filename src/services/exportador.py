@@ -1,8 +1,9 @@
 import os
 from datetime import datetime
 import pandas as pd
+from sqlalchemy import Boolean, DateTime, case
 from src.bd.database import SessionLocal
-from src.bd.models import Licitacion, PalabraClave, Organismo
+from src.bd.models import Licitacion, LicitacionArchivada, LicitacionDetalle, PalabraClave, Organismo
 from src.utils.logger import configurar_logger
 from src.config.constantes import EtapaLicitacion, TAMANIO_CHUNK_EXPORTACION
 
@@ -36,17 +37,22 @@ class ServicioExportador:
         with self.session_factory() as sesion:
             try:
                 # Diccionario de mapeo: Entidad -> Consulta SQLAlchemy
+                licitaciones = self._consulta_licitaciones(sesion)
                 consultas = {
-                    'candidatas': sesion.query(Licitacion).filter(Licitacion.etapa == EtapaLicitacion.CANDIDATA.value),
-                    'seguimiento': sesion.query(Licitacion).filter(Licitacion.etapa == EtapaLicitacion.SEGUIMIENTO.value),
-                    'ofertadas': sesion.query(Licitacion).filter(Licitacion.etapa == EtapaLicitacion.OFERTADA.value),
-                    'full_db': sesion.query(Licitacion)
+                    'candidatas': licitaciones.filter(Licitacion.etapa == EtapaLicitacion.CANDIDATA.value),
+                    'seguimiento': licitaciones.filter(Licitacion.etapa == EtapaLicitacion.SEGUIMIENTO.value),
+                    'ofertadas': licitaciones.filter(Licitacion.etapa == EtapaLicitacion.OFERTADA.value),
+                    'full_db': licitaciones
                 }
 
                 for clave, consulta in consultas.items():
                     if opciones.get(clave):
                         self._procesar_exportacion_masiva(sesion, clave.capitalize(), consulta, carpeta_final, opciones)
 
+                # La base completa incluye las licitaciones trasladadas al archivo
+                if opciones.get('full_db'):
+                    self._procesar_exportacion_masiva(sesion, "Full_db_archivo", sesion.query(LicitacionArchivada), carpeta_final, opciones)
+
                 if opciones.get('reglas'):
                     self._procesar_exportacion_masiva(sesion, "Reglas_Palabras", sesion.query(PalabraClave), carpeta_final, opciones)
                     self._procesar_exportacion_masiva(sesion, "Reglas_Organismos", sesion.query(Organismo), carpeta_final, opciones)
@@ -57,10 +63,34 @@ class ServicioExportador:
                 logger.error(f"Error crítico en exportación: {error_critico}")
                 return False, f"Falla inesperada: {error_critico}"
 
+    def _consulta_licitaciones(self, sesion):
+        """
+        Columnas de la licitación junto a sus textos extensos, que residen en la
+        tabla 1:1 'licitacion_detalle' (LEFT JOIN: no todas las licitaciones la tienen).
+        """
+        return sesion.query(
+            *Licitacion.__table__.columns,
+            LicitacionDetalle.descripcion,
+            LicitacionDetalle.detalle_productos,
+            LicitacionDetalle.justificacion_puntaje,
+        ).outerjoin(LicitacionDetalle, LicitacionDetalle.licitacion_id == Licitacion.id)
+
     def _procesar_exportacion_masiva(self, sesion, nombre: str, consulta, carpeta: str, opciones: dict):
         """
         Ejecuta la lectura incremental de la base de datos y delega la escritura.
         """
+        ruta_base = os.path.join(carpeta, nombre)
+        exportar_csv_con_pandas = bool(opciones.get('csv'))
+
+        # Vía rápida: en PostgreSQL el propio motor genera el CSV (COPY TO STDOUT)
+        # y lo volcamos directo al disco, sin pasar por DataFrames en Python.
+        if exportar_csv_con_pandas and self._soporta_copy(sesion):
+            self._exportar_csv_copy(sesion, consulta, f"{ruta_base}.csv")
+            exportar_csv_con_pandas = False
+
+        if not (exportar_csv_con_pandas or opciones.get('xlsx')):
+            return
+
         # El parámetro chunksize convierte a read_sql en un generador de DataFrames
         lector_chunks = pd.read_sql(
             consulta.statement, 
@@ -69,7 +99,6 @@ class ServicioExportador:
         )
 
         es_primer_bloque = True
-        ruta_base = os.path.join(carpeta, nombre)
 
         # Para Excel, debido a las limitaciones del formato, acumulamos de forma controlada
         # Para CSV, escribimos de forma incremental directamente en el disco
@@ -81,7 +110,7 @@ class ServicioExportador:
                 chunk[col] = chunk[col].dt.tz_localize(None)
 
             # Exportación incremental a CSV (Anexado al final del archivo)
-            if opciones.get('csv'):
+            if exportar_csv_con_pandas:
                 self._escribir_csv_incremental(chunk, f"{ruta_base}.csv", es_primer_bloque)
             
             # Recolección para Excel
@@ -105,4 +134,43 @@ class ServicioExportador:
             sep=';',
             encoding='utf-8-sig',
             header=incluir_cabecera # Solo pone los títulos de columna en el primer bloque
-        )
\ No newline at end of file
+        )
+
+    def _soporta_copy(self, sesion) -> bool:
+        """Indica si la conexión activa permite exportar mediante COPY (PostgreSQL + psycopg2)."""
+        dialecto = sesion.get_bind().dialect
+        return dialecto.name == "postgresql" and dialecto.driver == "psycopg2"
+
+    def _consulta_copy(self, consulta):
+        """
+        SELECT de la consulta con los valores formateados como los escribe la vía pandas:
+        booleanos como True/False (no t/f) y fechas con zona horaria llevadas a UTC sin
+        zona, igual que el tz_localize(None) aplicado a los bloques de read_sql.
+        """
+        instruccion = consulta.statement
+        columnas = []
+        for nombre, columna in instruccion.selected_columns.items():
+            if isinstance(columna.type, Boolean):
+                columna = case((columna.is_(True), "True"), (columna.is_(False), "False")).label(nombre)
+            elif isinstance(columna.type, DateTime) and columna.type.timezone:
+                columna = columna.op("AT TIME ZONE")("UTC").label(nombre)
+            columnas.append(columna)
+        return instruccion.with_only_columns(*columnas, maintain_column_froms=True)
+
+    def _exportar_csv_copy(self, sesion, consulta, ruta: str):
+        """
+        Delega la serialización del CSV a PostgreSQL mediante COPY (SELECT ...) TO STDOUT.
+        Mantiene el separador ';', el BOM UTF-8 y el formato de valores de la vía pandas
+        para que Excel abra ambos archivos de la misma forma.
+        """
+        sql_consulta = self._consulta_copy(consulta).compile(
+            dialect=sesion.get_bind().dialect,
+            compile_kwargs={"literal_binds": True}
+        )
+        instruccion_copy = f"COPY ({sql_consulta}) TO STDOUT WITH (FORMAT CSV, HEADER, DELIMITER ';')"
+
+        # Reutilizamos la conexión DBAPI de la sesión para leer con la misma transacción
+        conexion_dbapi = sesion.connection().connection.dbapi_connection
+        with open(ruta, mode='w', encoding='utf-8-sig', newline='') as archivo:
+            with conexion_dbapi.cursor() as cursor:
+                cursor.copy_expert(instruccion_copy, archivo)
@@ -1,18 +1,49 @@
+import queue
+import threading
 import time
-from datetime import timedelta
+from collections import deque
+from datetime import datetime, timedelta
 
 from src.scraper.recolector import RecolectorMercadoPublico
+from src.scraper.recolector_archivo import RecolectorArchivo
+from src.repositories.archivo_payloads import ArchivoPayloads
+from src.repositories.bitacora_ingesta import BitacoraIngesta
+from src.repositories.cola_reintentos import ColaReintentosDetalle
 from src.services.almacenar import AlmacenadorLicitaciones
 from src.repositories.licitaciones_repository import RepositorioLicitaciones
 from src.services.instancias import calculadora_compartida
 from src.utils.logger import configurar_logger
-from src.config.constantes import PAUSA_ENTRE_DIAS_EXTRACCION, UMBRAL_PUNTAJE_CANDIDATA, EtapaLicitacion
+from src.utils.metricas import MedidorEtapas, formatear_resumen, escribir_metricas, ARCHIVO_METRICAS
+from src.config.constantes import (
+    PAUSA_ENTRE_DIAS_EXTRACCION,
+    UMBRAL_PUNTAJE_CANDIDATA,
+    COLA_REINTENTOS_TAMANIO_LOTE,
+    COLA_REINTENTOS_LIMITE_DRENADO,
+    PIPELINE_CAPACIDAD_COLA,
+    PIPELINE_HILOS_DESCARGA,
+    PIPELINE_LOTE_ESCRITURA,
+    PIPELINE_SEGUNDOS_ESCRITURA,
+    PIPELINE_LOTE_TRANSFORMACION,
+    PIPELINE_ESPERA_LOTE_TRANSFORMACION,
+    EtapaLicitacion
+)
 from src.services.transformador_api import TransformadorAPI
+from src.services.transformacion_paralela import PoolTransformacion, construir_registros
+from src.services.registro_licitacion import RegistroLicitacion
 from src.bd.database import SessionLocal
+from src.config.config import (
+    INGESTA_PROCESOS_TRANSFORMACION,
+    INGESTA_DIAS_ADELANTADOS,
+    INGESTA_HORAS_CACHE_LISTADO,
+    INGESTA_PRESUPUESTO_FICHAS,
+)
 from src.bd.models import Organismo
 
 logger = configurar_logger("orquestador_ingesta")
 
+# Marca de fin de flujo entre las etapas del pipeline de ingesta
+_FIN_ETAPA = object()
+
 
 class OrquestadorIngesta:
     """
@@ -27,18 +58,58 @@ class OrquestadorIngesta:
     se refleje inmediatamente en las evaluaciones sin reiniciar la aplicación.
     """
 
-    def __init__(self):
-        self.recolector = RecolectorMercadoPublico()
-        self.almacenador = AlmacenadorLicitaciones()
-        self.repositorio = RepositorioLicitaciones()
+    def __init__(self, recolector=None, almacenador=None, repositorio=None, calculadora=None,
+                 archivo_payloads=None, bitacora=None, cola_reintentos=None, session_factory=SessionLocal,
+                 pausa_entre_dias: float = PAUSA_ENTRE_DIAS_EXTRACCION, medidor=None,
+                 archivo_metricas=ARCHIVO_METRICAS, hilos_descarga: int = PIPELINE_HILOS_DESCARGA,
+                 tamanio_lote_escritura: int = PIPELINE_LOTE_ESCRITURA,
+                 segundos_escritura: float = PIPELINE_SEGUNDOS_ESCRITURA,
+                 procesos_transformacion: int = INGESTA_PROCESOS_TRANSFORMACION,
+                 dias_adelantados: int = INGESTA_DIAS_ADELANTADOS,
+                 horas_cache_listado: int = INGESTA_HORAS_CACHE_LISTADO,
+                 presupuesto_fichas: int = INGESTA_PRESUPUESTO_FICHAS):
+        """
+        Todas las dependencias son inyectables para ejecutar la ingesta completa
+        contra una base de datos y una API de prueba (ver tests/test_rendimiento_ingesta.py).
+        """
+        self.session_factory = session_factory
+        # Cronómetros por etapa; el recolector comparte el mismo medidor para sus esperas
+        self.medidor = medidor or MedidorEtapas()
+        self.archivo_metricas = archivo_metricas
+        # Cada respuesta de la API queda archivada para poder reprocesarla sin red
+        self.archivo_payloads = archivo_payloads or ArchivoPayloads(session_factory=session_factory)
+        self.recolector = recolector or RecolectorMercadoPublico(
+            archivo_payloads=self.archivo_payloads, medidor=self.medidor
+        )
+        self.pausa_entre_dias = pausa_entre_dias
+        # Paralelismo y cadencia de confirmación del pipeline de rango de fechas
+        self.hilos_descarga = max(1, hilos_descarga)
+        if isinstance(self.recolector, RecolectorMercadoPublico):
+            # Cada ticket aporta su propia cuota: al menos un hilo por ticket para aprovecharla
+            self.hilos_descarga = max(self.hilos_descarga, self.recolector.pool_tickets.cantidad)
+        self.tamanio_lote_escritura = tamanio_lote_escritura
+        self.segundos_escritura = segundos_escritura
+        # Con 0 la transformación corre en un hilo; con N > 0, en un pool de N procesos
+        self.procesos_transformacion = max(0, procesos_transformacion)
+        # Listados que se adelantan al día en curso y vigencia de los ya archivados
+        self.dias_adelantados = max(1, dias_adelantados)
+        self.horas_cache_listado = horas_cache_listado
+        # Máximo de fichas pedidas a la API por ejecución (0 = sin límite)
+        self.presupuesto_fichas = max(0, presupuesto_fichas)
+        self.almacenador = almacenador or AlmacenadorLicitaciones(session_factory=session_factory)
+        self.repositorio = repositorio or RepositorioLicitaciones(session_factory=session_factory)
+        # Avance por día y por licitación, para reanudar rangos interrumpidos
+        self.bitacora = bitacora or BitacoraIngesta(session_factory=session_factory)
+        # Fichas pendientes por fallos transitorios, drenadas con retroceso exponencial
+        self.cola_reintentos = cola_reintentos or ColaReintentosDetalle(session_factory=session_factory)
         # Usamos la referencia a la instancia compartida, no una nueva instancia.
-        self.calculadora = calculadora_compartida
+        self.calculadora = calculadora or calculadora_compartida
         # Caché local para evitar consultas N+1 a la base de datos
         self.cache_organismos = {}
 
     def _cargar_cache_organismos(self) -> dict:
         """Carga en RAM los puntajes de los organismos para evitar consultas N+1."""
-        with SessionLocal() as sesion:
+        with self.session_factory() as sesion:
             try:
                 organismos = sesion.query(Organismo).all()
                 return {org.codigo: org.puntaje for org in organismos}
@@ -82,7 +153,8 @@ class OrquestadorIngesta:
             comprador = datos_api.get("Comprador", {})
             cod_org = comprador.get("CodigoOrganismo", "")
             desc = datos_api.get("Descripcion", "")
-            items_str = self._extraer_texto_items(datos_api)
+            items = TransformadorAPI.extraer_items(datos_api)
+            items_str = TransformadorAPI.texto_evaluable_items(items)
 
             # Evaluación de detalle (función pura)
             puntaje_detalle, motivos_detalle = self.calculadora.evaluar_detalle(
@@ -119,17 +191,42 @@ class OrquestadorIngesta:
 
     def procesar_rango_fechas(self, fecha_inicio, fecha_fin,
                               callback_progreso=None,
-                              verificador_ejecucion=None) -> dict:
+                              verificador_ejecucion=None,
+                              reanudar: bool = False) -> dict:
         """
         Orquesta la descarga masiva de licitaciones en un rango de fechas.
+
+        La ingesta corre como un pipeline de etapas unidas por colas acotadas:
+        listados -> puntaje de títulos -> descarga de fichas -> puntaje de fichas ->
+        transformación (opcionalmente en un pool de procesos) -> escritura.
+        Red, CPU y base de datos trabajan a la vez, y los listados de los próximos
+        'dias_adelantados' días se descargan mientras el actual aún espera sus fichas.
+        La escritura confirma cada 'tamanio_lote_escritura' registros o 'segundos_escritura' segundos.
+
+        Los listados de días ya cerrados, capturados hace menos de 'horas_cache_listado'
+        horas, se reutilizan del archivo: rangos superpuestos no vuelven a descargarlos.
+
+        Dentro de cada día las fichas se piden de mayor a menor puntaje de título, de modo
+        que una detención o el 'presupuesto_fichas' de la ejecución dejen sin descargar
+        solo las menos valiosas. Las que exceden el presupuesto quedan pendientes.
+
+        Con 'reanudar', consulta la bitácora de ingesta: omite los días completados,
+        reutiliza el listado y las fichas archivadas, procesa solo las licitaciones
+        no persistidas y reintenta primero las fichas pendientes por fallos de red o servidor.
         """
         def emitir(mensaje: str):
             if callback_progreso:
                 callback_progreso(mensaje)
 
+        # Una vez detenida, ninguna etapa vuelve a consultar al verificador
+        detener = threading.Event()
+
         def debe_continuar() -> bool:
-            if verificador_ejecucion:
-                return verificador_ejecucion()
+            if detener.is_set():
+                return False
+            if verificador_ejecucion and not verificador_ejecucion():
+                detener.set()
+                return False
             return True
 
         estadisticas = {
@@ -145,164 +242,683 @@ class OrquestadorIngesta:
         self.cache_organismos = self._cargar_cache_organismos()
 
         dias_totales = (fecha_fin - fecha_inicio).days + 1
+        fechas = [fecha_inicio + timedelta(days=i) for i in range(dias_totales)]
         emitir(f"[INFO] Iniciando proceso para {dias_totales} día(s).")
+        marca_ejecucion = self.medidor.marca()
+
+        # Colas acotadas: una etapa lenta frena a las anteriores sin acumular memoria
+        cola_listados = queue.Queue(maxsize=self.dias_adelantados)
+        cola_descargas = queue.Queue(maxsize=PIPELINE_CAPACIDAD_COLA)
+        cola_detalles = queue.Queue(maxsize=PIPELINE_CAPACIDAD_COLA)
+        cola_transformacion = queue.Queue(maxsize=PIPELINE_CAPACIDAD_COLA)
+        cola_escritura = queue.Queue(maxsize=PIPELINE_CAPACIDAD_COLA)
+
+        # Semáforo no bloqueante: cada ficha pedida a la API consume una unidad. Un reproceso
+        # solo lee el archivo, por lo que no tiene presupuesto que agotar
+        presupuesto = None
+        if self.presupuesto_fichas and not isinstance(self.recolector, RecolectorArchivo):
+            presupuesto = threading.Semaphore(self.presupuesto_fichas)
+
+        pool = None
+        if self.procesos_transformacion:
+            emitir(f"[SISTEMA] Transformación repartida en {self.procesos_transformacion} procesos.")
+            pool = PoolTransformacion(self.procesos_transformacion)
+
+        etapas = [
+            threading.Thread(target=self._etapa_listados, name="ingesta-listados",
+                             args=(fechas, reanudar, cola_listados, estadisticas,
+                                   emitir, debe_continuar, detener)),
+            threading.Thread(target=self._etapa_titulos, name="ingesta-titulos",
+                             args=(cola_listados, cola_descargas, cola_transformacion, detener)),
+            *[
+                threading.Thread(target=self._etapa_descargas, name=f"ingesta-descargas-{n}",
+                                 args=(cola_descargas, cola_detalles, emitir, debe_continuar, presupuesto))
+                for n in range(self.hilos_descarga)
+            ],
+            threading.Thread(target=self._etapa_detalles, name="ingesta-detalles",
+                             args=(cola_detalles, cola_transformacion)),
+            threading.Thread(target=self._etapa_transformacion, name="ingesta-transformacion",
+                             args=(cola_transformacion, cola_escritura, pool)),
+        ]
+        # Las esperas del recolector (límite de tasa, tickets pausados) también atienden la detención
+        self.recolector.verificador_ejecucion = debe_continuar
+        for etapa in etapas:
+            etapa.start()
+
+        # La escritura corre en el hilo llamador: es la última etapa y la única que
+        # modifica las estadísticas por día
+        escritura_completa = False
+        try:
+            self._etapa_escritura(cola_escritura, estadisticas, emitir)
+            escritura_completa = True
+        finally:
+            if not escritura_completa:
+                # Las demás etapas se detienen y su salida se descarta, para que ningún
+                # hilo quede bloqueado para siempre en el put() de una cola acotada
+                detener.set()
+                self._descartar_hasta_fin(cola_escritura, etapas)
+            for etapa in etapas:
+                etapa.join()
+            self.recolector.verificador_ejecucion = None
+            if pool is not None:
+                pool.cerrar()
+        # Una reconciliación por ejecución; cada lote ya ajustó los contadores con deltas
+        self.almacenador.reconciliar_resumen()
+
+        if detener.is_set():
+            emitir("[WARNING] Proceso interrumpido por el usuario.")
+
+        estadisticas['tiempos'] = self.medidor.resumen(desde=marca_ejecucion)
+        sin_presupuesto = estadisticas['tiempos']['contadores'].get("detalle_sin_presupuesto", 0)
+        if sin_presupuesto:
+            emitir(f"[PRESUPUESTO] Límite de {self.presupuesto_fichas} fichas alcanzado: "
+                   f"{sin_presupuesto} quedaron pendientes para la cola de reintentos.")
+        escribir_metricas({"tipo": "ejecucion", "desde": fecha_inicio.isoformat(),
+                           "hasta": fecha_fin.isoformat(), **estadisticas}, self.archivo_metricas)
+        return estadisticas
 
-        for i in range(dias_totales):
-            if not debe_continuar():
-                emitir("[WARNING] Proceso interrumpido por el usuario.")
-                break
-
-            fecha_actual = fecha_inicio + timedelta(days=i)
-            fecha_log = fecha_actual.strftime("%d-%m-%Y")
-            str_fecha = fecha_actual.strftime("%d%m%Y")
+    def reprocesar_desde_archivo(self, fecha_inicio, fecha_fin,
+                                 callback_progreso=None,
+                                 verificador_ejecucion=None) -> dict:
+        """
+        Repite transformación, evaluación y persistencia de un rango de fechas usando
+        los payloads archivados, sin peticiones a la API ni pausas de cortesía.
 
-            emitir(f"\n{'='*60}")
-            emitir(f"[PROCESANDO] Día {i+1}/{dias_totales} - Fecha: {fecha_log}")
-            emitir(f"{'='*60}")
+        Útil tras modificar las reglas de puntaje. Las fichas que no están archivadas
+        quedan con estado 'no_archivado': una licitación nueva conserva el puntaje de su
+        título y una ya guardada con ficha solo actualiza los campos del listado.
+        """
+        recolector_api, pausa_api = self.recolector, self.pausa_entre_dias
+        self.recolector = RecolectorArchivo(self.archivo_payloads)
+        self.pausa_entre_dias = 0
 
-            licitaciones = self.recolector.obtener_licitaciones_diarias(
-                fecha_cadena=str_fecha
+        if callback_progreso:
+            callback_progreso("[REPROCESO] Leyendo respuestas archivadas; no se consultará la API.")
+        try:
+            return self.procesar_rango_fechas(
+                fecha_inicio, fecha_fin, callback_progreso, verificador_ejecucion
             )
+        finally:
+            self.recolector, self.pausa_entre_dias = recolector_api, pausa_api
 
-            if not licitaciones:
-                emitir(f"[INFO] No se registraron licitaciones para {fecha_log}.")
-                continue
-
-            total_dia = len(licitaciones)
-            estadisticas['licitaciones_basicas'] += total_dia
-            emitir(f"[INFO] {total_dia} licitaciones detectadas. Iniciando análisis...")
+    def drenar_cola_reintentos(self, limite: int = COLA_REINTENTOS_LIMITE_DRENADO,
+                               tamanio_lote: int = COLA_REINTENTOS_TAMANIO_LOTE,
+                               callback_progreso=None, verificador_ejecucion=None) -> dict:
+        """
+        Reintenta las fichas vencidas de la cola persistente usando el mismo recolector
+        (y por lo tanto el mismo presupuesto de peticiones) que la extracción.
 
-            stats_dia = self._procesar_listado_diario(
-                licitaciones, total_dia, emitir, debe_continuar
-            )
+        Solo las fichas obtenidas se reevalúan y se escriben, por lotes. Las que vuelven
+        a fallar se reprograman; las que la API ya no reconoce salen de la cola.
+        """
+        def emitir(mensaje: str):
+            if callback_progreso:
+                callback_progreso(mensaje)
 
-            for clave in stats_dia:
-                estadisticas[clave] += stats_dia[clave]
+        def debe_continuar() -> bool:
+            if verificador_ejecucion:
+                return verificador_ejecucion()
+            return True
 
-            emitir(f"\n[RESUMEN] Resultados para {fecha_log}:")
-            emitir(f"   - Fichas descargadas:        {stats_dia['detalles_exitosos']}")
-            emitir(f"   - Omitidas (puntaje <= 0):   {stats_dia['detalles_omitidos']}")
-            emitir(f"   - Errores/Pendientes:         {stats_dia['detalles_pendientes']}")
+        resultado = {'recuperadas': 0, 'reprogramadas': 0, 'descartadas': 0}
+        vencidas = self.cola_reintentos.obtener_vencidas(limite)
+        if not vencidas:
+            return resultado
 
-            if i < dias_totales - 1 and debe_continuar():
-                emitir(f"\n[SISTEMA] Pausa de seguridad ({PAUSA_ENTRE_DIAS_EXTRACCION}s) antes del siguiente día...")
-                time.sleep(PAUSA_ENTRE_DIAS_EXTRACCION)
+        emitir(f"[REINTENTOS] {len(vencidas)} fichas pendientes en cola.")
+        self.cache_organismos = self._cargar_cache_organismos()
 
-        return estadisticas
+        lote, recuperadas, fallidas, descartadas = self._nuevo_lote(), {}, {}, []
+        self.recolector.verificador_ejecucion = debe_continuar
+        try:
+            for codigo_externo, fecha_listado in vencidas:
+                if not debe_continuar():
+                    break
+
+                with self.medidor.medir("detalle_api"):
+                    respuesta = self.recolector.obtener_detalle_licitacion(codigo_externo)
+                estado_api = respuesta['estado']
+                self.medidor.contar(f"reintento_{estado_api}")
+
+                if respuesta['datos']:
+                    # La ficha ya se pagó: se evalúa completa aunque el título no supere el umbral
+                    with self.medidor.medir("puntaje"):
+                        puntaje_inicial, motivos = self.calculadora.evaluar_titulo(
+                            respuesta['datos'].get("Nombre", ""))
+                    datos_api, _ = self._completar_evaluacion(respuesta['datos'], puntaje_inicial,
+                                                              motivos, respuesta)
+                    with self.medidor.medir("transformacion"):
+                        registro = TransformadorAPI.construir_registro_db(datos_api)
+                    self._agregar_a_lote(lote, registro)
+                    recuperadas[codigo_externo] = fecha_listado
+                elif estado_api in ('error_servidor', 'error_red', 'cuota_agotada', 'interrumpido'):
+                    fallidas[codigo_externo] = f"pendiente_{estado_api}"
+                else:
+                    descartadas.append(codigo_externo)
+
+                if len(lote["licitaciones"]) >= tamanio_lote:
+                    self._confirmar_recuperadas(lote, recuperadas, resultado)
+                    lote, recuperadas = self._nuevo_lote(), {}
+        finally:
+            self.recolector.verificador_ejecucion = None
+
+        self._confirmar_recuperadas(lote, recuperadas, resultado)
+        self.cola_reintentos.registrar_fallos(fallidas)
+        self.cola_reintentos.quitar(descartadas)
+        resultado['reprogramadas'] = len(fallidas)
+        resultado['descartadas'] = len(descartadas)
+
+        emitir(f"[REINTENTOS] Recuperadas: {resultado['recuperadas']} | "
+               f"Reprogramadas: {resultado['reprogramadas']} | Descartadas: {resultado['descartadas']}")
+        return resultado
+
+    def _confirmar_recuperadas(self, lote: dict, recuperadas: dict, resultado: dict):
+        """Escribe el lote de fichas recuperadas y solo entonces las retira de la cola."""
+        if not lote["licitaciones"]:
+            return
+        try:
+            rechazadas = self._guardar_lote(lote)
+        except Exception as e:
+            logger.error(f"Error guardando fichas recuperadas de la cola: {e}")
+            return
+
+        # Las rechazadas por la base de datos siguen en la cola para el próximo drenado
+        recuperadas = {codigo: fecha for codigo, fecha in recuperadas.items() if codigo not in rechazadas}
+        self.cola_reintentos.quitar(list(recuperadas))
+        resultado['recuperadas'] += len(recuperadas)
+
+        por_fecha = {}
+        for codigo, fecha_listado in recuperadas.items():
+            if fecha_listado is not None:
+                por_fecha.setdefault(fecha_listado, {})[codigo] = "exitoso"
+        for fecha_listado, estados in por_fecha.items():
+            self.bitacora.marcar_persistidas(fecha_listado, estados)
+
+    def _preparar_reanudacion(self, licitaciones: list, plan: dict) -> tuple[list, dict]:
+        """
+        Filtra el listado según la bitácora descartando las ya persistidas (la etapa de
+        títulos antepone las de ficha pendiente). Retorna además las fichas recuperables del archivo.
+        """
+        restantes = [
+            item for item in licitaciones
+            if item.get("CodigoExterno") not in plan["persistidas"]
+        ]
+
+        fichas_recuperadas = {}
+        for codigo in plan["fichas_descargadas"]:
+            ficha = self.archivo_payloads.obtener_detalle(codigo)
+            if ficha is not None:
+                fichas_recuperadas[codigo] = ficha
+        return restantes, fichas_recuperadas
 
     # =========================================================================
-    # MÉTODOS PRIVADOS AUXILIARES
+    # ETAPAS DEL PIPELINE DE INGESTA
     # =========================================================================
+    # Cada etapa consume su cola de entrada hasta recibir _FIN_ETAPA y siempre lo
+    # propaga, incluso tras un error o una detención: así ninguna etapa queda
+    # bloqueada esperando a otra. Al detenerse, las etapas de descarga descartan
+    # lo que reciben (se recupera al reanudar) y las posteriores terminan lo ya obtenido.
+
+    def _etapa_listados(self, fechas: list, reanudar: bool, cola_listados: queue.Queue,
+                        estadisticas: dict, emitir, debe_continuar, detener: threading.Event):
+        """Descarga (o recupera del archivo) el listado de cada día y lo entrega completo."""
+        consulto_api = False
+        try:
+            for i, fecha_actual in enumerate(fechas):
+                if consulto_api and self.pausa_entre_dias:
+                    # La pausa de cortesía separa solo los listados; las demás etapas siguen
+                    detener.wait(self.pausa_entre_dias)
+                if not debe_continuar():
+                    break
+
+                dia, consulto_api = self._listar_dia(fecha_actual, i + 1, len(fechas), reanudar, emitir)
+                if dia is not None:
+                    estadisticas['licitaciones_basicas'] += dia["total"]
+                    cola_listados.put(dia)
+        except Exception as e:
+            logger.error(f"Error en la etapa de listados: {e}")
+        finally:
+            cola_listados.put(_FIN_ETAPA)
 
-    def _procesar_listado_diario(self, licitaciones: list, total_dia: int,
-                                  emitir, debe_continuar) -> dict:
+    def _listar_dia(self, fecha_actual, numero_dia: int, dias_totales: int,
+                    reanudar: bool, emitir) -> tuple[dict, bool]:
         """
-        Procesa cada licitación de un día: evalúa, descarga detalle si aplica y persiste por lotes.
+        Prepara el contexto de un día para el pipeline. Retorna (día, consultó_api);
+        el día es None si no hay nada que procesar.
         """
-        stats = {
-            'detalles_exitosos': 0,
-            'detalles_omitidos': 0,
-            'detalles_pendientes': 0,
-            'errores': 0
+        fecha_log = fecha_actual.strftime("%d-%m-%Y")
+        str_fecha = fecha_actual.strftime("%d%m%Y")
+        fecha_dia = fecha_actual.date() if isinstance(fecha_actual, datetime) else fecha_actual
+        emitir(f"\n[LISTADO] Día {numero_dia}/{dias_totales} - Fecha: {fecha_log}")
+
+        plan = self.bitacora.plan_reanudacion(fecha_dia) if reanudar else None
+        if plan and plan["completo"]:
+            emitir(f"[REANUDACIÓN] {fecha_log} ya fue completado en una ejecución anterior. Se omite.")
+            return None, False
+
+        # Al reanudar un día ya listado, el listado archivado evita repetir la petición;
+        # en otro caso, solo si el archivado sigue vigente
+        licitaciones, consulto_api = None, False
+        if plan and plan["conocido"]:
+            licitaciones = self.archivo_payloads.obtener_listado(str_fecha)
+        if licitaciones is None and self.horas_cache_listado > 0:
+            licitaciones = self.archivo_payloads.obtener_listado_vigente(str_fecha, self.horas_cache_listado)
+            if licitaciones is not None:
+                self.medidor.contar("listado_cache")
+                emitir(f"[CACHÉ] Listado del {fecha_log} reutilizado del archivo local.")
+        if licitaciones is None:
+            consulto_api = True
+            with self.medidor.medir("listado_api"):
+                licitaciones = self.recolector.obtener_licitaciones_diarias(fecha_cadena=str_fecha)
+
+        if not licitaciones:
+            emitir(f"[INFO] No se registraron licitaciones para {fecha_log}.")
+            return None, consulto_api
+
+        self.bitacora.iniciar_dia(fecha_dia, [item.get("CodigoExterno") for item in licitaciones])
+
+        fichas_recuperadas = {}
+        if plan:
+            licitaciones, fichas_recuperadas = self._preparar_reanudacion(licitaciones, plan)
+            emitir(f"[REANUDACIÓN] {len(plan['persistidas'])} licitaciones ya persistidas; "
+                   f"{len(plan['pendientes'])} fichas pendientes se reintentan primero.")
+            if not licitaciones:
+                self.bitacora.completar_dia(fecha_dia)
+                return None, consulto_api
+
+        emitir(f"[INFO] {fecha_log}: {len(licitaciones)} licitaciones detectadas. Iniciando análisis...")
+        dia = {
+            "fecha": fecha_dia,
+            "fecha_log": fecha_log,
+            "licitaciones": licitaciones,
+            "fichas_recuperadas": fichas_recuperadas,
+            # Fichas que fallaron en una ejecución anterior: se piden antes que las demás
+            "pendientes": plan["pendientes"] if plan else set(),
+            "total": len(licitaciones),
+            # Contadores que solo actualiza la etapa de escritura
+            "recibidas": 0,
+            "en_lote": 0,
+            "persistidas": 0,
+            "fallido": False,
+            "inicio": time.perf_counter(),
+            # Desde aquí se mide el día; con el pipeline incluye lo solapado con días vecinos
+            "marca": self.medidor.marca(),
+            "stats": {'detalles_exitosos': 0, 'detalles_omitidos': 0,
+                      'detalles_pendientes': 0, 'errores': 0},
         }
+        return dia, consulto_api
 
-        lote_licitaciones = []
-        lote_organismos = []
-        lote_estados = []
-        
-        # Sets de control para evitar duplicados dentro del mismo lote de inserción
-        codigos_org_lote = set()
-        codigos_est_lote = set()
+    def _etapa_titulos(self, cola_listados: queue.Queue, cola_descargas: queue.Queue,
+                       cola_transformacion: queue.Queue, detener: threading.Event):
+        """
+        Filtro de primera capa: las licitaciones con título bajo el umbral pasan directo
+        a la transformación sin gastar peticiones; el resto espera su ficha, ordenado
+        por puntaje de título (las pendientes de ejecuciones anteriores van primero).
+        """
+        try:
+            while True:
+                dia = cola_listados.get()
+                if dia is _FIN_ETAPA:
+                    break
+
+                # Consumo destructivo: cada payload del listado se libera apenas se transforma,
+                # en vez de vivir hasta que se recorre el día completo
+                licitaciones = deque(dia.pop("licitaciones"))
+                fichas_recuperadas = dia.pop("fichas_recuperadas")
+                pendientes = dia.pop("pendientes")
+                candidatas = []
+                while licitaciones and not detener.is_set():
+                    item = licitaciones.popleft()
+                    try:
+                        with self.medidor.medir("puntaje"):
+                            puntaje_inicial, motivos = self.calculadora.evaluar_titulo(item.get("Nombre", ""))
+
+                        if puntaje_inicial > UMBRAL_PUNTAJE_CANDIDATA:
+                            candidatas.append((puntaje_inicial, item, motivos))
+                        else:
+                            datos_api, stats = self._completar_evaluacion(item, puntaje_inicial, motivos, None)
+                            cola_transformacion.put((dia, datos_api, stats))
+                    except Exception as e:
+                        logger.error(f"Error evaluando el título de {item.get('CodigoExterno')}: {e}")
+
+                # sort estable: a igual puntaje se conserva el orden del listado
+                candidatas.sort(key=lambda c: (c[1].get("CodigoExterno") not in pendientes, -c[0]))
+                for puntaje_inicial, item, motivos in candidatas:
+                    if detener.is_set():
+                        break
+                    ficha = fichas_recuperadas.get(item.get("CodigoExterno"))
+                    cola_descargas.put((dia, item, puntaje_inicial, motivos, ficha))
+        finally:
+            # Un fin por cada hilo de descarga
+            for _ in range(self.hilos_descarga):
+                cola_descargas.put(_FIN_ETAPA)
+
+    def _etapa_descargas(self, cola_descargas: queue.Queue, cola_detalles: queue.Queue,
+                         emitir, debe_continuar, presupuesto: threading.Semaphore = None):
+        """
+        Descarga fichas; los hilos comparten el limitador de tasa del recolector y el
+        presupuesto de la ejecución. Sin presupuesto, la ficha queda pendiente sin pedirse.
+        """
+        try:
+            while True:
+                mensaje = cola_descargas.get()
+                if mensaje is _FIN_ETAPA:
+                    break
+
+                dia, item, puntaje_inicial, motivos, ficha_recuperada = mensaje
+                if not debe_continuar():
+                    continue
+                codigo_externo = item.get("CodigoExterno")
+                try:
+                    if ficha_recuperada is None and presupuesto is not None \
+                            and not presupuesto.acquire(blocking=False):
+                        self.medidor.contar("detalle_sin_presupuesto")
+                        cola_detalles.put((dia, item, puntaje_inicial, motivos,
+                                           {'datos': None, 'estado': 'sin_presupuesto'}))
+                        continue
+                    emitir(f"   [DESCARGA] {codigo_externo} (puntaje base: {puntaje_inicial})")
+                    resultado = self._descargar_ficha(codigo_externo, dia["fecha"], ficha_recuperada)
+                    cola_detalles.put((dia, item, puntaje_inicial, motivos, resultado))
+                except Exception as e:
+                    logger.error(f"Error descargando la ficha {codigo_externo}: {e}")
+        finally:
+            cola_detalles.put(_FIN_ETAPA)
+
+    def _etapa_detalles(self, cola_detalles: queue.Queue, cola_transformacion: queue.Queue):
+        """Evalúa las fichas descargadas (o el fallo de su descarga)."""
+        try:
+            descargas_activas = self.hilos_descarga
+            while descargas_activas:
+                mensaje = cola_detalles.get()
+                if mensaje is _FIN_ETAPA:
+                    descargas_activas -= 1
+                    continue
+
+                dia, item, puntaje_inicial, motivos, resultado = mensaje
+                try:
+                    datos_api, stats = self._completar_evaluacion(item, puntaje_inicial, motivos, resultado)
+                    cola_transformacion.put((dia, datos_api, stats))
+                except Exception as e:
+                    logger.error(f"Error evaluando la ficha de {item.get('CodigoExterno')}: {e}")
+        finally:
+            cola_transformacion.put(_FIN_ETAPA)
+
+    def _etapa_transformacion(self, cola_transformacion: queue.Queue, cola_escritura: queue.Queue,
+                              pool: PoolTransformacion = None):
+        """
+        Convierte las licitaciones evaluadas en registros para guardar_lote_masivo.
+        Con pool, los lotes se transforman en otros procesos y se entregan en orden de
+        envío, con a lo sumo dos lotes en vuelo por proceso; sin pool, en este hilo.
+        """
+        en_vuelo = deque()
+        terminado = False
+        try:
+            while not terminado or en_vuelo:
+                if not terminado:
+                    lote = self._tomar_lote(cola_transformacion, pool is not None, bool(en_vuelo))
+                    if lote and lote[-1] is _FIN_ETAPA:
+                        lote.pop()
+                        terminado = True
+                    if lote and pool is None:
+                        with self.medidor.medir("transformacion"):
+                            registros = construir_registros([datos_api for _, datos_api, _ in lote])
+                        # Desde aquí el payload crudo ya no se referencia y puede liberarse
+                        for (dia, _, stats), registro in zip(lote, registros):
+                            cola_escritura.put((dia, registro, stats))
+                    elif lote:
+                        datos = [datos_api for _, datos_api, _ in lote]
+                        en_vuelo.append((lote, datos, time.perf_counter(), pool.enviar(datos)))
+
+                while en_vuelo and (terminado or en_vuelo[0][3].done() or len(en_vuelo) > 2 * pool.procesos):
+                    lote, datos, inicio, futuro = en_vuelo.popleft()
+                    registros = pool.recoger(futuro, datos)
+                    self.medidor.registrar("transformacion_lote", time.perf_counter() - inicio)
+                    for (dia, _, stats), registro in zip(lote, registros):
+                        cola_escritura.put((dia, registro, stats))
+        except Exception as e:
+            logger.error(f"Error en la etapa de transformación: {e}")
+        finally:
+            cola_escritura.put(_FIN_ETAPA)
 
-        for idx, item in enumerate(licitaciones, 1):
-            if not debe_continuar():
-                break
+    def _tomar_lote(self, cola: queue.Queue, acumular: bool, hay_pendientes: bool) -> list:
+        """
+        Extrae hasta PIPELINE_LOTE_TRANSFORMACION mensajes. Con 'acumular' espera un
+        momento a completar el lote (el pool rinde con lotes grandes); sin él, toma solo
+        lo disponible. Con lotes pendientes en el pool no se bloquea indefinidamente.
+        """
+        try:
+            lote = [cola.get(timeout=0.05 if hay_pendientes else None)]
+        except queue.Empty:
+            return []
 
-            if idx % 20 == 0:
-                emitir(f"   [AVANCE] Evaluando {idx}/{total_dia}...")
+        limite = time.monotonic() + (PIPELINE_ESPERA_LOTE_TRANSFORMACION if acumular else 0.0)
+        while len(lote) < PIPELINE_LOTE_TRANSFORMACION and lote[-1] is not _FIN_ETAPA:
+            try:
+                lote.append(cola.get(timeout=max(0.0, limite - time.monotonic())) if acumular
+                            else cola.get_nowait())
+            except queue.Empty:
+                break
+        return lote
 
-            datos_api, stats_item = self._procesar_item_individual(item, emitir)
+    def _etapa_escritura(self, cola_escritura: queue.Queue, estadisticas: dict, emitir):
+        """
+        Acumula registros y confirma un lote cada 'tamanio_lote_escritura' registros o
+        'segundos_escritura' segundos. Un día se marca completado en la bitácora cuando
+        todas sus licitaciones quedaron persistidas sin errores.
+        """
+        lote, estados_lote, dias_abiertos = self._nuevo_lote(), {}, []
+        vencimiento = time.monotonic() + self.segundos_escritura
 
-            for clave in stats_item:
-                stats[clave] += stats_item[clave]
+        while True:
+            try:
+                mensaje = cola_escritura.get(timeout=max(0.0, vencimiento - time.monotonic()))
+            except queue.Empty:
+                mensaje = None
+            if mensaje is _FIN_ETAPA:
+                break
 
-            # TRANSFORMACIÓN Y PREPARACIÓN PARA PERSISTENCIA MASIVA
-            fechas = TransformadorAPI.parsear_fechas(datos_api)
-            texto_productos = TransformadorAPI.construir_texto_productos(datos_api)
-            
-            comprador = datos_api.get("Comprador", {})
-            cod_org = comprador.get("CodigoOrganismo")
-            cod_est = datos_api.get("CodigoEstado")
-
-            registro_db = {
-                "codigo_externo": datos_api.get("CodigoExterno"),
-                "nombre": datos_api.get("Nombre"),
-                "descripcion": datos_api.get("Descripcion"),
-                "puntaje": datos_api.get("_PuntajeCalculado", 0),
-                "justificacion_puntaje": datos_api.get("_Justificacion", ""),
-                "etapa": datos_api.get("_EtapaAsignada", EtapaLicitacion.IGNORADA.value),
-                "detalle_productos": texto_productos,
-                "fecha_cierre": fechas["cierre"],
-                "fecha_inicio": fechas["inicio"],
-                "fecha_publicacion": fechas["publicacion"],
-                "fecha_adjudicacion": fechas["adjudicacion"],
-                "codigo_estado": cod_est,
-                "codigo_organismo": cod_org,
-                "tiene_detalle": datos_api.get("_TieneDetalle", False)
-            }
-            lote_licitaciones.append(registro_db)
-
-            # Acumulación de entidades relacionadas para Bulk Insert
-            if cod_org and cod_org not in codigos_org_lote:
-                lote_organismos.append({
-                    "codigo": cod_org, 
-                    "nombre": comprador.get("NombreOrganismo", "Desconocido")
-                })
-                codigos_org_lote.add(cod_org)
-                
-            if cod_est and cod_est not in codigos_est_lote:
-                lote_estados.append({
-                    "codigo": cod_est, 
-                    "descripcion": datos_api.get("Estado", "Desconocido")
-                })
-                codigos_est_lote.add(cod_est)
-
-        # PERSISTENCIA VECTORIZADA: Se ejecuta una única transacción para todo el día
+            if mensaje is not None:
+                dia, registro, stats_item = mensaje
+                if dia["recibidas"] == 0:
+                    dias_abiertos.append(dia)
+                dia["recibidas"] += 1
+                dia["en_lote"] += 1
+                for clave in stats_item:
+                    dia["stats"][clave] += stats_item[clave]
+
+                self._agregar_a_lote(lote, registro)
+                estados_lote.setdefault(id(dia), (dia, {}))[1][registro.codigo_externo] = registro.estado_descarga
+
+                if dia["recibidas"] % 20 == 0:
+                    emitir(f"   [AVANCE] {dia['fecha_log']}: {dia['recibidas']}/{dia['total']} evaluadas...")
+
+            lote_lleno = len(lote["licitaciones"]) >= self.tamanio_lote_escritura
+            if lote_lleno or time.monotonic() >= vencimiento:
+                self._confirmar_lote_pipeline(lote, estados_lote, emitir)
+                dias_abiertos = self._cerrar_dias(dias_abiertos, estadisticas, emitir)
+                lote, estados_lote = self._nuevo_lote(), {}
+                vencimiento = time.monotonic() + self.segundos_escritura
+
+        self._confirmar_lote_pipeline(lote, estados_lote, emitir)
+        self._cerrar_dias(dias_abiertos, estadisticas, emitir, final=True)
+
+    def _descartar_hasta_fin(self, cola: queue.Queue, etapas: list):
+        """Consume la cola hasta su fin (o hasta que no quede etapa viva que pueda enviarlo)."""
+        while True:
+            try:
+                if cola.get(timeout=0.1) is _FIN_ETAPA:
+                    return
+            except queue.Empty:
+                if not any(etapa.is_alive() for etapa in etapas):
+                    return
+
+    def _confirmar_lote_pipeline(self, lote: dict, estados_lote: dict, emitir):
+        """Escribe el lote y registra por día su efecto en la cola de reintentos y la bitácora."""
+        if not lote["licitaciones"]:
+            return
         try:
-            if lote_licitaciones:
-                emitir("   [BASE DE DATOS] Sincronizando lote diario con PostgreSQL...")
-                self.almacenador.guardar_lote_masivo(lote_licitaciones, lote_organismos, lote_estados)
+            emitir(f"   [BASE DE DATOS] Sincronizando lote de {len(lote['licitaciones'])} licitaciones...")
+            rechazadas = self._guardar_lote(lote)
         except Exception as e:
             emitir(f"   [ERROR CRÍTICO] Fallo en persistencia masiva: {str(e)[:80]}")
-            stats['errores'] += 1
+            for dia, _ in estados_lote.values():
+                dia["fallido"] = True
+                dia["en_lote"] = 0
+                dia["stats"]['errores'] += 1
+            return
+
+        if rechazadas:
+            emitir(f"   [ERROR] {len(rechazadas)} licitaciones rechazadas por la base de datos; "
+                   f"el resto del lote quedó guardado.")
+        for dia, estados_descarga in estados_lote.values():
+            # Un día con filas rechazadas no se completa: la reanudación las reintenta
+            rechazadas_dia = [codigo for codigo in estados_descarga if codigo in rechazadas]
+            if rechazadas_dia:
+                dia["fallido"] = True
+                dia["stats"]['errores'] += len(rechazadas_dia)
+                estados_descarga = {
+                    codigo: estado for codigo, estado in estados_descarga.items() if codigo not in rechazadas
+                }
+            dia["persistidas"] += dia["en_lote"] - len(rechazadas_dia)
+            dia["en_lote"] = 0
+            self._registrar_persistidas(dia["fecha"], estados_descarga)
+
+    def _registrar_persistidas(self, fecha_dia, estados_descarga: dict):
+        # Las fichas con fallos transitorios pasan a la cola persistente de reintentos
+        pendientes = {
+            codigo: estado for codigo, estado in estados_descarga.items()
+            if (estado or "").startswith("pendiente_")
+        }
+        self.cola_reintentos.encolar(fecha_dia, pendientes)
+        self.cola_reintentos.quitar([
+            codigo for codigo, estado in estados_descarga.items() if estado == "exitoso"
+        ])
+        self.bitacora.marcar_persistidas(fecha_dia, estados_descarga)
+
+    def _cerrar_dias(self, dias_abiertos: list, estadisticas: dict, emitir, final: bool = False) -> list:
+        """
+        Cierra los días con todas sus licitaciones persistidas (o todos, al terminar la
+        ejecución): acumula sus estadísticas y emite su resumen. Retorna los que siguen abiertos.
+        """
+        abiertos = []
+        for dia in dias_abiertos:
+            terminado = dia["persistidas"] == dia["total"] and not dia["fallido"]
+            if not terminado and not final:
+                abiertos.append(dia)
+                continue
+
+            if terminado:
+                self.bitacora.completar_dia(dia["fecha"])
+            stats_dia = dia["stats"]
+            for clave in stats_dia:
+                estadisticas[clave] += stats_dia[clave]
+
+            emitir(f"\n[RESUMEN] Resultados para {dia['fecha_log']}:")
+            emitir(f"   - Fichas descargadas:        {stats_dia['detalles_exitosos']}")
+            emitir(f"   - Omitidas (puntaje <= 0):   {stats_dia['detalles_omitidos']}")
+            emitir(f"   - Errores/Pendientes:         {stats_dia['detalles_pendientes']}")
+
+            tiempos_dia = self.medidor.resumen(desde=dia["marca"])
+            emitir("[TIEMPOS] Desglose por etapa:")
+            for linea in formatear_resumen(tiempos_dia):
+                emitir(linea)
+            escribir_metricas({"tipo": "dia", "fecha": dia["fecha_log"], "licitaciones": dia["total"],
+                               "persistidas": dia["persistidas"], "completado": terminado,
+                               "segundos": round(time.perf_counter() - dia["inicio"], 3),
+                               **stats_dia, **tiempos_dia}, self.archivo_metricas)
+        return abiertos
 
-        return stats
+    # =========================================================================
+    # MÉTODOS PRIVADOS AUXILIARES
+    # =========================================================================
 
-    def _procesar_item_individual(self, item: dict, emitir) -> tuple[dict, dict]:
+    def _nuevo_lote(self) -> dict:
+        # Sets de control para evitar duplicados dentro del mismo lote de inserción
+        return {"licitaciones": [], "organismos": [], "estados": [],
+                "codigos_org": set(), "codigos_est": set()}
+
+    def _agregar_a_lote(self, lote: dict, registro: RegistroLicitacion):
+        """Acumula el registro y sus entidades relacionadas para el Bulk Insert."""
+        lote["licitaciones"].append(registro)
+
+        cod_org = registro.codigo_organismo
+        cod_est = registro.codigo_estado
+
+        if cod_org and cod_org not in lote["codigos_org"]:
+            lote["organismos"].append({
+                "codigo": cod_org,
+                "nombre": registro.nombre_organismo or "Desconocido"
+            })
+            lote["codigos_org"].add(cod_org)
+
+        if cod_est and cod_est not in lote["codigos_est"]:
+            lote["estados"].append({
+                "codigo": cod_est,
+                "descripcion": registro.descripcion_estado or "Desconocido"
+            })
+            lote["codigos_est"].add(cod_est)
+
+    def _guardar_lote(self, lote: dict) -> set:
+        """Escribe el lote por bloques y retorna los códigos que la base de datos rechazó."""
+        with self.medidor.medir("persistencia"):
+            resultado = self.almacenador.guardar_lote_masivo(
+                lote["licitaciones"], lote["organismos"], lote["estados"]
+            )
+        for bloque in resultado["bloques"]:
+            self.medidor.registrar("persistencia_bloque", bloque["segundos"])
+        if resultado["fallidas"]:
+            self.medidor.contar("registros_rechazados", len(resultado["fallidas"]))
+        return set(resultado["fallidas"])
+
+    def _procesar_item_individual(self, item: dict, emitir, fecha_dia=None,
+                                  ficha_recuperada: dict = None) -> tuple[dict, dict]:
         """
         Evalúa una licitación individual: aplica filtro de puntaje en título,
         y si supera el umbral, descarga y evalúa la ficha técnica completa.
+        Una ficha recuperada del archivo (reanudación) reemplaza la descarga.
+        """
+        codigo_externo = item.get("CodigoExterno")
+        with self.medidor.medir("puntaje"):
+            puntaje_inicial, motivos = self.calculadora.evaluar_titulo(item.get("Nombre", ""))
+
+        resultado = None
+        if puntaje_inicial > UMBRAL_PUNTAJE_CANDIDATA:
+            emitir(f"   [DESCARGA] {codigo_externo} (puntaje base: {puntaje_inicial})")
+            resultado = self._descargar_ficha(codigo_externo, fecha_dia, ficha_recuperada)
+
+        return self._completar_evaluacion(item, puntaje_inicial, motivos, resultado)
+
+    def _descargar_ficha(self, codigo_externo: str, fecha_dia=None, ficha_recuperada: dict = None) -> dict:
+        if ficha_recuperada is not None:
+            resultado = {'datos': ficha_recuperada, 'estado': 'exitoso'}
+        else:
+            with self.medidor.medir("detalle_api"):
+                resultado = self.recolector.obtener_detalle_licitacion(codigo_externo)
+            if resultado['datos'] and fecha_dia is not None:
+                self.bitacora.marcar_ficha_descargada(fecha_dia, codigo_externo)
+        self.medidor.contar(f"detalle_{resultado['estado']}")
+        return resultado
+
+    def _completar_evaluacion(self, item: dict, puntaje_inicial: int, motivos: list,
+                              resultado: dict = None) -> tuple[dict, dict]:
+        """
+        Completa la evaluación con la ficha descargada y anota los metadatos calculados.
+        'resultado' es None cuando el título no superó el umbral y la ficha no se pidió.
         """
         stats = {'detalles_exitosos': 0, 'detalles_omitidos': 0,
                  'detalles_pendientes': 0, 'errores': 0}
 
-        codigo_externo = item.get("CodigoExterno")
-        titulo = item.get("Nombre", "")
-        puntaje_inicial, motivos = self.calculadora.evaluar_titulo(titulo)
-
         datos_completos = item
         tiene_detalle = False
         puntaje_final = puntaje_inicial
         estado_descarga = "sin_intentar"
         etapa_asignada = EtapaLicitacion.IGNORADA.value
 
-        if puntaje_inicial <= UMBRAL_PUNTAJE_CANDIDATA:
+        if resultado is None:
             # Filtro de primera capa: descartamos sin gastar peticiones de API
             stats['detalles_omitidos'] += 1
             estado_descarga = "omitido_puntaje_negativo"
         else:
-            emitir(f"   [DESCARGA] {codigo_externo} (puntaje base: {puntaje_inicial})")
-            resultado = self.recolector.obtener_detalle_licitacion(codigo_externo)
             detalle = resultado['datos']
             estado_api = resultado['estado']
 
@@ -315,12 +931,15 @@ class OrquestadorIngesta:
                 comprador = detalle.get("Comprador", {})
                 cod_org = comprador.get("CodigoOrganismo", "")
                 desc = detalle.get("Descripcion", "")
-                items_str = self._extraer_texto_items(detalle)
+                items = TransformadorAPI.extraer_items(detalle)
+                items_str = TransformadorAPI.texto_evaluable_items(items)
+                datos_completos["_Items"] = items
 
                 # EVALUACIÓN LÉXICA PURA
-                puntaje_detalle, motivos_detalle = self.calculadora.evaluar_detalle(
-                    desc, items_str
-                )
+                with self.medidor.medir("puntaje"):
+                    puntaje_detalle, motivos_detalle = self.calculadora.evaluar_detalle(
+                        desc, items_str
+                    )
                 
                 # INTEGRACIÓN DE PUNTAJE DESDE CACHÉ DE MEMORIA
                 puntaje_org_cache = self.cache_organismos.get(cod_org, 0)
@@ -338,11 +957,11 @@ class OrquestadorIngesta:
                     etapa_asignada = EtapaLicitacion.IGNORADA.value
 
             else:
-                if estado_api in ['error_servidor', 'error_red']:
+                if estado_api in ['error_servidor', 'error_red', 'cuota_agotada', 'sin_presupuesto', 'interrumpido']:
                     stats['detalles_pendientes'] += 1
                     estado_descarga = f"pendiente_{estado_api}"
-                elif estado_api == 'no_encontrado':
-                    estado_descarga = "no_encontrado"
+                elif estado_api in ('no_encontrado', 'no_archivado'):
+                    estado_descarga = estado_api
                 else:
                     stats['errores'] += 1
                     estado_descarga = f"error_{estado_api}"
@@ -354,16 +973,3 @@ class OrquestadorIngesta:
         datos_completos["_EtapaAsignada"] = etapa_asignada
 
         return datos_completos, stats
-
-    def _extraer_texto_items(self, datos: dict) -> str:
-        """
-        Extrae y concatena los nombres y descripciones de los productos de la API
-        en un único string para que la calculadora pueda evaluarlo con regex.
-        """
-        listado = datos.get("Items", {}).get("Listado", [])
-        if not isinstance(listado, list):
-            return ""
-        return " ".join(
-            f"{p.get('NombreProducto', '')} {p.get('Descripcion', '')}"
-            for p in listado
-        )
\ No newline at end of file
@@ -0,0 +1,34 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from src.config.constantes import EtapaLicitacion
+
+
+@dataclass(slots=True)
+class RegistroLicitacion:
+    """
+    Fila de ingesta lista para guardar_lote_masivo.
+
+    Conserva solo lo que se persiste (más el nombre del organismo, la descripción
+    del estado y el resultado de la descarga de la ficha), de modo que el payload
+    crudo de la API puede liberarse apenas se transforma, sin esperar al commit.
+    Con __slots__ cada registro ocupa una fracción de un diccionario equivalente.
+    """
+    codigo_externo: str
+    nombre: str | None = None
+    descripcion: str | None = None
+    puntaje: int = 0
+    justificacion_puntaje: str = ""
+    etapa: str = EtapaLicitacion.IGNORADA.value
+    detalle_productos: str | None = None
+    items: list = field(default_factory=list)
+    fecha_cierre: datetime | None = None
+    fecha_inicio: datetime | None = None
+    fecha_publicacion: datetime | None = None
+    fecha_adjudicacion: datetime | None = None
+    codigo_estado: int | None = None
+    codigo_organismo: str | None = None
+    tiene_detalle: bool = False
+    # Datos para las tablas relacionadas y la bitácora; no son columnas de 'licitaciones'
+    nombre_organismo: str | None = None
+    descripcion_estado: str | None = None
+    estado_descarga: str | None = None
@@ -0,0 +1,50 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from src.services.transformador_api import TransformadorAPI
+from src.utils.logger import configurar_logger
+
+logger = configurar_logger("transformacion_paralela")
+
+
+def construir_registros(lote_datos_api: list) -> list:
+    """
+    Transforma un lote completo; las fechas se convierten juntas para el lote.
+    Se ejecuta en los procesos del pool, por lo que debe ser de nivel de módulo.
+    """
+    fechas_lote = TransformadorAPI.parsear_fechas_lote(lote_datos_api)
+    return [
+        TransformadorAPI.construir_registro_db(datos_api, fechas)
+        for datos_api, fechas in zip(lote_datos_api, fechas_lote)
+    ]
+
+
+class PoolTransformacion:
+    """
+    Pool de procesos opcional para la transformación de licitaciones evaluadas en
+    registros de base de datos (fechas, ítems, texto de productos) durante cargas
+    históricas grandes, fuera del GIL que comparten la interfaz y el pipeline.
+
+    Los lotes se envían de forma asíncrona y se recogen en orden de envío. Si el
+    pool falla (p. ej. un proceso muere), el lote afectado se transforma en el
+    proceso actual: la ingesta nunca se detiene por esta optimización.
+    """
+
+    def __init__(self, procesos: int):
+        # 'spawn' en todas las plataformas: mismo comportamiento en Windows y Linux,
+        # y ningún hilo del pipeline queda copiado en los procesos hijos
+        self.ejecutor = ProcessPoolExecutor(max_workers=procesos,
+                                            mp_context=multiprocessing.get_context("spawn"))
+        self.procesos = procesos
+
+    def enviar(self, lote_datos_api: list):
+        return self.ejecutor.submit(construir_registros, lote_datos_api)
+
+    def recoger(self, futuro, lote_datos_api: list) -> list:
+        try:
+            return futuro.result()
+        except Exception as e:
+            logger.error(f"Fallo en el pool de transformación; el lote se procesa localmente: {e}")
+            return construir_registros(lote_datos_api)
+
+    def cerrar(self):
+        self.ejecutor.shutdown(wait=True, cancel_futures=True)
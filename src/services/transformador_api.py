@@ -1,7 +1,6 @@
-from datetime import datetime
-from src.utils.logger import configurar_logger
-
-logger = configurar_logger("transformador_api")
+from src.utils.fechas import extraer_fechas_api, extraer_fechas_lote
+from src.config.constantes import EtapaLicitacion
+from src.services.registro_licitacion import RegistroLicitacion
 
 class TransformadorAPI:
     """
@@ -13,49 +12,130 @@ class TransformadorAPI:
     @staticmethod
     def parsear_fechas(datos: dict) -> dict:
         """Extrae y convierte fechas desde formato ISO string a datetime."""
-        objeto_fechas = datos.get("Fechas", {})
-
-        def _convertir(texto_fecha: str):
-            if not texto_fecha:
-                return None
-            try:
-                texto_limpio = texto_fecha.replace("Z", "+00:00")
-                return datetime.fromisoformat(texto_limpio)
-            except ValueError:
-                logger.warning(f"Formato de fecha no reconocido: '{texto_fecha}'")
-                return None
-
-        return {
-            "cierre": _convertir(datos.get("FechaCierre") or objeto_fechas.get("FechaCierre")),
-            "inicio": _convertir(objeto_fechas.get("FechaInicio")),
-            "publicacion": _convertir(objeto_fechas.get("FechaPublicacion")),
-            "adjudicacion": (
-                _convertir(objeto_fechas.get("FechaAdjudicacion"))
-                or _convertir(objeto_fechas.get("FechaEstimadaAdjudicacion"))
-            ),
-        }
+        return extraer_fechas_api(datos)
 
     @staticmethod
-    def construir_texto_productos(datos: dict) -> str:
-        """Transforma el listado de ítems en un texto estructurado."""
+    def parsear_fechas_lote(lista_datos: list) -> list:
+        """parsear_fechas para un lote completo, convirtiendo cada texto distinto una sola vez."""
+        return extraer_fechas_lote(lista_datos)
+
+    @staticmethod
+    def extraer_items(datos: dict) -> list:
+        """
+        Normaliza el listado de ítems de la API en registros estructurados,
+        listos para la tabla 'licitacion_items'. Es la única lectura de 'Items':
+        el texto almacenado y el texto evaluado se derivan de este resultado.
+        """
         objeto_items = datos.get("Items", {})
 
+        # La API puede retornar Items como dict con "Listado" o directamente como lista
         if isinstance(objeto_items, dict):
             lista_productos = objeto_items.get("Listado", [])
         elif isinstance(objeto_items, list):
             lista_productos = objeto_items
         else:
-            return ""
+            return []
 
-        lineas = []
+        if not isinstance(lista_productos, list):
+            return []
+
+        items = []
         for producto in lista_productos:
-            nombre = producto.get("NombreProducto", "Producto genérico")
-            cantidad = producto.get("Cantidad", 0)
-            unidad = producto.get("UnidadMedida", "un")
-            descripcion = producto.get("Descripcion", "")
+            if not isinstance(producto, dict):
+                continue
+            codigo_producto = producto.get("CodigoProducto")
+            codigo_categoria = producto.get("CodigoCategoria")
+            items.append({
+                "correlativo": TransformadorAPI._convertir_entero(producto.get("Correlativo")),
+                "codigo_producto": str(codigo_producto) if codigo_producto is not None else None,
+                "codigo_categoria": str(codigo_categoria) if codigo_categoria is not None else None,
+                "nombre_producto": producto.get("NombreProducto"),
+                "descripcion": producto.get("Descripcion"),
+                "unidad_medida": producto.get("UnidadMedida"),
+                "cantidad": TransformadorAPI._convertir_decimal(producto.get("Cantidad")),
+            })
+        return items
+
+    @staticmethod
+    def formatear_texto_productos(items: list) -> str:
+        """Representación legible de los ítems para la ficha técnica."""
+        lineas = []
+        for item in items:
+            nombre = item["nombre_producto"] or "Producto genérico"
+            cantidad = item["cantidad"] if item["cantidad"] is not None else 0
+            unidad = item["unidad_medida"] or "un"
+            descripcion = item["descripcion"] or ""
+
+            # Las cantidades enteras se muestran sin decimales (10 y no 10.0)
+            if isinstance(cantidad, float) and cantidad.is_integer():
+                cantidad = int(cantidad)
 
             lineas.append(f"- {nombre} ({cantidad} {unidad})")
             if descripcion and descripcion.lower() != nombre.lower():
                 lineas.append(f"  Detalle: {descripcion}")
 
-        return "\n".join(lineas)
\ No newline at end of file
+        return "\n".join(lineas)
+
+    @staticmethod
+    def texto_evaluable_items(items: list) -> str:
+        """Concatena nombres y descripciones de los ítems para la evaluación con regex."""
+        return " ".join(
+            f"{item['nombre_producto'] or ''} {item['descripcion'] or ''}"
+            for item in items
+        )
+
+    @staticmethod
+    def construir_texto_productos(datos: dict) -> str:
+        """Transforma el listado de ítems en un texto estructurado."""
+        return TransformadorAPI.formatear_texto_productos(TransformadorAPI.extraer_items(datos))
+
+    @staticmethod
+    def construir_registro_db(datos_api: dict, fechas: dict = None) -> RegistroLicitacion:
+        """
+        Transforma el diccionario evaluado de la API (con los metadatos '_' del
+        orquestador) en el registro para guardar_lote_masivo. No accede a la BD,
+        por lo que puede ejecutarse en otro proceso. 'fechas' permite reutilizar
+        las ya convertidas por parsear_fechas_lote.
+        """
+        if fechas is None:
+            fechas = TransformadorAPI.parsear_fechas(datos_api)
+        # Los ítems ya normalizados durante la evaluación se reutilizan para persistir
+        items = datos_api.get("_Items")
+        if items is None:
+            items = TransformadorAPI.extraer_items(datos_api)
+        comprador = datos_api.get("Comprador") or {}
+
+        return RegistroLicitacion(
+            codigo_externo=datos_api.get("CodigoExterno"),
+            nombre=datos_api.get("Nombre"),
+            descripcion=datos_api.get("Descripcion"),
+            puntaje=datos_api.get("_PuntajeCalculado", 0),
+            justificacion_puntaje=datos_api.get("_Justificacion", ""),
+            etapa=datos_api.get("_EtapaAsignada", EtapaLicitacion.IGNORADA.value),
+            detalle_productos=TransformadorAPI.formatear_texto_productos(items),
+            items=items,
+            fecha_cierre=fechas["cierre"],
+            fecha_inicio=fechas["inicio"],
+            fecha_publicacion=fechas["publicacion"],
+            fecha_adjudicacion=fechas["adjudicacion"],
+            codigo_estado=datos_api.get("CodigoEstado"),
+            codigo_organismo=comprador.get("CodigoOrganismo"),
+            tiene_detalle=datos_api.get("_TieneDetalle", False),
+            nombre_organismo=comprador.get("NombreOrganismo"),
+            descripcion_estado=datos_api.get("Estado"),
+            estado_descarga=datos_api.get("_EstadoDescarga"),
+        )
+
+    @staticmethod
+    def _convertir_entero(valor):
+        try:
+            return int(valor) if valor is not None else None
+        except (ValueError, TypeError):
+            return None
+
+    @staticmethod
+    def _convertir_decimal(valor):
+        try:
+            return float(valor) if valor is not None else None
+        except (ValueError, TypeError):
+            return None
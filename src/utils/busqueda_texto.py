@@ -0,0 +1,198 @@
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+from functools import lru_cache
+
+_PATRON_TOKENS = re.compile(r"\w+")
+
+
+@lru_cache(maxsize=4096)
+def _normalizar_caracter(caracter: str) -> str:
+    """Minúscula sin diacríticos; si la conversión cambia la longitud se conserva el original."""
+    minuscula = caracter.lower()
+    if len(minuscula) != 1:
+        return caracter
+    base = "".join(c for c in unicodedata.normalize("NFKD", minuscula) if not unicodedata.combining(c))
+    return base if len(base) == 1 else minuscula
+
+
+def normalizar_texto(texto: str) -> str:
+    """
+    Convierte a minúsculas y elimina tildes/diacríticos ('Camión' -> 'camion').
+    Preserva la longitud del texto para poder mapear posiciones sobre el original.
+    """
+    if not texto:
+        return ""
+    return "".join(map(_normalizar_caracter, texto))
+
+
+def tokenizar(texto: str) -> list:
+    """Separa un texto normalizado en términos alfanuméricos de 2 o más caracteres."""
+    return [token for token in _PATRON_TOKENS.findall(normalizar_texto(texto)) if len(token) > 1]
+
+
+def resaltar_fragmento(texto: str, terminos: set, largo_maximo: int = 160) -> str:
+    """
+    Extrae una ventana del texto alrededor del primer término encontrado y
+    marca cada coincidencia con <b></b> (mismo formato que ts_headline).
+    """
+    if not texto:
+        return ""
+
+    texto_normalizado = normalizar_texto(texto)
+    posiciones = [texto_normalizado.find(termino) for termino in terminos]
+    posiciones = [p for p in posiciones if p >= 0]
+    inicio = max(min(posiciones) - largo_maximo // 4, 0) if posiciones else 0
+    fin = min(inicio + largo_maximo, len(texto))
+
+    # normalizar_texto conserva la longitud, así que los índices sirven sobre el original
+    fragmento = texto[inicio:fin]
+    fragmento_normalizado = texto_normalizado[inicio:fin]
+
+    marcas = []
+    for termino in terminos:
+        for coincidencia in re.finditer(re.escape(termino), fragmento_normalizado):
+            marcas.append((coincidencia.start(), coincidencia.end()))
+
+    resultado = []
+    cursor = 0
+    for desde, hasta in sorted(marcas):
+        if desde < cursor:
+            continue
+        resultado.append(fragmento[cursor:desde])
+        resultado.append(f"<b>{fragmento[desde:hasta]}</b>")
+        cursor = hasta
+    resultado.append(fragmento[cursor:])
+
+    prefijo = "..." if inicio > 0 else ""
+    sufijo = "..." if fin < len(texto) else ""
+    return f"{prefijo}{''.join(resultado)}{sufijo}"
+
+
+class IndiceInvertido:
+    """
+    Índice invertido en memoria (término -> documentos) con ponderación por campo.
+    Respaldo local de la búsqueda de texto completo de PostgreSQL para motores
+    sin tsvector (SQLite en pruebas): insensible a mayúsculas y tildes, y
+    compatible por prefijo ('comput' encuentra 'computadores').
+    """
+
+    def __init__(self, pesos_campos: tuple = (1.0,)):
+        self.pesos_campos = pesos_campos
+        self._postings = defaultdict(dict)
+        self._terminos_ordenados = None
+
+    def agregar(self, identificador, *campos):
+        """Indexa un documento compuesto por uno o más campos de texto."""
+        for posicion, texto in enumerate(campos):
+            peso = self.pesos_campos[min(posicion, len(self.pesos_campos) - 1)]
+            for token in tokenizar(texto):
+                documentos = self._postings[token]
+                documentos[identificador] = documentos.get(identificador, 0.0) + peso
+        self._terminos_ordenados = None
+
+    def buscar(self, consulta: str, limite: int = 50) -> list:
+        """
+        Retorna [(identificador, rango)] de los documentos que contienen todos
+        los términos de la consulta, ordenados de mayor a menor relevancia.
+        """
+        terminos = tokenizar(consulta)
+        if not terminos:
+            return []
+
+        acumulado = None
+        for termino in terminos:
+            puntajes_termino = self._documentos_para(termino)
+            if acumulado is None:
+                acumulado = dict(puntajes_termino)
+            else:
+                acumulado = {
+                    documento: puntaje + puntajes_termino[documento]
+                    for documento, puntaje in acumulado.items()
+                    if documento in puntajes_termino
+                }
+            if not acumulado:
+                return []
+
+        return sorted(acumulado.items(), key=lambda par: par[1], reverse=True)[:limite]
+
+    def _documentos_para(self, termino: str) -> dict:
+        """Une las listas de todos los términos indexados que comienzan por 'termino'."""
+        if self._terminos_ordenados is None:
+            self._terminos_ordenados = sorted(self._postings)
+
+        resultado = {}
+        indice = bisect_left(self._terminos_ordenados, termino)
+        while indice < len(self._terminos_ordenados) and self._terminos_ordenados[indice].startswith(termino):
+            for documento, puntaje in self._postings[self._terminos_ordenados[indice]].items():
+                resultado[documento] = max(resultado.get(documento, 0.0), puntaje)
+            indice += 1
+        return resultado
+
+
+class IndiceTrigramas:
+    """
+    Índice de n-gramas (trigramas) en memoria para búsquedas difusas e insensibles
+    a tildes sobre textos cortos (ej. nombres de organismos).
+
+    Cada documento se descompone en los trigramas de sus palabras; una consulta
+    obtiene candidatos por intersección de listas y los ordena por la fracción
+    de trigramas coincidentes, tolerando errores de tipeo ('minsterio').
+    """
+
+    def __init__(self, umbral_similitud: float = 0.6):
+        self.umbral_similitud = umbral_similitud
+        self._postings = defaultdict(set)
+        self._textos = {}
+
+    @staticmethod
+    def _trigramas(token: str, relleno_final: bool = True) -> set:
+        """Trigramas de una palabra con relleno de espacios para ponderar inicios/finales."""
+        relleno = f"  {token} " if relleno_final else f"  {token}"
+        return {relleno[i:i + 3] for i in range(len(relleno) - 2)}
+
+    def agregar(self, identificador, texto: str):
+        """Indexa el texto asociado a un identificador."""
+        texto_normalizado = normalizar_texto(texto)
+        self._textos[identificador] = texto_normalizado
+        for token in tokenizar(texto_normalizado):
+            for trigrama in self._trigramas(token):
+                self._postings[trigrama].add(identificador)
+
+    def buscar(self, consulta: str) -> list:
+        """
+        Retorna los identificadores coincidentes ordenados por relevancia.
+        Las coincidencias exactas de subcadena siempre se incluyen y encabezan el resultado.
+        """
+        consulta_normalizada = normalizar_texto(consulta).strip()
+        if not consulta_normalizada:
+            return list(self._textos)
+
+        # Las consultas muy cortas no generan trigramas útiles: búsqueda directa de subcadena
+        if len(consulta_normalizada) < 3:
+            return [i for i, t in self._textos.items() if consulta_normalizada in t]
+
+        # La última palabra puede estar a medio escribir: no se exige su final de palabra
+        tokens = tokenizar(consulta_normalizada)
+        trigramas_consulta = set()
+        for posicion, token in enumerate(tokens):
+            trigramas_consulta |= self._trigramas(token, relleno_final=posicion < len(tokens) - 1)
+        if not trigramas_consulta:
+            return []
+
+        coincidencias = defaultdict(int)
+        for trigrama in trigramas_consulta:
+            for identificador in self._postings.get(trigrama, ()):
+                coincidencias[identificador] += 1
+
+        puntajes = []
+        for identificador, cantidad in coincidencias.items():
+            similitud = cantidad / len(trigramas_consulta)
+            if consulta_normalizada in self._textos[identificador]:
+                similitud += 1.0
+            if similitud >= self.umbral_similitud:
+                puntajes.append((similitud, identificador))
+
+        puntajes.sort(key=lambda par: par[0], reverse=True)
+        return [identificador for _, identificador in puntajes]
@@ -0,0 +1,42 @@
+import zlib
+from src.utils.json_rapido import codificar_json, decodificar_json
+
+# zstd forma parte de la biblioteca estándar desde Python 3.14 (módulo 'compression.zstd').
+# En versiones anteriores se recurre a zlib, que comprime menos pero no requiere dependencias.
+try:
+    from compression import zstd as _zstd
+except ImportError:
+    _zstd = None
+
+CODEC_ZSTD = "zstd"
+CODEC_ZLIB = "zlib"
+
+CODEC_PREFERIDO = CODEC_ZSTD if _zstd is not None else CODEC_ZLIB
+
+# Nivel moderado: los payloads se escriben durante la ingesta y no deben frenarla
+NIVEL_ZSTD = 9
+NIVEL_ZLIB = 6
+
+
+def comprimir_json(datos) -> tuple[str, bytes, int]:
+    """
+    Serializa un objeto JSON de la API y lo comprime.
+    Retorna (códec, contenido comprimido, tamaño original en bytes).
+    """
+    crudo = codificar_json(datos)
+    if CODEC_PREFERIDO == CODEC_ZSTD:
+        return CODEC_ZSTD, _zstd.compress(crudo, level=NIVEL_ZSTD), len(crudo)
+    return CODEC_ZLIB, zlib.compress(crudo, NIVEL_ZLIB), len(crudo)
+
+
+def descomprimir_json(codec: str, contenido: bytes):
+    """Operación inversa de comprimir_json, respetando el códec con que se guardó el payload."""
+    if codec == CODEC_ZSTD:
+        if _zstd is None:
+            raise RuntimeError("El payload fue comprimido con zstd, que requiere Python 3.14 o superior.")
+        crudo = _zstd.decompress(contenido)
+    elif codec == CODEC_ZLIB:
+        crudo = zlib.decompress(contenido)
+    else:
+        raise ValueError(f"Códec de compresión desconocido: '{codec}'")
+    return decodificar_json(crudo)
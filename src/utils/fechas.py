@@ -0,0 +1,68 @@
+from datetime import datetime
+from functools import lru_cache
+from src.config.constantes import TAMANIO_CACHE_FECHAS
+from src.utils.logger import configurar_logger
+
+logger = configurar_logger("fechas")
+
+
+@lru_cache(maxsize=TAMANIO_CACHE_FECHAS)
+def _convertir_iso(texto: str):
+    try:
+        # La 'Z' (UTC) se normaliza a '+00:00': nos protege si la API cambia su formato de salida
+        return datetime.fromisoformat(texto.replace("Z", "+00:00"))
+    except ValueError:
+        logger.warning(f"Formato de fecha no reconocido: '{texto}'")
+        return None
+
+
+def parsear_fecha_iso(valor) -> datetime | None:
+    """
+    Convierte una fecha ISO 8601 de la API en datetime; None si falta o no es válida.
+    Las conversiones quedan en una caché acotada: en un mismo día se repiten muchas
+    marcas de tiempo (p. ej. cierres a las 15:00).
+    """
+    if not valor or not isinstance(valor, str):
+        return None
+    return _convertir_iso(valor)
+
+
+def _textos_fecha(datos: dict) -> tuple:
+    """Textos crudos de fecha de una licitación, en el orden que usa _armar_fechas."""
+    objeto_fechas = datos.get("Fechas") or {}
+    return (
+        datos.get("FechaCierre") or objeto_fechas.get("FechaCierre"),
+        objeto_fechas.get("FechaInicio"),
+        objeto_fechas.get("FechaPublicacion"),
+        objeto_fechas.get("FechaAdjudicacion"),
+        objeto_fechas.get("FechaEstimadaAdjudicacion"),
+    )
+
+
+def _armar_fechas(convertidas: list) -> dict:
+    cierre, inicio, publicacion, adjudicacion, adjudicacion_estimada = convertidas
+    return {
+        "cierre": cierre,
+        "inicio": inicio,
+        "publicacion": publicacion,
+        # A falta de fecha de adjudicación real se usa la estimada
+        "adjudicacion": adjudicacion or adjudicacion_estimada,
+    }
+
+
+def extraer_fechas_api(datos: dict) -> dict:
+    """Fechas normalizadas de una licitación: cierre, inicio, publicación y adjudicación."""
+    return _armar_fechas([parsear_fecha_iso(texto) for texto in _textos_fecha(datos)])
+
+
+def extraer_fechas_lote(lista_datos: list) -> list:
+    """
+    Versión por lote de extraer_fechas_api: reúne las columnas de fecha de todas las
+    licitaciones, convierte cada texto distinto una sola vez y reparte los resultados.
+    """
+    columnas = [_textos_fecha(datos) for datos in lista_datos]
+    convertidas = {
+        texto: parsear_fecha_iso(texto)
+        for texto in {texto for fila in columnas for texto in fila if texto}
+    }
+    return [_armar_fechas([convertidas.get(texto) for texto in fila]) for fila in columnas]
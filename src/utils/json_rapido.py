@@ -0,0 +1,24 @@
+import json
+
+# orjson decodifica y serializa varias veces más rápido que el módulo estándar.
+# Es opcional: sin él se usa 'json', con idéntico resultado.
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+DECODIFICADOR_JSON = "orjson" if _orjson is not None else "json"
+
+
+def decodificar_json(contenido):
+    """Convierte bytes (o texto) JSON en objetos Python. Lanza ValueError si no es JSON válido."""
+    if _orjson is not None:
+        return _orjson.loads(contenido)
+    return json.loads(contenido)
+
+
+def codificar_json(datos) -> bytes:
+    """Serializa a JSON compacto en UTF-8, sin escapar caracteres no ASCII."""
+    if _orjson is not None:
+        return _orjson.dumps(datos)
+    return json.dumps(datos, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
@@ -0,0 +1,113 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from src.utils.logger import DIRECTORIO_LOGS, configurar_logger
+
+logger = configurar_logger("metricas")
+
+ARCHIVO_METRICAS = DIRECTORIO_LOGS / "metricas_ingesta.jsonl"
+
+
+class MedidorEtapas:
+    """
+    Instrumentación liviana de la ingesta: cronómetros por etapa (listado, esperas
+    por límite de tasa, fichas, transformación, puntaje, persistencia) y contadores.
+
+    Guarda cada duración individual para poder calcular percentiles. Una 'marca'
+    permite resumir solo lo ocurrido desde un punto (p. ej. el inicio de un día)
+    sin perder el acumulado de la ejecución completa. Es seguro entre hilos.
+    """
+
+    def __init__(self):
+        self._muestras = {}
+        self._contadores = {}
+        self._cerrojo = threading.Lock()
+
+    @contextmanager
+    def medir(self, etapa: str):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar(etapa, time.perf_counter() - inicio)
+
+    def registrar(self, etapa: str, segundos: float):
+        with self._cerrojo:
+            self._muestras.setdefault(etapa, []).append(segundos)
+
+    def contar(self, nombre: str, cantidad: int = 1):
+        with self._cerrojo:
+            self._contadores[nombre] = self._contadores.get(nombre, 0) + cantidad
+
+    def marca(self) -> dict:
+        """Posición actual de cada serie; se entrega luego a resumen(desde=...)."""
+        with self._cerrojo:
+            return {
+                "muestras": {etapa: len(valores) for etapa, valores in self._muestras.items()},
+                "contadores": dict(self._contadores),
+            }
+
+    def resumen(self, desde: dict = None) -> dict:
+        """Totales y percentiles (en milisegundos) por etapa, opcionalmente desde una marca."""
+        desde = desde or {"muestras": {}, "contadores": {}}
+        with self._cerrojo:
+            series = {
+                etapa: valores[desde["muestras"].get(etapa, 0):]
+                for etapa, valores in self._muestras.items()
+            }
+            contadores = {
+                nombre: valor - desde["contadores"].get(nombre, 0)
+                for nombre, valor in self._contadores.items()
+            }
+
+        etapas = {}
+        for etapa, valores in series.items():
+            if not valores:
+                continue
+            ordenados = sorted(valores)
+            etapas[etapa] = {
+                "n": len(ordenados),
+                "total_s": round(sum(ordenados), 3),
+                "p50_ms": round(_percentil(ordenados, 50) * 1000, 1),
+                "p95_ms": round(_percentil(ordenados, 95) * 1000, 1),
+                "p99_ms": round(_percentil(ordenados, 99) * 1000, 1),
+                "max_ms": round(ordenados[-1] * 1000, 1),
+            }
+        return {"etapas": etapas, "contadores": {k: v for k, v in contadores.items() if v}}
+
+
+def _percentil(ordenados: list, percentil: float) -> float:
+    """Percentil por interpolación lineal sobre una lista ya ordenada."""
+    if len(ordenados) == 1:
+        return ordenados[0]
+    posicion = (len(ordenados) - 1) * percentil / 100
+    inferior = int(posicion)
+    superior = min(inferior + 1, len(ordenados) - 1)
+    return ordenados[inferior] + (ordenados[superior] - ordenados[inferior]) * (posicion - inferior)
+
+
+def formatear_resumen(resumen: dict) -> list:
+    """Líneas legibles del desglose por etapa para el callback de progreso."""
+    lineas = []
+    for etapa, datos in sorted(resumen["etapas"].items(), key=lambda par: -par[1]["total_s"]):
+        lineas.append(
+            f"   - {etapa:<20} {datos['total_s']:>8.2f}s  n={datos['n']:<6} "
+            f"p50={datos['p50_ms']}ms p95={datos['p95_ms']}ms max={datos['max_ms']}ms"
+        )
+    for nombre, valor in sorted(resumen["contadores"].items()):
+        lineas.append(f"   - {nombre:<20} {valor}")
+    return lineas
+
+
+def escribir_metricas(registro: dict, archivo=ARCHIVO_METRICAS):
+    """Agrega una línea JSON al archivo de métricas, junto a 'app.log'."""
+    try:
+        archivo.parent.mkdir(parents=True, exist_ok=True)
+        linea = json.dumps({"momento": datetime.now().isoformat(timespec="seconds"), **registro},
+                           ensure_ascii=False)
+        with open(archivo, "a", encoding="utf-8") as salida:
+            salida.write(linea + "\n")
+    except OSError as e:
+        logger.error(f"No fue posible escribir métricas en {archivo}: {e}")
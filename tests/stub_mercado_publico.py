@@ -0,0 +1,192 @@
+"""
+Servidor HTTP local que imita la API de licitaciones de Mercado Público.
+
+Sirve listados diarios y fichas de detalle sintéticos (deterministas según la
+semilla) o grabados, con latencia, errores 500 y respuestas 429 configurables.
+Los listados llevan ETag y responden 304 a una petición condicional sin cambios.
+Permite ejecutar la ingesta completa sin red ni consumo de la cuota del ticket.
+"""
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+RUTA_LICITACIONES = "/servicios/v1/publico/licitaciones.json"
+
+TITULOS_SINTETICOS = (
+    "Adquisición de silla ergonómica para oficinas",
+    "Servicio de transporte de funcionarios",
+    "Compra de mesa y silla para comedor",
+    "Mantención de ascensores edificio consistorial",
+)
+
+
+class ServidorStubMercadoPublico:
+    """
+    Uso:
+        with ServidorStubMercadoPublico(licitaciones_por_dia=100, latencia_s=0.01) as stub:
+            recolector = RecolectorMercadoPublico(url_base=stub.url)
+            ...
+            stub.contadores["detalle"]
+    """
+
+    def __init__(self, licitaciones_por_dia: int = 50, latencia_s: float = 0.0,
+                 tasa_error: float = 0.0, tasa_429: float = 0.0, semilla: int = 17,
+                 listados: dict = None, detalles: dict = None, tickets_agotados: set = None):
+        self.licitaciones_por_dia = licitaciones_por_dia
+        self.latencia_s = latencia_s
+        self.tasa_error = tasa_error
+        self.tasa_429 = tasa_429
+        self.semilla = semilla
+        # Respuestas grabadas: {fecha ddmmaaaa: listado} y {codigo externo: ficha}
+        self.listados = listados or {}
+        self.detalles = detalles or {}
+        # Tickets cuya cuota diaria se da por agotada: siempre responden 429
+        self.tickets_agotados = set(tickets_agotados or ())
+
+        self.contadores = {"listado": 0, "detalle": 0, "error_500": 0, "error_429": 0, "no_modificado": 0}
+        self.peticiones_por_ticket = {}
+        self._azar = random.Random(semilla)
+        self._cerrojo = threading.Lock()
+        self._servidor = None
+        self._hilo = None
+
+    @classmethod
+    def desde_archivo(cls, archivo_payloads, fechas: list, **opciones):
+        """Construye el stub con las respuestas reales guardadas en 'payloads_api'."""
+        listados, detalles = {}, {}
+        for fecha in fechas:
+            listado = archivo_payloads.obtener_listado(fecha)
+            if listado is None:
+                continue
+            listados[fecha] = listado
+            for item in listado:
+                codigo = item.get("CodigoExterno")
+                ficha = archivo_payloads.obtener_detalle(codigo)
+                if ficha is not None:
+                    detalles[codigo] = ficha
+        return cls(listados=listados, detalles=detalles, **opciones)
+
+    # ------------------------------------------------------------------
+    # Ciclo de vida
+    # ------------------------------------------------------------------
+
+    @property
+    def url(self) -> str:
+        host, puerto = self._servidor.server_address[:2]
+        return f"http://{host}:{puerto}{RUTA_LICITACIONES}"
+
+    def __enter__(self):
+        stub = self
+
+        class Manejador(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub._atender(self)
+
+            def log_message(self, formato, *args):
+                pass
+
+        self._servidor = ThreadingHTTPServer(("127.0.0.1", 0), Manejador)
+        self._hilo = threading.Thread(target=self._servidor.serve_forever, daemon=True)
+        self._hilo.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._servidor.shutdown()
+        self._servidor.server_close()
+        self._hilo.join()
+
+    # ------------------------------------------------------------------
+    # Respuestas
+    # ------------------------------------------------------------------
+
+    def _atender(self, peticion: BaseHTTPRequestHandler):
+        url = urlparse(peticion.path)
+        parametros = {clave: valores[0] for clave, valores in parse_qs(url.query).items()}
+        tipo = "detalle" if "codigo" in parametros else "listado"
+
+        ticket = parametros.get("ticket")
+        with self._cerrojo:
+            self.contadores[tipo] += 1
+            self.peticiones_por_ticket[ticket] = self.peticiones_por_ticket.get(ticket, 0) + 1
+            sorteo = self._azar.random()
+
+        if self.latencia_s:
+            time.sleep(self.latencia_s)
+
+        if url.path != RUTA_LICITACIONES or not parametros.get("ticket"):
+            return self._responder(peticion, 400, {"Mensaje": "Petición inválida"})
+        if sorteo < self.tasa_429 or ticket in self.tickets_agotados:
+            with self._cerrojo:
+                self.contadores["error_429"] += 1
+            return self._responder(peticion, 429, {"Mensaje": "Demasiadas peticiones"})
+        if sorteo < self.tasa_429 + self.tasa_error:
+            with self._cerrojo:
+                self.contadores["error_500"] += 1
+            return self._responder(peticion, 500, {"Mensaje": "Error interno"})
+
+        if tipo == "detalle":
+            ficha = self._ficha(parametros["codigo"])
+            return self._responder(peticion, 200, {"Cantidad": 1 if ficha else 0, "Version": "v1",
+                                                   "Listado": [ficha] if ficha else []})
+
+        listado = self._listado(parametros.get("fecha", ""))
+        cuerpo = {"Cantidad": len(listado), "Version": "v1", "Listado": listado}
+        etag = '"' + hashlib.sha1(json.dumps(cuerpo).encode("utf-8")).hexdigest() + '"'
+        if peticion.headers.get("If-None-Match") == etag:
+            with self._cerrojo:
+                self.contadores["no_modificado"] += 1
+            peticion.send_response(304)
+            peticion.send_header("ETag", etag)
+            peticion.end_headers()
+            return None
+        return self._responder(peticion, 200, cuerpo, etag)
+
+    def _responder(self, peticion, estado: int, cuerpo: dict, etag: str = None):
+        contenido = json.dumps(cuerpo, ensure_ascii=False).encode("utf-8")
+        peticion.send_response(estado)
+        peticion.send_header("Content-Type", "application/json; charset=utf-8")
+        peticion.send_header("Content-Length", str(len(contenido)))
+        if etag:
+            peticion.send_header("ETag", etag)
+        peticion.end_headers()
+        peticion.wfile.write(contenido)
+
+    def _listado(self, fecha: str) -> list:
+        if self.listados:
+            return self.listados.get(fecha, [])
+        return [self._resumen_sintetico(fecha, indice) for indice in range(self.licitaciones_por_dia)]
+
+    def _ficha(self, codigo: str):
+        if self.detalles:
+            return self.detalles.get(codigo)
+
+        fecha, _, indice = codigo.partition("-")
+        if not indice:
+            return None
+        indice = int(indice.split("-")[0])
+        ficha = self._resumen_sintetico(fecha, indice)
+        ficha.update({
+            "Descripcion": f"{ficha['Nombre']}. Incluye despacho e instalación.",
+            "Comprador": {"CodigoOrganismo": str(7000 + indice % 25),
+                          "NombreOrganismo": f"Organismo sintético {indice % 25}"},
+            "Fechas": {"FechaInicio": "2024-03-01T08:00:00", "FechaPublicacion": "2024-03-01T08:00:00"},
+            "Items": {"Cantidad": 3, "Listado": [
+                {"Correlativo": n, "CodigoProducto": 56101500 + n, "CodigoCategoria": "56101500",
+                 "NombreProducto": f"Silla modelo {n}", "Descripcion": "Silla de oficina con apoyabrazos",
+                 "UnidadMedida": "Unidad", "Cantidad": 10 * n}
+                for n in range(1, 4)
+            ]},
+        })
+        return ficha
+
+    def _resumen_sintetico(self, fecha: str, indice: int) -> dict:
+        return {
+            "CodigoExterno": f"{fecha}-{indice}-LE24",
+            "Nombre": TITULOS_SINTETICOS[indice % len(TITULOS_SINTETICOS)],
+            "CodigoEstado": 5,
+            "FechaCierre": "2024-04-15T15:00:00",
+        }
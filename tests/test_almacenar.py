@@ -0,0 +1,166 @@
+import unittest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.bd.database import Base
+from src.bd.models import Licitacion, LicitacionDetalle, LicitacionItem, ResumenEtapa
+from src.repositories.licitaciones_repository import RepositorioLicitaciones
+from src.repositories.cache_paginas import CachePaginas
+from src.repositories.resumen_etapas import recalcular_resumen, ajustar_resumen_cambios
+from src.services.almacenar import AlmacenadorLicitaciones
+from src.services.registro_licitacion import RegistroLicitacion
+from src.config.constantes import EtapaLicitacion
+
+class TestAlmacenadorLicitaciones(unittest.TestCase):
+    """
+    Valida el upsert por lotes y la escritura condicional de los textos
+    extensos en la tabla 1:1 'licitacion_detalle'.
+    """
+
+    def setUp(self):
+        self.engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(self.engine)
+        self.TestingSessionLocal = sessionmaker(bind=self.engine)
+        self.almacenador = AlmacenadorLicitaciones(session_factory=self.TestingSessionLocal,
+                                                   cache_paginas=CachePaginas())
+
+    def _registro(self, codigo: str, **campos) -> RegistroLicitacion:
+        campos.setdefault("nombre", f"Licitación {codigo}")
+        campos.setdefault("codigo_estado", 5)
+        return RegistroLicitacion(codigo_externo=codigo, **campos)
+
+    def test_detalle_solo_con_ficha_o_justificacion(self):
+        """Las licitaciones descartadas por título sin justificación no ocupan fila de detalle."""
+        self.almacenador.guardar_lote_masivo([
+            self._registro("SIN-01"),
+            self._registro("JUS-01", puntaje=5, justificacion_puntaje="[TÍTULO] silla (+5)"),
+            self._registro("FIC-01", puntaje=20, tiene_detalle=True, descripcion="Compra de sillas",
+                           detalle_productos="- Silla (10 un)", etapa=EtapaLicitacion.CANDIDATA.value),
+        ], [], [])
+
+        with self.TestingSessionLocal() as sesion:
+            detalles = {d.licitacion.codigo_externo: d for d in sesion.query(LicitacionDetalle)}
+            self.assertEqual(set(detalles), {"JUS-01", "FIC-01"})
+            self.assertIsNone(detalles["JUS-01"].descripcion)
+            self.assertEqual(detalles["FIC-01"].detalle_productos, "- Silla (10 un)")
+
+    def test_actualizacion_sin_ficha_conserva_textos(self):
+        """Una reevaluación sin ficha completa no borra la descripción ni la justificación de la ficha."""
+        self.almacenador.guardar_lote_masivo([
+            self._registro("FIC-02", tiene_detalle=True, descripcion="Texto original",
+                           justificacion_puntaje="inicial"),
+        ], [], [])
+        self.almacenador.guardar_lote_masivo([
+            self._registro("FIC-02", justificacion_puntaje="reevaluada"),
+        ], [], [])
+
+        with self.TestingSessionLocal() as sesion:
+            licitacion = sesion.query(Licitacion).filter_by(codigo_externo="FIC-02").one()
+            self.assertEqual(licitacion.descripcion, "Texto original")
+            self.assertEqual(licitacion.justificacion_puntaje, "inicial")
+
+    def test_items_reemplazados_en_bloque(self):
+        """Cada ficha completa reemplaza sus ítems; una reevaluación sin ficha los conserva."""
+        def item(correlativo, codigo):
+            return {"correlativo": correlativo, "codigo_producto": codigo, "codigo_categoria": None,
+                    "nombre_producto": f"Producto {codigo}", "descripcion": None,
+                    "unidad_medida": "un", "cantidad": 1.0}
+
+        self.almacenador.guardar_lote_masivo([
+            self._registro("ITM-01", tiene_detalle=True, items=[item(1, "111"), item(2, "222")]),
+        ], [], [])
+        self.almacenador.guardar_lote_masivo([
+            self._registro("ITM-01", tiene_detalle=True, items=[item(1, "333")]),
+            self._registro("ITM-02", tiene_detalle=True, items=[item(1, "333")]),
+        ], [], [])
+        self.almacenador.guardar_lote_masivo([self._registro("ITM-01")], [], [])
+
+        with self.TestingSessionLocal() as sesion:
+            self.assertEqual(sesion.query(LicitacionItem).count(), 2)
+
+        repositorio = RepositorioLicitaciones(session_factory=self.TestingSessionLocal,
+                                              cache=self.almacenador.cache_paginas)
+        codigos = {l.codigo_externo for l in repositorio.obtener_licitaciones_por_producto("333")}
+        self.assertEqual(codigos, {"ITM-01", "ITM-02"})
+        self.assertEqual(repositorio.obtener_licitaciones_por_producto("111"), [])
+
+    def test_fila_defectuosa_aislada_por_savepoint(self):
+        """Una fila inválida se omite sin perder el resto de su bloque ni los bloques siguientes."""
+        lote = [self._registro(f"BLQ-{n:02d}") for n in range(7)]
+        lote[3].fecha_cierre = "no-es-fecha"
+
+        resultado = self.almacenador.guardar_lote_masivo(lote, [], [], tamanio_bloque=3)
+
+        self.assertEqual(resultado["fallidas"], ["BLQ-03"])
+        self.assertEqual(resultado["guardadas"], 6)
+        self.assertEqual([bloque["registros"] for bloque in resultado["bloques"]], [3, 3, 1])
+        with self.TestingSessionLocal() as sesion:
+            codigos = {l.codigo_externo for l in sesion.query(Licitacion)}
+        self.assertEqual(codigos, {f"BLQ-{n:02d}" for n in range(7)} - {"BLQ-03"})
+
+    def test_resumen_ajustado_sin_recalculo(self):
+        """Inserciones, ascensos de etapa y filas rechazadas dejan el resumen igual a un recuento completo."""
+        def resumen() -> dict:
+            with self.TestingSessionLocal() as sesion:
+                return {(f.etapa, f.codigo_estado, f.tramo_puntaje): f.cantidad
+                        for f in sesion.query(ResumenEtapa)}
+
+        self.almacenador.guardar_lote_masivo([
+            self._registro("RES-01"),
+            self._registro("RES-02", puntaje=20, etapa=EtapaLicitacion.CANDIDATA.value),
+        ], [], [])
+        lote = [
+            self._registro("RES-01", puntaje=60, etapa=EtapaLicitacion.CANDIDATA.value),
+            self._registro("RES-03", codigo_estado="6"),
+            self._registro("RES-04", fecha_cierre="no-es-fecha"),
+        ]
+        self.almacenador.guardar_lote_masivo(lote, [], [], tamanio_bloque=3)
+        self.almacenador.guardar_licitacion_individual({
+            "CodigoExterno": "RES-02", "Nombre": "Reevaluada", "CodigoEstado": "5", "Fechas": {},
+            "_PuntajeCalculado": 150, "_EtapaAsignada": EtapaLicitacion.CANDIDATA.value,
+        })
+        incremental = resumen()
+
+        with self.TestingSessionLocal() as sesion:
+            recalcular_resumen(sesion)
+            sesion.commit()
+        self.assertEqual(incremental, resumen())
+        self.assertEqual(sum(incremental.values()), 3)
+
+    def test_registro_sin_ficha_conserva_evaluacion_guardada(self):
+        """Un registro evaluado solo por título actualiza el listado pero no el puntaje de una ficha guardada."""
+        self.almacenador.guardar_lote_masivo([
+            self._registro("FIC-02", puntaje=60, tiene_detalle=True, descripcion="Compra de sillas",
+                           justificacion_puntaje="[DETALLE] silla (+50)", etapa=EtapaLicitacion.IGNORADA.value),
+        ], [], [])
+        self.almacenador.guardar_lote_masivo([
+            self._registro("FIC-02", puntaje=10, codigo_estado=6, justificacion_puntaje="[TÍTULO] silla (+10)",
+                           etapa=EtapaLicitacion.CANDIDATA.value),
+        ], [], [])
+
+        with self.TestingSessionLocal() as sesion:
+            licitacion = sesion.query(Licitacion).filter_by(codigo_externo="FIC-02").one()
+            self.assertEqual(licitacion.codigo_estado, 6)
+            self.assertEqual(licitacion.puntaje, 60)
+            self.assertTrue(licitacion.tiene_detalle)
+            self.assertEqual(licitacion.etapa, EtapaLicitacion.IGNORADA.value)
+            self.assertEqual(licitacion.detalle.justificacion_puntaje, "[DETALLE] silla (+50)")
+            self.assertEqual(licitacion.detalle.descripcion, "Compra de sillas")
+
+    def test_ajustes_repetidos_sin_filas_duplicadas(self):
+        """Varios ajustes de la misma clave en una transacción sin autoflush acumulan en una sola fila."""
+        fabrica = sessionmaker(bind=self.engine, autoflush=False)
+        fila = (EtapaLicitacion.CANDIDATA.value, 5, 20)
+        with fabrica() as sesion:
+            ajustar_resumen_cambios(sesion, [], [fila])
+            ajustar_resumen_cambios(sesion, [], [fila, fila])
+            sesion.commit()
+
+        with self.TestingSessionLocal() as sesion:
+            filas = sesion.query(ResumenEtapa).all()
+        self.assertEqual([f.cantidad for f in filas], [3])
+
+    def tearDown(self):
+        Base.metadata.drop_all(self.engine)
+
+if __name__ == "__main__":
+    unittest.main()
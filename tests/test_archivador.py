@@ -0,0 +1,92 @@
+import unittest
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.bd.database import Base
+from src.bd.models import Licitacion, LicitacionArchivada, LicitacionDetalle, EstadoLicitacion
+from src.repositories.cache_paginas import CachePaginas
+from src.repositories.licitaciones_repository import RepositorioLicitaciones
+from src.services.archivador import ArchivadorLicitaciones
+from src.config.constantes import EtapaLicitacion, ESTADO_LICITACION_ACTIVA
+
+ESTADO_ADJUDICADA = 8
+
+class TestArchivadorLicitaciones(unittest.TestCase):
+    """
+    Valida el traslado de licitaciones no vigentes hacia 'licitaciones_archivo'
+    y que sigan siendo accesibles desde el repositorio.
+    """
+
+    def setUp(self):
+        self.engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(self.engine)
+        self.TestingSessionLocal = sessionmaker(bind=self.engine)
+        self.cache = CachePaginas()
+        self.archivador = ArchivadorLicitaciones(session_factory=self.TestingSessionLocal, cache_paginas=self.cache)
+
+        antigua = datetime.now() - timedelta(days=200)
+        reciente = datetime.now() - timedelta(days=5)
+
+        with self.TestingSessionLocal() as sesion:
+            sesion.add_all([
+                EstadoLicitacion(codigo=ESTADO_LICITACION_ACTIVA, descripcion="Publicada"),
+                EstadoLicitacion(codigo=ESTADO_ADJUDICADA, descripcion="Adjudicada"),
+                Licitacion(codigo_externo="ARC-01", nombre="Adjudicada antigua", fecha_cierre=antigua,
+                           codigo_estado=ESTADO_ADJUDICADA, etapa=EtapaLicitacion.IGNORADA.value,
+                           descripcion="Servicio de aseo"),
+                Licitacion(codigo_externo="ARC-02", nombre="Adjudicada antigua sin etapa", fecha_cierre=antigua,
+                           codigo_estado=ESTADO_ADJUDICADA, etapa=None),
+                Licitacion(codigo_externo="HOT-01", nombre="Adjudicada reciente", fecha_cierre=reciente,
+                           codigo_estado=ESTADO_ADJUDICADA, etapa=EtapaLicitacion.IGNORADA.value),
+                Licitacion(codigo_externo="HOT-02", nombre="Publicada antigua", fecha_cierre=antigua,
+                           codigo_estado=ESTADO_LICITACION_ACTIVA, etapa=EtapaLicitacion.CANDIDATA.value),
+                Licitacion(codigo_externo="HOT-03", nombre="Ofertada antigua", fecha_cierre=antigua,
+                           codigo_estado=ESTADO_ADJUDICADA, etapa=EtapaLicitacion.OFERTADA.value),
+            ])
+            sesion.commit()
+
+    def test_archiva_solo_no_vigentes_antiguas(self):
+        """Se archivan las no vigentes con cierre antiguo; las etapas gestionadas se conservan."""
+        archivadas = self.archivador.archivar(dias_antiguedad=90, tamanio_lote=1)
+
+        self.assertEqual(archivadas, 2)
+        with self.TestingSessionLocal() as sesion:
+            en_tabla_principal = {l.codigo_externo for l in sesion.query(Licitacion)}
+            en_archivo = {l.codigo_externo for l in sesion.query(LicitacionArchivada)}
+
+        self.assertEqual(en_tabla_principal, {"HOT-01", "HOT-02", "HOT-03"})
+        self.assertEqual(en_archivo, {"ARC-01", "ARC-02"})
+        with self.TestingSessionLocal() as sesion:
+            self.assertEqual(sesion.query(LicitacionDetalle).count(), 0)
+
+    def test_archivada_accesible_por_codigo(self):
+        """El repositorio recurre al archivo cuando el código no está en la tabla principal."""
+        self.archivador.archivar(dias_antiguedad=90)
+        repositorio = RepositorioLicitaciones(session_factory=self.TestingSessionLocal, cache=self.cache)
+
+        licitacion = repositorio.obtener_licitacion_por_codigo("ARC-01")
+
+        self.assertIsInstance(licitacion, LicitacionArchivada)
+        self.assertEqual(licitacion.estado.descripcion, "Adjudicada")
+        self.assertIsNotNone(licitacion.fecha_archivado)
+        self.assertEqual(licitacion.descripcion, "Servicio de aseo")
+
+    def test_reingreso_reemplaza_copia_archivada(self):
+        """Si una licitación archivada reaparece y vuelve a vencer, el archivo conserva una sola copia."""
+        self.archivador.archivar(dias_antiguedad=90)
+        with self.TestingSessionLocal() as sesion:
+            sesion.add(Licitacion(codigo_externo="ARC-01", nombre="Adjudicada reingresada",
+                                  fecha_cierre=datetime.now() - timedelta(days=200),
+                                  codigo_estado=ESTADO_ADJUDICADA, etapa=EtapaLicitacion.IGNORADA.value))
+            sesion.commit()
+
+        self.assertEqual(self.archivador.archivar(dias_antiguedad=90), 1)
+        with self.TestingSessionLocal() as sesion:
+            copias = sesion.query(LicitacionArchivada).filter_by(codigo_externo="ARC-01").all()
+        self.assertEqual([c.nombre for c in copias], ["Adjudicada reingresada"])
+
+    def tearDown(self):
+        Base.metadata.drop_all(self.engine)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.bd.database import Base
+from src.bd.models import PayloadApi
+from src.repositories.archivo_payloads import ArchivoPayloads
+from src.scraper.recolector_archivo import RecolectorArchivo
+
+class TestArchivoPayloads(unittest.TestCase):
+    """
+    Valida el archivo comprimido de respuestas crudas de la API y su lectura
+    desde el recolector de reproceso.
+    """
+
+    def setUp(self):
+        self.engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(self.engine)
+        self.TestingSessionLocal = sessionmaker(bind=self.engine)
+        self.archivo = ArchivoPayloads(session_factory=self.TestingSessionLocal)
+
+    def test_ida_y_vuelta_comprimida(self):
+        """El JSON archivado se recupera idéntico y ocupa menos que el original."""
+        listado = [{"CodigoExterno": f"100-{i}-LE24", "Nombre": "Servicio de aseo y mantención"}
+                   for i in range(50)]
+        self.archivo.guardar_listado("01032024", listado)
+
+        self.assertEqual(self.archivo.obtener_listado("01032024"), listado)
+        with self.TestingSessionLocal() as sesion:
+            payload = sesion.query(PayloadApi).one()
+            self.assertLess(len(payload.contenido), payload.tamanio_original)
+
+    def test_nueva_descarga_reemplaza_la_anterior(self):
+        """Se conserva una sola versión por ficha: la última descargada."""
+        self.archivo.guardar_detalle("100-1-LE24", {"Nombre": "v1"})
+        self.archivo.guardar_detalle("100-1-LE24", {"Nombre": "v2"})
+
+        self.assertEqual(self.archivo.obtener_detalle("100-1-LE24"), {"Nombre": "v2"})
+        with self.TestingSessionLocal() as sesion:
+            self.assertEqual(sesion.query(PayloadApi).count(), 1)
+
+    def test_vigencia_del_listado_archivado(self):
+        """Solo se reutilizan listados de días cerrados y capturados hace menos de la vigencia."""
+        hoy = datetime.now().strftime("%d%m%Y")
+        self.archivo.guardar_listado("01032024", [{"CodigoExterno": "100-1-LE24"}], etag='"v1"')
+        self.archivo.guardar_listado(hoy, [{"CodigoExterno": "100-2-LE24"}])
+
+        self.assertEqual(self.archivo.obtener_listado_vigente("01032024", 24), [{"CodigoExterno": "100-1-LE24"}])
+        self.assertEqual(self.archivo.etag_listado("01032024"), '"v1"')
+        self.assertIsNone(self.archivo.obtener_listado_vigente(hoy, 24))
+        self.assertIsNone(self.archivo.obtener_listado_vigente("01032024", 0))
+        self.assertIsNone(self.archivo.obtener_listado_vigente("02032024", 24))
+
+        with self.TestingSessionLocal() as sesion:
+            payload = sesion.query(PayloadApi).filter_by(clave="01032024").one()
+            payload.fecha_captura = datetime.now() - timedelta(hours=30)
+            sesion.commit()
+        self.assertIsNone(self.archivo.obtener_listado_vigente("01032024", 24))
+
+        self.archivo.renovar_listado("01032024")
+        self.assertIsNotNone(self.archivo.obtener_listado_vigente("01032024", 24))
+
+    def test_recolector_archivo_sin_red(self):
+        """El recolector de reproceso responde con la interfaz del recolector de la API."""
+        self.archivo.guardar_detalle("100-1-LE24", {"Nombre": "Ficha"})
+        recolector = RecolectorArchivo(self.archivo)
+
+        self.assertEqual(recolector.obtener_detalle_licitacion("100-1-LE24"),
+                         {'datos': {"Nombre": "Ficha"}, 'estado': 'exitoso'})
+        self.assertEqual(recolector.obtener_detalle_licitacion("999-9-LE24")['estado'], 'no_archivado')
+        self.assertEqual(recolector.obtener_licitaciones_diarias("02032024"), [])
+
+    def tearDown(self):
+        Base.metadata.drop_all(self.engine)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import os
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from src.bd.database import Base
+from src.bd.models import Licitacion, PalabraClave
+from src.repositories.archivo_payloads import ArchivoPayloads
+from src.repositories.bitacora_ingesta import BitacoraIngesta
+from src.repositories.cache_paginas import CachePaginas
+from src.scraper.recolector import RecolectorMercadoPublico
+from src.services.almacenar import AlmacenadorLicitaciones
+from src.services.calculadora import CalculadoraPuntajes
+from src.services.orquestador import OrquestadorIngesta
+from tests.stub_mercado_publico import ServidorStubMercadoPublico
+
+FECHA = date(2024, 3, 1)
+
+
+class TestBitacoraIngesta(unittest.TestCase):
+    """
+    Valida la bitácora de ingesta y la reanudación de un rango interrumpido
+    sin repetir descargas ya realizadas.
+    """
+
+    def setUp(self):
+        # Conexión única compartida: las etapas del pipeline corren en hilos distintos
+        self.engine = create_engine("sqlite:///:memory:", poolclass=StaticPool,
+                                    connect_args={"check_same_thread": False})
+        Base.metadata.create_all(self.engine)
+        self.TestingSessionLocal = sessionmaker(bind=self.engine)
+        self.bitacora = BitacoraIngesta(session_factory=self.TestingSessionLocal)
+        self.directorio_metricas = tempfile.TemporaryDirectory()
+
+    def test_plan_prioriza_pendientes(self):
+        """Las fichas con fallo transitorio quedan pendientes aunque la licitación se haya guardado."""
+        self.bitacora.iniciar_dia(FECHA, ["A", "B", "C", "D"])
+        self.bitacora.marcar_ficha_descargada(FECHA, "C")
+        self.bitacora.marcar_persistidas(FECHA, {"A": "exitoso", "B": "pendiente_error_red"})
+        self.bitacora.completar_dia(FECHA)
+
+        plan = self.bitacora.plan_reanudacion(FECHA)
+
+        self.assertTrue(plan["conocido"])
+        self.assertFalse(plan["completo"])
+        self.assertEqual(plan["persistidas"], {"A"})
+        self.assertEqual(plan["pendientes"], {"B"})
+        self.assertEqual(plan["fichas_descargadas"], {"C"})
+
+    def test_reanudacion_no_repite_descargas(self):
+        """Una ejecución detenida a mitad del día se completa sin volver a pedir lo ya obtenido."""
+        with self.TestingSessionLocal() as sesion:
+            sesion.add(PalabraClave(palabra="silla", puntaje_titulo=10,
+                                    puntaje_descripcion=5, puntaje_productos=1))
+            sesion.commit()
+
+        with ServidorStubMercadoPublico(licitaciones_por_dia=20) as stub:
+            orquestador = self._orquestador(stub)
+
+            evaluaciones = iter(range(1000))
+            orquestador.procesar_rango_fechas(FECHA, FECHA, verificador_ejecucion=lambda: next(evaluaciones) < 9)
+            detalles_primera = stub.contadores["detalle"]
+            self.assertFalse(self.bitacora.plan_reanudacion(FECHA)["completo"])
+
+            estadisticas = orquestador.procesar_rango_fechas(FECHA, FECHA, reanudar=True)
+
+            # Listado archivado: no se vuelve a pedir; cada ficha candidata se pide una sola vez
+            self.assertEqual(stub.contadores["listado"], 1)
+            self.assertEqual(stub.contadores["detalle"], 10)
+            self.assertLess(estadisticas["licitaciones_basicas"], 20)
+            self.assertGreater(detalles_primera, 0)
+
+            orquestador.procesar_rango_fechas(FECHA, FECHA, reanudar=True)
+            self.assertEqual(stub.contadores["detalle"], 10)
+
+        self.assertTrue(self.bitacora.plan_reanudacion(FECHA)["completo"])
+        with self.TestingSessionLocal() as sesion:
+            self.assertEqual(sesion.query(Licitacion).count(), 20)
+
+    def _orquestador(self, stub: ServidorStubMercadoPublico) -> OrquestadorIngesta:
+        archivo = ArchivoPayloads(session_factory=self.TestingSessionLocal)
+        with patch.dict(os.environ, {"TICKET_MERCADO_PUBLICO": "TICKET-PRUEBA"}):
+            recolector = RecolectorMercadoPublico(archivo_payloads=archivo, url_base=stub.url)
+        recolector.min_pausa_entre_peticiones = 0.0
+
+        return OrquestadorIngesta(
+            recolector=recolector,
+            almacenador=AlmacenadorLicitaciones(session_factory=self.TestingSessionLocal,
+                                                cache_paginas=CachePaginas()),
+            calculadora=CalculadoraPuntajes(session_factory=self.TestingSessionLocal),
+            archivo_payloads=archivo,
+            bitacora=self.bitacora,
+            session_factory=self.TestingSessionLocal,
+            pausa_entre_dias=0,
+            archivo_metricas=Path(self.directorio_metricas.name) / "metricas_ingesta.jsonl",
+        )
+
+    def tearDown(self):
+        Base.metadata.drop_all(self.engine)
+        self.directorio_metricas.cleanup()
+
+if __name__ == "__main__":
+    unittest.main()
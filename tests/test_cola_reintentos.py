@@ -0,0 +1,114 @@
+import os
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.bd.database import Base
+from src.bd.models import Licitacion, PalabraClave, ReintentoDetalle
+from src.repositories.bitacora_ingesta import BitacoraIngesta
+from src.repositories.cache_paginas import CachePaginas
+from src.repositories.cola_reintentos import ColaReintentosDetalle
+from src.scraper.recolector import RecolectorMercadoPublico
+from src.services.almacenar import AlmacenadorLicitaciones
+from src.services.calculadora import CalculadoraPuntajes
+from src.services.orquestador import OrquestadorIngesta
+from tests.stub_mercado_publico import ServidorStubMercadoPublico
+
+FECHA = date(2024, 3, 1)
+CODIGOS = ["01032024-0-LE24", "01032024-2-LE24", "01032024-4-LE24"]
+
+
+class TestColaReintentosDetalle(unittest.TestCase):
+    """
+    Valida la cola persistente de fichas pendientes y su drenado por lotes,
+    con reprogramación exponencial y abandono tras el máximo de intentos.
+    """
+
+    def setUp(self):
+        self.engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(self.engine)
+        self.TestingSessionLocal = sessionmaker(bind=self.engine)
+        # Sin espera entre intentos: toda entrada queda vencida de inmediato
+        self.cola = ColaReintentosDetalle(session_factory=self.TestingSessionLocal,
+                                          max_intentos=2, minutos_base=0)
+        self.bitacora = BitacoraIngesta(session_factory=self.TestingSessionLocal)
+        self.directorio_metricas = tempfile.TemporaryDirectory()
+
+        with self.TestingSessionLocal() as sesion:
+            sesion.add(PalabraClave(palabra="silla", puntaje_titulo=10,
+                                    puntaje_descripcion=5, puntaje_productos=1))
+            sesion.commit()
+
+        self.bitacora.iniciar_dia(FECHA, CODIGOS)
+        self.cola.encolar(FECHA, {codigo: "pendiente_error_servidor" for codigo in CODIGOS})
+
+    def test_drenado_recupera_y_persiste_por_lotes(self):
+        """Las fichas obtenidas se guardan con su detalle, salen de la cola y la bitácora se actualiza."""
+        with ServidorStubMercadoPublico() as stub:
+            resultado = self._orquestador(stub).drenar_cola_reintentos(tamanio_lote=2)
+
+        self.assertEqual(resultado, {'recuperadas': 3, 'reprogramadas': 0, 'descartadas': 0})
+        self.assertEqual(self.cola.contar(), 0)
+        with self.TestingSessionLocal() as sesion:
+            licitaciones = sesion.query(Licitacion).all()
+            self.assertEqual({l.codigo_externo for l in licitaciones}, set(CODIGOS))
+            self.assertTrue(all(l.tiene_detalle for l in licitaciones))
+        self.assertTrue(self.bitacora.plan_reanudacion(FECHA)["persistidas"] >= set(CODIGOS))
+
+    def test_drenado_conserva_ficha_con_titulo_bajo_umbral(self):
+        """Una ficha recuperada se evalúa completa aunque su título ya no supere el umbral."""
+        with self.TestingSessionLocal() as sesion:
+            sesion.query(PalabraClave).delete()
+            sesion.commit()
+
+        with ServidorStubMercadoPublico() as stub:
+            resultado = self._orquestador(stub).drenar_cola_reintentos()
+
+        self.assertEqual(resultado['recuperadas'], 3)
+        with self.TestingSessionLocal() as sesion:
+            licitaciones = sesion.query(Licitacion).all()
+            self.assertEqual(len(licitaciones), 3)
+            self.assertTrue(all(l.tiene_detalle for l in licitaciones))
+
+    def test_fallos_reprogramados_y_abandonados(self):
+        """Cada fallo suma un intento; al alcanzar el máximo la ficha sale de la cola."""
+        with ServidorStubMercadoPublico(tasa_error=1.0) as stub:
+            orquestador = self._orquestador(stub)
+            primero = orquestador.drenar_cola_reintentos()
+            with self.TestingSessionLocal() as sesion:
+                self.assertEqual({r.intentos for r in sesion.query(ReintentoDetalle)}, {1})
+
+            orquestador.drenar_cola_reintentos()
+
+        self.assertEqual(primero['reprogramadas'], 3)
+        self.assertEqual(self.cola.contar(), 0)
+        with self.TestingSessionLocal() as sesion:
+            self.assertEqual(sesion.query(Licitacion).count(), 0)
+
+    def _orquestador(self, stub: ServidorStubMercadoPublico) -> OrquestadorIngesta:
+        with patch.dict(os.environ, {"TICKET_MERCADO_PUBLICO": "TICKET-PRUEBA"}):
+            recolector = RecolectorMercadoPublico(url_base=stub.url)
+        recolector.min_pausa_entre_peticiones = 0.0
+        recolector.max_intentos = 1
+
+        return OrquestadorIngesta(
+            recolector=recolector,
+            almacenador=AlmacenadorLicitaciones(session_factory=self.TestingSessionLocal,
+                                                cache_paginas=CachePaginas()),
+            calculadora=CalculadoraPuntajes(session_factory=self.TestingSessionLocal),
+            bitacora=self.bitacora,
+            cola_reintentos=self.cola,
+            session_factory=self.TestingSessionLocal,
+            pausa_entre_dias=0,
+            archivo_metricas=Path(self.directorio_metricas.name) / "metricas_ingesta.jsonl",
+        )
+
+    def tearDown(self):
+        Base.metadata.drop_all(self.engine)
+        self.directorio_metricas.cleanup()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from src.bd import database
+from src.bd.database import PoolConMetricas, obtener_estadisticas_pool
+
+class TestConfiguracionPool(unittest.TestCase):
+    """
+    Valida la traducción de la configuración del .env a opciones del motor
+    y la contabilidad de esperas del pool instrumentado.
+    """
+
+    def test_opciones_postgresql(self):
+        """En PostgreSQL se aplican pool, pre-ping, batch de executemany y timeout de sentencias."""
+        with patch.object(database, "DB_STATEMENT_TIMEOUT_MS", 15000):
+            opciones = database._construir_opciones_motor("postgresql+psycopg2://u:p@localhost/bd")
+
+        self.assertIs(opciones["poolclass"], PoolConMetricas)
+        self.assertEqual(opciones["executemany_mode"], "values_plus_batch")
+        self.assertIn("pool_pre_ping", opciones)
+        self.assertEqual(opciones["connect_args"], {"options": "-c statement_timeout=15000"})
+
+    def test_opciones_sqlite_por_defecto(self):
+        """Otros motores conservan la configuración por defecto de SQLAlchemy."""
+        opciones = database._construir_opciones_motor("sqlite:///:memory:")
+        self.assertEqual(opciones, {"echo": False})
+
+    def test_registro_de_esperas(self):
+        """Un hilo que encuentra el pool agotado queda registrado como espera."""
+        with tempfile.TemporaryDirectory() as directorio:
+            motor = create_engine(
+                f"sqlite:///{os.path.join(directorio, 'pool.db')}",
+                poolclass=PoolConMetricas, pool_size=1, max_overflow=0, pool_timeout=5
+            )
+            conexion_ocupada = motor.connect()
+
+            def hilo_en_espera():
+                with motor.connect():
+                    pass
+
+            hilo = threading.Thread(target=hilo_en_espera)
+            hilo.start()
+            time.sleep(0.2)
+            conexion_ocupada.close()
+            hilo.join()
+
+            estadisticas = obtener_estadisticas_pool(motor)
+            self.assertEqual(estadisticas["esperas"], 1)
+            self.assertGreater(estadisticas["segundos_espera"], 0)
+            self.assertEqual(estadisticas["en_uso"], 0)
+            motor.dispose()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import csv
+import io
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from sqlalchemy import create_engine, select, column, DateTime
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import sessionmaker
+from src.bd.database import Base
+from src.bd.models import Licitacion
+from src.services.exportador import ServicioExportador
+from src.config.constantes import EtapaLicitacion
+
+class TestServicioExportador(unittest.TestCase):
+    """
+    Pruebas de la exportación CSV: vía rápida COPY en PostgreSQL
+    y vía pandas como respaldo para el resto de los motores.
+    """
+
+    def setUp(self):
+        self.engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(self.engine)
+        self.TestingSessionLocal = sessionmaker(bind=self.engine)
+        self.servicio = ServicioExportador(session_factory=self.TestingSessionLocal)
+        self.directorio = tempfile.TemporaryDirectory()
+
+        with self.TestingSessionLocal() as sesion:
+            sesion.add(Licitacion(codigo_externo="EXP-01", nombre="Compra de sillas",
+                                  puntaje=10, etapa=EtapaLicitacion.CANDIDATA.value))
+            sesion.commit()
+
+    def test_csv_respaldo_pandas_en_sqlite(self):
+        """En motores sin COPY el CSV se genera con pandas, separador ';' y BOM."""
+        opciones = {'candidatas': True, 'csv': True, 'xlsx': False}
+        exito, mensaje = self.servicio.generar_reporte(opciones, self.directorio.name)
+        self.assertTrue(exito, mensaje)
+
+        carpeta = os.path.join(self.directorio.name, os.listdir(self.directorio.name)[0])
+        with open(os.path.join(carpeta, "Candidatas.csv"), "rb") as archivo:
+            contenido = archivo.read()
+
+        self.assertTrue(contenido.startswith(b"\xef\xbb\xbf"), "El CSV debe iniciar con BOM UTF-8")
+        self.assertIn(b";", contenido)
+        self.assertIn(b"EXP-01", contenido)
+
+    def test_csv_via_copy_en_postgresql(self):
+        """Con PostgreSQL/psycopg2 el CSV se delega completamente a COPY ... TO STDOUT."""
+        cursor = MagicMock()
+        sesion = MagicMock()
+        sesion.get_bind.return_value.dialect.name = "postgresql"
+        sesion.get_bind.return_value.dialect.driver = "psycopg2"
+        sesion.connection.return_value.connection.dbapi_connection.cursor.return_value.__enter__.return_value = cursor
+
+        sesion.get_bind.return_value.dialect = postgresql.psycopg2.dialect()
+
+        with self.TestingSessionLocal() as sesion_consulta:
+            consulta = self.servicio._consulta_licitaciones(sesion_consulta)
+        self.servicio._procesar_exportacion_masiva(
+            sesion, "Full_db", consulta, self.directorio.name, {'csv': True, 'xlsx': False}
+        )
+
+        instruccion = cursor.copy_expert.call_args[0][0]
+        self.assertTrue(instruccion.startswith("COPY (SELECT licitaciones.id"))
+        self.assertIn(") TO STDOUT", instruccion)
+        self.assertIn("DELIMITER ';'", instruccion)
+        self.assertTrue(os.path.exists(os.path.join(self.directorio.name, "Full_db.csv")))
+
+    def test_copy_y_pandas_mismo_formato(self):
+        """
+        La SELECT que recibe COPY produce las mismas cabeceras y el mismo formato de
+        booleanos y fechas que el CSV de pandas (True/False, fechas sin zona horaria).
+        """
+        with self.TestingSessionLocal() as sesion:
+            sesion.add_all([
+                Licitacion(codigo_externo="EXP-02", nombre="Compra de mesas", puntaje=20,
+                           etapa=EtapaLicitacion.CANDIDATA.value, tiene_detalle=True,
+                           fecha_cierre=datetime(2024, 3, 1, 15, 30)),
+                Licitacion(codigo_externo="EXP-03", nombre="Compra de estantes", puntaje=30,
+                           etapa=EtapaLicitacion.CANDIDATA.value, tiene_detalle=False,
+                           fecha_cierre=datetime(2024, 3, 2, 9, 0)),
+            ])
+            sesion.commit()
+
+        opciones = {'candidatas': True, 'csv': True, 'xlsx': False}
+        exito, mensaje = self.servicio.generar_reporte(opciones, self.directorio.name)
+        self.assertTrue(exito, mensaje)
+        carpeta = os.path.join(self.directorio.name, os.listdir(self.directorio.name)[0])
+        with open(os.path.join(carpeta, "Candidatas.csv"), encoding="utf-8-sig", newline="") as archivo:
+            filas_pandas = list(csv.reader(archivo, delimiter=";"))
+
+        # COPY escribe el texto de cada valor; aquí se ejecuta la misma SELECT y se serializa igual
+        with self.TestingSessionLocal() as sesion:
+            consulta = self.servicio._consulta_licitaciones(sesion)\
+                .filter(Licitacion.etapa == EtapaLicitacion.CANDIDATA.value)
+            resultado = sesion.execute(self.servicio._consulta_copy(consulta))
+            salida = io.StringIO()
+            escritor = csv.writer(salida, delimiter=";")
+            escritor.writerow(resultado.keys())
+            escritor.writerows(["" if valor is None else valor for valor in fila] for fila in resultado)
+        filas_copy = list(csv.reader(io.StringIO(salida.getvalue()), delimiter=";"))
+
+        self.assertEqual(filas_copy[0], filas_pandas[0])
+        for nombre in ("tiene_detalle", "fecha_cierre"):
+            indice = filas_pandas[0].index(nombre)
+            self.assertEqual([fila[indice] for fila in filas_copy[1:]],
+                             [fila[indice] for fila in filas_pandas[1:]])
+        indice = filas_pandas[0].index("tiene_detalle")
+        self.assertEqual({fila[indice] for fila in filas_copy[1:]}, {"True", "False"})
+
+    def test_copy_fechas_con_zona_sin_zona(self):
+        """Las fechas con zona horaria se exportan en UTC sin zona, como tz_localize(None)."""
+        consulta = SimpleNamespace(statement=select(column("creado", DateTime(timezone=True))))
+        sql = str(self.servicio._consulta_copy(consulta).compile(
+            dialect=postgresql.psycopg2.dialect(), compile_kwargs={"literal_binds": True}))
+        self.assertIn("creado AT TIME ZONE 'UTC' AS creado", sql)
+
+    def tearDown(self):
+        self.directorio.cleanup()
+        Base.metadata.drop_all(self.engine)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import os
+import time
+import unittest
+from datetime import datetime, timezone
+from src.utils import fechas
+from src.utils.fechas import parsear_fecha_iso, extraer_fechas_api, extraer_fechas_lote
+
+# Tamaño del micro-benchmark; para medir de verdad: BENCHMARK_LICITACIONES_DIA=20000
+LICITACIONES_POR_DIA = int(os.getenv("BENCHMARK_LICITACIONES_DIA", "2000"))
+
+
+def _parsear_por_llamada(datos: dict) -> dict:
+    """Conversión anterior (una llamada a fromisoformat por campo), como referencia."""
+    objeto_fechas = datos.get("Fechas", {})
+
+    def _convertir(texto_fecha):
+        if not texto_fecha:
+            return None
+        try:
+            return datetime.fromisoformat(texto_fecha.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+
+    return {
+        "cierre": _convertir(datos.get("FechaCierre") or objeto_fechas.get("FechaCierre")),
+        "inicio": _convertir(objeto_fechas.get("FechaInicio")),
+        "publicacion": _convertir(objeto_fechas.get("FechaPublicacion")),
+        "adjudicacion": (
+            _convertir(objeto_fechas.get("FechaAdjudicacion"))
+            or _convertir(objeto_fechas.get("FechaEstimadaAdjudicacion"))
+        ),
+    }
+
+
+def _dia_sintetico(cantidad: int) -> list:
+    """Un día de licitaciones con las repeticiones típicas: pocas horas de cierre y publicación."""
+    return [
+        {
+            "FechaCierre": f"2024-04-{10 + indice % 5:02d}T15:00:00",
+            "Fechas": {
+                "FechaInicio": f"2024-03-01T{8 + indice % 10:02d}:00:00",
+                "FechaPublicacion": f"2024-03-01T{8 + indice % 10:02d}:00:00Z",
+                "FechaAdjudicacion": None,
+                "FechaEstimadaAdjudicacion": f"2024-05-{1 + indice % 28:02d}T18:00:00",
+            },
+        }
+        for indice in range(cantidad)
+    ]
+
+
+class TestFechas(unittest.TestCase):
+    """
+    Valida la conversión compartida de fechas de la API y compara su versión por
+    lote con la conversión campo a campo que usaban transformador y almacenador.
+    """
+
+    def setUp(self):
+        fechas._convertir_iso.cache_clear()
+
+    def test_conversion_y_cache(self):
+        """Textos repetidos se convierten una sola vez; los inválidos y vacíos retornan None."""
+        self.assertEqual(parsear_fecha_iso("2024-03-20T15:00:00Z"),
+                         datetime(2024, 3, 20, 15, 0, tzinfo=timezone.utc))
+        parsear_fecha_iso("2024-03-20T15:00:00Z")
+        self.assertEqual(fechas._convertir_iso.cache_info().hits, 1)
+
+        self.assertIsNone(parsear_fecha_iso("20/03/2024"))
+        self.assertIsNone(parsear_fecha_iso(""))
+        self.assertIsNone(parsear_fecha_iso(None))
+
+    def test_lote_equivale_a_conversion_individual(self):
+        """La versión por lote entrega exactamente lo mismo que la conversión campo a campo."""
+        dia = _dia_sintetico(50) + [{"Fechas": None}, {"FechaCierre": "sin-fecha"}]
+
+        esperado = [_parsear_por_llamada(datos) for datos in dia if datos.get("Fechas") is not None]
+        obtenido = [fila for datos, fila in zip(dia, extraer_fechas_lote(dia)) if datos.get("Fechas") is not None]
+
+        self.assertEqual(obtenido, esperado)
+        self.assertEqual(extraer_fechas_lote(dia), [extraer_fechas_api(datos) for datos in dia])
+
+    def test_micro_benchmark(self):
+        """Compara la conversión por llamada con la cacheada y la por lote sobre un día sintético."""
+        dia = _dia_sintetico(LICITACIONES_POR_DIA)
+
+        def cronometrar(funcion) -> float:
+            # El mejor de varios intentos atenúa el ruido de tiempos de pocos milisegundos
+            tiempos = []
+            for _ in range(3):
+                inicio = time.perf_counter()
+                funcion()
+                tiempos.append(time.perf_counter() - inicio)
+            return min(tiempos)
+
+        por_llamada = cronometrar(lambda: [_parsear_por_llamada(datos) for datos in dia])
+        cacheada = cronometrar(lambda: [extraer_fechas_api(datos) for datos in dia])
+        por_lote = cronometrar(lambda: extraer_fechas_lote(dia))
+
+        # Margen holgado: solo detecta que las vías optimizadas pasen a ser claramente más lentas
+        self.assertLess(cacheada, por_llamada * 1.5)
+        self.assertLess(por_lote, por_llamada * 1.5)
+        self.assertEqual(extraer_fechas_lote(dia), [_parsear_por_llamada(datos) for datos in dia])
+
+if __name__ == "__main__":
+    unittest.main()
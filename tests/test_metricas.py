@@ -0,0 +1,40 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from src.utils.metricas import MedidorEtapas, escribir_metricas, formatear_resumen
+
+class TestMedidorEtapas(unittest.TestCase):
+    """Valida los percentiles por etapa y el resumen parcial desde una marca."""
+
+    def test_percentiles_y_marca(self):
+        medidor = MedidorEtapas()
+        for milisegundos in range(1, 101):
+            medidor.registrar("detalle_api", milisegundos / 1000)
+        medidor.contar("detalle_exitoso", 100)
+
+        marca = medidor.marca()
+        medidor.registrar("detalle_api", 2.0)
+        medidor.contar("detalle_exitoso")
+
+        total = medidor.resumen()["etapas"]["detalle_api"]
+        self.assertEqual(total["n"], 101)
+        self.assertEqual(total["max_ms"], 2000.0)
+        self.assertAlmostEqual(total["p50_ms"], 51.0)
+
+        parcial = medidor.resumen(desde=marca)
+        self.assertEqual(parcial["etapas"]["detalle_api"]["n"], 1)
+        self.assertEqual(parcial["contadores"], {"detalle_exitoso": 1})
+        self.assertEqual(len(formatear_resumen(parcial)), 2)
+
+    def test_escritura_jsonl(self):
+        with tempfile.TemporaryDirectory() as directorio:
+            archivo = Path(directorio) / "metricas_ingesta.jsonl"
+            escribir_metricas({"tipo": "dia", "licitaciones": 3}, archivo)
+            escribir_metricas({"tipo": "ejecucion"}, archivo)
+
+            lineas = archivo.read_text(encoding="utf-8").splitlines()
+        self.assertEqual([json.loads(linea)["tipo"] for linea in lineas], ["dia", "ejecucion"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,9 @@
+import json
+import time
 import unittest
 from unittest.mock import patch, MagicMock
 import requests
-from src.scraper.recolector import RecolectorMercadoPublico
+from src.scraper.recolector import RecolectorMercadoPublico, LimitadorTasa
 
 class TestRecolectorMercadoPublico(unittest.TestCase):
     """
@@ -24,10 +26,10 @@ class TestRecolectorMercadoPublico(unittest.TestCase):
         # Configuramos el comportamiento del Mock
         mock_respuesta = MagicMock()
         mock_respuesta.status_code = 200
-        mock_respuesta.json.return_value = {
+        mock_respuesta.content = json.dumps({
             "Cantidad": 2,
             "Listado": [{"CodigoExterno": "123-1-L124"}, {"CodigoExterno": "456-2-L224"}]
-        }
+        }).encode("utf-8")
         mock_get.return_value = mock_respuesta
 
         resultados = self.recolector.obtener_licitaciones_diarias("20032024")
@@ -75,5 +77,65 @@ class TestRecolectorMercadoPublico(unittest.TestCase):
 
         self.assertEqual(resultado['estado'], 'error_red')
 
+    def _recolector_un_ticket(self) -> RecolectorMercadoPublico:
+        """Recolector con un limitador propio, sin estado compartido con otras pruebas."""
+        recolector = RecolectorMercadoPublico(tickets=["TICKET-UNICO"], limitador=LimitadorTasa())
+        recolector.min_pausa_entre_peticiones = 0.0
+        recolector.pausa_limitacion = 0.0
+        return recolector
+
+    @staticmethod
+    def _respuesta(codigo: int, cuerpo: dict = None) -> MagicMock:
+        respuesta = MagicMock()
+        respuesta.status_code = codigo
+        respuesta.headers = {}
+        respuesta.content = json.dumps(cuerpo or {}).encode("utf-8")
+        return respuesta
+
+    @patch('src.scraper.recolector.requests.get')
+    def test_429_aislado_no_suspende_el_ticket(self, mock_get):
+        """Un 429 sin Retry-After es limitación transitoria: se reintenta tras una pausa breve."""
+        recolector = self._recolector_un_ticket()
+        mock_get.side_effect = [self._respuesta(429),
+                                self._respuesta(200, {"Listado": [{"CodigoExterno": "1-1-L124"}]})]
+
+        resultado = recolector.obtener_detalle_licitacion("1-1-L124")
+
+        self.assertEqual(resultado['estado'], 'exitoso')
+        limitador = recolector.pool_tickets.limitadores["TICKET-UNICO"]
+        self.assertFalse(limitador.suspendido())
+        self.assertEqual(limitador.suspensiones, 0)
+
+    @patch('src.scraper.recolector.requests.get')
+    def test_tickets_suspendidos_no_esperan(self, mock_get):
+        """Con 429 repetidos el ticket se suspende y las fichas quedan pendientes sin dormir."""
+        recolector = self._recolector_un_ticket()
+        mock_get.return_value = self._respuesta(429)
+
+        inicio = time.perf_counter()
+        primera = recolector.obtener_detalle_licitacion("1-1-L124")
+        segunda = recolector.obtener_detalle_licitacion("2-2-L124")
+
+        self.assertLess(time.perf_counter() - inicio, 1.0)
+        self.assertEqual(primera['estado'], 'cuota_agotada')
+        self.assertEqual(segunda['estado'], 'cuota_agotada')
+        # La segunda ficha ni siquiera llega a pedirse: el único ticket está suspendido
+        self.assertEqual(mock_get.call_count, 2)
+
+    @patch('src.scraper.recolector.requests.get')
+    def test_espera_atiende_la_detencion(self, mock_get):
+        """Una espera larga por límite de tasa se abandona en cuanto se detiene la ejecución."""
+        recolector = self._recolector_un_ticket()
+        recolector.pool_tickets.limitadores["TICKET-UNICO"].pausar(60.0)
+        limite = time.perf_counter() + 0.3
+        recolector.verificador_ejecucion = lambda: time.perf_counter() < limite
+
+        inicio = time.perf_counter()
+        resultado = recolector.obtener_detalle_licitacion("1-1-L124")
+
+        self.assertLess(time.perf_counter() - inicio, 2.0)
+        self.assertEqual(resultado['estado'], 'interrumpido')
+        mock_get.assert_not_called()
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,335 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+import unittest
+from pathlib import Path
+from datetime import date, timedelta
+from unittest.mock import patch
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from src.bd.database import Base
+from src.bd.models import BitacoraDiaIngesta, Licitacion, LicitacionItem, PalabraClave, PayloadApi, ReintentoDetalle
+from src.config.constantes import DIA_BITACORA_COMPLETADO, TIPO_PAYLOAD_DETALLE
+from src.repositories.archivo_payloads import ArchivoPayloads
+from src.repositories.cache_paginas import CachePaginas
+from src.scraper.recolector import RecolectorMercadoPublico
+from src.services.almacenar import AlmacenadorLicitaciones
+from src.services.calculadora import CalculadoraPuntajes
+from src.services.orquestador import OrquestadorIngesta
+from src.utils.metricas import MedidorEtapas, escribir_metricas
+from tests.stub_mercado_publico import ServidorStubMercadoPublico
+
+# Tamaño del escenario. Los valores por defecto mantienen la suite rápida;
+# para medir de verdad: BENCHMARK_DIAS=5 BENCHMARK_LICITACIONES_DIA=2000 BENCHMARK_LATENCIA_MS=20
+DIAS = int(os.getenv("BENCHMARK_DIAS", "2"))
+LICITACIONES_POR_DIA = int(os.getenv("BENCHMARK_LICITACIONES_DIA", "40"))
+LATENCIA_S = int(os.getenv("BENCHMARK_LATENCIA_MS", "0")) / 1000
+# Archivo JSONL opcional donde se acumula el reporte de cada medición: BENCHMARK_REPORTE=benchmark.jsonl
+ARCHIVO_REPORTE = os.getenv("BENCHMARK_REPORTE")
+
+
+class TestRendimientoIngesta(unittest.TestCase):
+    """
+    Banco de pruebas de la ingesta completa: OrquestadorIngesta.procesar_rango_fechas
+    contra un servidor local que imita la API y una base de datos desechable.
+
+    Reporta licitaciones/s, peticiones a la API, sentencias SQL y memoria máxima
+    para detectar regresiones de rendimiento antes de desplegar.
+    """
+
+    def setUp(self):
+        descriptor, self.ruta_bd = tempfile.mkstemp(suffix=".db")
+        os.close(descriptor)
+        self.directorio_metricas = tempfile.TemporaryDirectory()
+        self.engine = create_engine(f"sqlite:///{self.ruta_bd}")
+        # pysqlite difiere el BEGIN hasta el primer DML, lo que rompe los SAVEPOINT de la
+        # escritura por bloques cuando otros hilos también escriben. Se toma el control de
+        # la transacción con BEGIN IMMEDIATE para que SQLite espere el cerrojo en vez de fallar.
+        event.listen(self.engine, "connect", self._transaccion_manual)
+        event.listen(self.engine, "begin", lambda conexion: conexion.exec_driver_sql("BEGIN IMMEDIATE"))
+        Base.metadata.create_all(self.engine)
+        self.TestingSessionLocal = sessionmaker(bind=self.engine)
+
+        self.sentencias_sql = 0
+        event.listen(self.engine, "before_cursor_execute", self._contar_sentencia)
+
+        with self.TestingSessionLocal() as sesion:
+            sesion.add(PalabraClave(palabra="silla", puntaje_titulo=10,
+                                    puntaje_descripcion=5, puntaje_productos=1))
+            sesion.commit()
+
+    @staticmethod
+    def _transaccion_manual(conexion_dbapi, _registro):
+        conexion_dbapi.isolation_level = None
+
+    def _contar_sentencia(self, *args):
+        self.sentencias_sql += 1
+
+    def _orquestador(self, stub: ServidorStubMercadoPublico, tickets: list = None,
+                     pausa_entre_peticiones: float = 0.0, **opciones) -> OrquestadorIngesta:
+        medidor = MedidorEtapas()
+        archivo_payloads = ArchivoPayloads(session_factory=self.TestingSessionLocal)
+        with patch.dict(os.environ, {"TICKET_MERCADO_PUBLICO": "TICKET-BENCHMARK"}):
+            recolector = RecolectorMercadoPublico(archivo_payloads=archivo_payloads, url_base=stub.url,
+                                                  medidor=medidor, tickets=tickets)
+        recolector.min_pausa_entre_peticiones = pausa_entre_peticiones
+        recolector.base_retraso = 0.01
+        recolector.pausa_limitacion = 0.05
+        recolector.suspension_cuota = 0.05
+
+        return OrquestadorIngesta(
+            recolector=recolector,
+            almacenador=AlmacenadorLicitaciones(session_factory=self.TestingSessionLocal,
+                                                cache_paginas=CachePaginas()),
+            calculadora=CalculadoraPuntajes(session_factory=self.TestingSessionLocal),
+            archivo_payloads=archivo_payloads,
+            session_factory=self.TestingSessionLocal,
+            pausa_entre_dias=0,
+            medidor=medidor,
+            archivo_metricas=Path(self.directorio_metricas.name) / "metricas_ingesta.jsonl",
+            **opciones,
+        )
+
+    def _medir(self, stub: ServidorStubMercadoPublico, **opciones) -> dict:
+        orquestador = self._orquestador(stub, **opciones)
+        inicio = date(2024, 3, 1)
+        self.sentencias_sql = 0
+
+        tracemalloc.start()
+        cronometro = time.perf_counter()
+        estadisticas = orquestador.procesar_rango_fechas(inicio, inicio + timedelta(days=DIAS - 1))
+        duracion = time.perf_counter() - cronometro
+        _, memoria_maxima = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        total = estadisticas["licitaciones_basicas"]
+        reporte = {
+            "licitaciones": total,
+            "segundos": round(duracion, 3),
+            "licitaciones_por_segundo": round(total / duracion, 1) if duracion else 0.0,
+            "peticiones_listado": stub.contadores["listado"],
+            "peticiones_detalle": stub.contadores["detalle"],
+            "respuestas_429": stub.contadores["error_429"],
+            "respuestas_500": stub.contadores["error_500"],
+            "sentencias_sql": self.sentencias_sql,
+            "memoria_maxima_mb": round(memoria_maxima / 1024 / 1024, 2),
+            **estadisticas,
+        }
+        if ARCHIVO_REPORTE:
+            escribir_metricas({"tipo": "benchmark", "prueba": self.id(), **reporte}, Path(ARCHIVO_REPORTE))
+        return reporte
+
+    def test_ingesta_sin_fallos(self):
+        """Toda licitación del listado se persiste y solo las de título positivo piden ficha."""
+        with ServidorStubMercadoPublico(licitaciones_por_dia=LICITACIONES_POR_DIA,
+                                        latencia_s=LATENCIA_S) as stub:
+            reporte = self._medir(stub)
+
+        total_esperado = DIAS * LICITACIONES_POR_DIA
+        self.assertEqual(reporte["licitaciones"], total_esperado)
+        self.assertEqual(reporte["peticiones_listado"], DIAS)
+        # Dos de cada cuatro títulos sintéticos mencionan 'silla'
+        self.assertEqual(reporte["peticiones_detalle"], total_esperado // 2)
+        self.assertEqual(reporte["detalles_exitosos"], total_esperado // 2)
+        self.assertEqual(reporte["tiempos"]["etapas"]["detalle_api"]["n"], total_esperado // 2)
+        # La escritura confirma por tamaño de lote o por tiempo, no por día
+        self.assertGreaterEqual(reporte["tiempos"]["etapas"]["persistencia"]["n"], 1)
+
+        with self.TestingSessionLocal() as sesion:
+            self.assertEqual(sesion.query(Licitacion).count(), total_esperado)
+            self.assertEqual(sesion.query(LicitacionItem).count(), 3 * (total_esperado // 2))
+
+    def test_escritura_por_lotes_acotados(self):
+        """El escritor confirma cada N registros y cierra cada día en la bitácora al quedar completo."""
+        with ServidorStubMercadoPublico(licitaciones_por_dia=LICITACIONES_POR_DIA,
+                                        latencia_s=LATENCIA_S) as stub:
+            reporte = self._medir(stub, tamanio_lote_escritura=10, hilos_descarga=3)
+
+        total_esperado = DIAS * LICITACIONES_POR_DIA
+        self.assertGreaterEqual(reporte["tiempos"]["etapas"]["persistencia"]["n"], total_esperado // 10)
+        with self.TestingSessionLocal() as sesion:
+            self.assertEqual(sesion.query(Licitacion).count(), total_esperado)
+            dias = sesion.query(BitacoraDiaIngesta).all()
+        self.assertEqual(len(dias), DIAS)
+        self.assertTrue(all(dia.estado == DIA_BITACORA_COMPLETADO for dia in dias))
+
+        # Cada día deja su desglose por etapa en el archivo de métricas
+        archivo = Path(self.directorio_metricas.name) / "metricas_ingesta.jsonl"
+        registros_dia = [json.loads(linea) for linea in archivo.read_text(encoding="utf-8").splitlines()
+                         if json.loads(linea)["tipo"] == "dia"]
+        self.assertEqual(len(registros_dia), DIAS)
+        self.assertTrue(all("persistencia" in registro["etapas"] for registro in registros_dia))
+
+    def test_reproceso_sin_ficha_archivada_conserva_evaluacion(self):
+        """Reprocesar una licitación cuya ficha no está archivada no pisa el puntaje de su ficha guardada."""
+        inicio = date(2024, 3, 1)
+        with ServidorStubMercadoPublico(licitaciones_por_dia=LICITACIONES_POR_DIA,
+                                        latencia_s=LATENCIA_S) as stub:
+            orquestador = self._orquestador(stub)
+            orquestador.procesar_rango_fechas(inicio, inicio)
+
+            with self.TestingSessionLocal() as sesion:
+                antes = sesion.query(Licitacion).filter_by(tiene_detalle=True).first()
+                codigo, puntaje, justificacion = antes.codigo_externo, antes.puntaje, antes.justificacion_puntaje
+                sesion.query(PayloadApi).filter_by(tipo=TIPO_PAYLOAD_DETALLE, clave=codigo).delete()
+                sesion.commit()
+
+            orquestador.reprocesar_desde_archivo(inicio, inicio)
+
+        with self.TestingSessionLocal() as sesion:
+            despues = sesion.query(Licitacion).filter_by(codigo_externo=codigo).one()
+            self.assertTrue(despues.tiene_detalle)
+            self.assertEqual(despues.puntaje, puntaje)
+            self.assertEqual(despues.justificacion_puntaje, justificacion)
+
+    def test_fallo_de_escritura_no_deja_hilos_bloqueados(self):
+        """Si la escritura falla, las demás etapas se detienen y terminan en vez de quedar bloqueadas."""
+        inicio = date(2024, 3, 1)
+        with ServidorStubMercadoPublico(licitaciones_por_dia=LICITACIONES_POR_DIA,
+                                        latencia_s=LATENCIA_S) as stub:
+            orquestador = self._orquestador(stub, tamanio_lote_escritura=5)
+            with patch("src.services.orquestador.PIPELINE_CAPACIDAD_COLA", 2), \
+                    patch.object(orquestador, "_confirmar_lote_pipeline", side_effect=RuntimeError("BD caída")):
+                with self.assertRaises(RuntimeError):
+                    orquestador.procesar_rango_fechas(inicio, inicio + timedelta(days=DIAS - 1))
+
+        vivos = [hilo.name for hilo in threading.enumerate() if hilo.name.startswith("ingesta-")]
+        self.assertEqual(vivos, [])
+
+    def test_transformacion_en_pool_de_procesos(self):
+        """Con pool de procesos se persisten los mismos registros que con la transformación en hilo."""
+        with ServidorStubMercadoPublico(licitaciones_por_dia=LICITACIONES_POR_DIA,
+                                        latencia_s=LATENCIA_S) as stub:
+            reporte = self._medir(stub, procesos_transformacion=2)
+
+        total_esperado = DIAS * LICITACIONES_POR_DIA
+        self.assertEqual(reporte["detalles_exitosos"], total_esperado // 2)
+        self.assertIn("transformacion_lote", reporte["tiempos"]["etapas"])
+        with self.TestingSessionLocal() as sesion:
+            self.assertEqual(sesion.query(Licitacion).count(), total_esperado)
+            self.assertEqual(sesion.query(LicitacionItem).count(), 3 * (total_esperado // 2))
+            con_fecha = sesion.query(Licitacion).filter(Licitacion.fecha_cierre.is_not(None)).count()
+        self.assertEqual(con_fecha, total_esperado)
+
+    def test_rangos_superpuestos_reutilizan_listados(self):
+        """Un segundo rango sobre días ya cerrados toma los listados del archivo local."""
+        with ServidorStubMercadoPublico(licitaciones_por_dia=LICITACIONES_POR_DIA,
+                                        latencia_s=LATENCIA_S) as stub:
+            self._medir(stub)
+            reporte = self._medir(stub, dias_adelantados=2)
+
+        self.assertEqual(reporte["peticiones_listado"], DIAS)
+        self.assertEqual(reporte["tiempos"]["contadores"]["listado_cache"], DIAS)
+        self.assertEqual(reporte["licitaciones"], DIAS * LICITACIONES_POR_DIA)
+
+    def test_listado_revalidado_con_etag(self):
+        """Sin vigencia local, el listado se revalida con una petición condicional (304)."""
+        with ServidorStubMercadoPublico(licitaciones_por_dia=LICITACIONES_POR_DIA,
+                                        latencia_s=LATENCIA_S) as stub:
+            self._medir(stub, horas_cache_listado=0)
+            reporte = self._medir(stub, horas_cache_listado=0)
+
+        self.assertEqual(reporte["peticiones_listado"], 2 * DIAS)
+        self.assertEqual(stub.contadores["no_modificado"], DIAS)
+        self.assertEqual(reporte["tiempos"]["contadores"]["listado_no_modificado"], DIAS)
+        self.assertEqual(reporte["licitaciones"], DIAS * LICITACIONES_POR_DIA)
+
+    def test_presupuesto_de_fichas_por_puntaje(self):
+        """Con presupuesto limitado, las fichas pedidas son las de mayor puntaje de título."""
+        with self.TestingSessionLocal() as sesion:
+            sesion.add(PalabraClave(palabra="mesa", puntaje_titulo=20,
+                                    puntaje_descripcion=0, puntaje_productos=0))
+            sesion.commit()
+
+        # Un cuarto de los títulos menciona 'mesa y silla' (30 puntos); otro cuarto solo 'silla' (10)
+        presupuesto = LICITACIONES_POR_DIA // 4
+        with ServidorStubMercadoPublico(licitaciones_por_dia=LICITACIONES_POR_DIA,
+                                        latencia_s=LATENCIA_S) as stub:
+            reporte = self._medir(stub, presupuesto_fichas=presupuesto, hilos_descarga=1)
+
+        candidatas = DIAS * LICITACIONES_POR_DIA // 2
+        self.assertEqual(reporte["peticiones_detalle"], presupuesto)
+        self.assertEqual(reporte["detalles_pendientes"], candidatas - presupuesto)
+        self.assertEqual(reporte["licitaciones"], DIAS * LICITACIONES_POR_DIA)
+        with self.TestingSessionLocal() as sesion:
+            nombres = {nombre for (nombre,) in sesion.query(Licitacion.nombre).filter_by(tiene_detalle=True)}
+            self.assertEqual(nombres, {"Compra de mesa y silla para comedor"})
+            self.assertEqual(sesion.query(ReintentoDetalle).count(), candidatas - presupuesto)
+
+    def test_presupuesto_no_aplica_al_reproceso_ni_pisa_fichas(self):
+        """
+        El reproceso desde el archivo no consume presupuesto, y una reejecución que deja
+        fichas fuera del presupuesto conserva la evaluación de las ya guardadas.
+        """
+        inicio = date(2024, 3, 1)
+
+        def evaluaciones() -> dict:
+            with self.TestingSessionLocal() as sesion:
+                return {l.codigo_externo: (l.puntaje, l.justificacion_puntaje)
+                        for l in sesion.query(Licitacion).filter_by(tiene_detalle=True)}
+
+        with ServidorStubMercadoPublico(licitaciones_por_dia=LICITACIONES_POR_DIA,
+                                        latencia_s=LATENCIA_S) as stub:
+            orquestador = self._orquestador(stub, hilos_descarga=1)
+            orquestador.procesar_rango_fechas(inicio, inicio)
+            guardadas = evaluaciones()
+
+            orquestador.presupuesto_fichas = 1
+            reejecucion = orquestador.procesar_rango_fechas(inicio, inicio)
+            reproceso = orquestador.reprocesar_desde_archivo(inicio, inicio)
+
+        self.assertEqual(reejecucion["detalles_pendientes"], len(guardadas) - 1)
+        self.assertEqual(reproceso["detalles_pendientes"], 0)
+        self.assertEqual(reproceso["detalles_exitosos"], len(guardadas))
+        self.assertEqual(evaluaciones(), guardadas)
+
+    def test_rendimiento_escala_con_tickets(self):
+        """Con un límite de tasa por ticket, dos tickets se reparten las fichas y reducen el tiempo."""
+        # La pausa domina el tiempo de la ingesta, como ocurre con el límite real de la API
+        pausa = 0.05
+        with ServidorStubMercadoPublico(licitaciones_por_dia=LICITACIONES_POR_DIA,
+                                        latencia_s=LATENCIA_S) as stub:
+            un_ticket = self._medir(stub, tickets=["T-ESCALA-1"], pausa_entre_peticiones=pausa)
+            dos_tickets = self._medir(stub, tickets=["T-ESCALA-2", "T-ESCALA-3"], pausa_entre_peticiones=pausa)
+            por_ticket = dict(stub.peticiones_por_ticket)
+
+        self.assertEqual(dos_tickets["detalles_exitosos"], un_ticket["detalles_exitosos"])
+        self.assertGreater(por_ticket["T-ESCALA-2"], dos_tickets["detalles_exitosos"] // 4)
+        self.assertGreater(por_ticket["T-ESCALA-3"], dos_tickets["detalles_exitosos"] // 4)
+        self.assertLess(dos_tickets["segundos"], un_ticket["segundos"])
+
+    def test_ticket_sin_cuota_se_rota(self):
+        """Un ticket que responde 429 se suspende y las fichas se obtienen con el otro."""
+        with ServidorStubMercadoPublico(licitaciones_por_dia=LICITACIONES_POR_DIA, latencia_s=LATENCIA_S,
+                                        tickets_agotados={"T-AGOTADO"}) as stub:
+            reporte = self._medir(stub, tickets=["T-AGOTADO", "T-SANO"])
+            por_ticket = dict(stub.peticiones_por_ticket)
+
+        candidatas = DIAS * LICITACIONES_POR_DIA // 2
+        self.assertEqual(reporte["detalles_exitosos"], candidatas)
+        self.assertEqual(reporte["detalles_pendientes"], 0)
+        self.assertGreater(reporte["tiempos"]["contadores"]["ticket_suspendido"], 0)
+        self.assertLess(por_ticket["T-AGOTADO"], por_ticket["T-SANO"])
+
+    def test_ingesta_con_errores_inyectados(self):
+        """Con errores 500 y 429 la ingesta termina y cada licitación queda contabilizada."""
+        with ServidorStubMercadoPublico(licitaciones_por_dia=LICITACIONES_POR_DIA, latencia_s=LATENCIA_S,
+                                        tasa_error=0.1, tasa_429=0.05) as stub:
+            reporte = self._medir(stub)
+
+        with self.TestingSessionLocal() as sesion:
+            guardadas = sesion.query(Licitacion).count()
+        self.assertEqual(guardadas, reporte["licitaciones"])
+        solicitadas = reporte["detalles_exitosos"] + reporte["detalles_pendientes"] + reporte["errores"]
+        self.assertEqual(solicitadas + reporte["detalles_omitidos"], reporte["licitaciones"])
+
+    def tearDown(self):
+        self.engine.dispose()
+        os.remove(self.ruta_bd)
+        self.directorio_metricas.cleanup()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,16 @@
+import os
 import unittest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 from src.bd.database import Base
 from src.bd.models import Licitacion, EstadoLicitacion, Organismo
-from src.repositories.licitaciones_repository import RepositorioLicitaciones
-from src.config.constantes import EtapaLicitacion, ESTADO_LICITACION_ACTIVA
+from src.repositories.licitaciones_repository import RepositorioLicitaciones, _prefiltro_lexemas
+from src.repositories.cache_paginas import CachePaginas
+from src.repositories.resumen_etapas import recalcular_resumen
+from src.config.constantes import EtapaLicitacion, ESTADO_LICITACION_ACTIVA, UMBRAL_PUNTAJE_CANDIDATA
+
+# Base PostgreSQL desechable para las pruebas de texto completo (p. ej. postgresql://localhost/pruebas)
+POSTGRES_PRUEBAS_URL = os.getenv("POSTGRES_PRUEBAS_URL")
 
 class TestRepositorioLicitaciones(unittest.TestCase):
     """
@@ -25,8 +31,9 @@ class TestRepositorioLicitaciones(unittest.TestCase):
         # 3. Configurar la fábrica de sesiones para este motor de prueba
         self.TestingSessionLocal = sessionmaker(bind=self.engine)
         
-        # 4. Instanciar el repositorio inyectando la sesión de pruebas
-        self.repo = RepositorioLicitaciones(session_factory=self.TestingSessionLocal)
+        # 4. Instanciar el repositorio inyectando la sesión de pruebas y una caché aislada
+        self.cache = CachePaginas()
+        self.repo = RepositorioLicitaciones(session_factory=self.TestingSessionLocal, cache=self.cache)
         
         # 5. Poblar con datos mínimos necesarios (Seed de prueba)
         self._preparar_datos_prueba()
@@ -81,14 +88,240 @@ class TestRepositorioLicitaciones(unittest.TestCase):
             lic = sesion.query(Licitacion).filter_by(codigo_externo=codigo).first()
             self.assertEqual(lic.etapa, nueva_etapa)
 
+    def test_mover_licitaciones_masivo(self):
+        """Un único UPDATE mueve todo el conjunto y retorna la cantidad de filas afectadas."""
+        afectadas = self.repo.mover_licitaciones(["TEST-01", "TEST-02", "NO-EXISTE"], EtapaLicitacion.IGNORADA.value)
+
+        self.assertEqual(afectadas, 2)
+        with self.TestingSessionLocal() as sesion:
+            etapas = {lic.etapa for lic in sesion.query(Licitacion).all()}
+        self.assertEqual(etapas, {EtapaLicitacion.IGNORADA.value})
+
+    def test_busqueda_texto_local(self):
+        """
+        El respaldo local (SQLite) encuentra términos sin importar tildes,
+        prioriza coincidencias en el nombre y resalta el fragmento.
+        """
+        with self.TestingSessionLocal() as sesion:
+            sesion.add_all([
+                Licitacion(codigo_externo="TXT-01", nombre="Servicio de aseo",
+                           descripcion="Incluye camión aljibe", etapa=EtapaLicitacion.CANDIDATA.value,
+                           puntaje=10, codigo_estado=ESTADO_LICITACION_ACTIVA),
+                Licitacion(codigo_externo="TXT-02", nombre="Adquisición de CAMIONES",
+                           etapa=EtapaLicitacion.CANDIDATA.value,
+                           puntaje=10, codigo_estado=ESTADO_LICITACION_ACTIVA),
+                Licitacion(codigo_externo="TXT-03", nombre="Arriendo de camión",
+                           etapa=EtapaLicitacion.OFERTADA.value),
+                # Fuera de la bandeja de candidatas: sin puntaje o ya no publicada
+                Licitacion(codigo_externo="TXT-04", nombre="Camión tolva",
+                           etapa=EtapaLicitacion.CANDIDATA.value,
+                           puntaje=UMBRAL_PUNTAJE_CANDIDATA, codigo_estado=ESTADO_LICITACION_ACTIVA),
+                Licitacion(codigo_externo="TXT-05", nombre="Camión grúa", puntaje=10),
+            ])
+            sesion.commit()
+
+        resultados = self.repo.buscar_licitaciones("camion", etapa=EtapaLicitacion.CANDIDATA.value)
+
+        codigos = [licitacion.codigo_externo for licitacion, _, _ in resultados]
+        self.assertEqual(codigos, ["TXT-02", "TXT-01"])
+        self.assertIn("<b>camión</b>", resultados[1][2])
+
+    def test_busqueda_terminos_repartidos_entre_nombre_y_detalle(self):
+        """Una licitación coincide aunque un término esté en el nombre y otro en el detalle."""
+        with self.TestingSessionLocal() as sesion:
+            sesion.add_all([
+                Licitacion(codigo_externo="TXT-10", nombre="Adquisición de sillas",
+                           descripcion="Para el comedor del personal"),
+                Licitacion(codigo_externo="TXT-11", nombre="Adquisición de sillas"),
+            ])
+            sesion.commit()
+
+        resultados = self.repo.buscar_licitaciones("silla comedor")
+
+        self.assertEqual([licitacion.codigo_externo for licitacion, _, _ in resultados], ["TXT-10"])
+
+    def test_detalle_cargado_bajo_demanda(self):
+        """La ficha técnica trae los textos extensos; el tooltip los consulta por separado."""
+        with self.TestingSessionLocal() as sesion:
+            licitacion = sesion.query(Licitacion).filter_by(codigo_externo="TEST-01").one()
+            licitacion.descripcion = "Descripción extensa"
+            licitacion.justificacion_puntaje = "[TÍTULO] prueba (+50)"
+            sesion.commit()
+
+        ficha = self.repo.obtener_licitacion_por_codigo("TEST-01")
+
+        # La sesión ya está cerrada: los textos deben venir precargados
+        self.assertEqual(ficha.descripcion, "Descripción extensa")
+        self.assertEqual(self.repo.obtener_justificacion("TEST-01"), "[TÍTULO] prueba (+50)")
+        self.assertIsNone(self.repo.obtener_justificacion("TEST-02"))
+
     def test_obtener_licitacion_inexistente(self):
         """Asegura que el repositorio maneje correctamente códigos que no están en la BD."""
         resultado = self.repo.obtener_licitacion_por_codigo("CODIGO-FALSO")
         self.assertIsNone(resultado)
 
+    def test_cache_evita_consulta_repetida(self):
+        """La segunda lectura de una página se sirve desde la caché sin volver a consultar."""
+        primera = self.repo.obtener_seguimiento(limit=10, offset=0)
+
+        # Modificamos la BD por fuera del repositorio: la caché no debe enterarse
+        with self.TestingSessionLocal() as sesion:
+            sesion.query(Licitacion).filter_by(codigo_externo="TEST-02").delete()
+            sesion.commit()
+
+        segunda = self.repo.obtener_seguimiento(limit=10, offset=0)
+        self.assertEqual([l.codigo_externo for l in primera], [l.codigo_externo for l in segunda])
+
+    def test_cache_entrega_copias_independientes(self):
+        """Cada lectura recibe sus propias instancias; modificar una no altera la caché."""
+        self.repo.obtener_seguimiento(limit=10, offset=0)
+        primera = self.repo.obtener_seguimiento(limit=10, offset=0)
+        segunda = self.repo.obtener_seguimiento(limit=10, offset=0)
+
+        self.assertIsNot(primera[0], segunda[0])
+        self.assertIsNot(primera[0].estado, segunda[0].estado)
+        primera[0].nombre = "Modificado por un llamador"
+        self.assertNotEqual(segunda[0].nombre, "Modificado por un llamador")
+        self.assertEqual(segunda[0].estado.descripcion, primera[0].estado.descripcion)
+
+    def test_cache_descarta_pagina_consultada_antes_de_invalidar(self):
+        """Una página leída antes de una invalidación concurrente no se almacena."""
+        etapa = EtapaLicitacion.SEGUIMIENTO.value
+        generacion = self.cache.generacion
+        pagina = self.repo.obtener_seguimiento(limit=10, offset=0)
+        self.cache.invalidar_todo()
+
+        self.cache.guardar(etapa, 10, 0, pagina, generacion)
+        self.assertIsNone(self.cache.obtener(etapa, 10, 0))
+
+        self.cache.guardar(etapa, 10, 0, pagina, self.cache.generacion)
+        self.assertIsNotNone(self.cache.obtener(etapa, 10, 0))
+
+    def test_mover_invalida_solo_etapas_afectadas(self):
+        """Mover candidata -> seguimiento invalida esas dos etapas y conserva el resto."""
+        self.repo.obtener_candidatas(limit=10, offset=0)
+        self.repo.obtener_seguimiento(limit=10, offset=0)
+        self.repo.obtener_ofertadas(limit=10, offset=0)
+
+        self.repo.mover_licitacion("TEST-01", EtapaLicitacion.SEGUIMIENTO.value)
+
+        self.assertIsNone(self.cache.obtener(EtapaLicitacion.CANDIDATA.value, 10, 0))
+        self.assertIsNone(self.cache.obtener(EtapaLicitacion.SEGUIMIENTO.value, 10, 0))
+        self.assertIsNotNone(self.cache.obtener(EtapaLicitacion.OFERTADA.value, 10, 0))
+
+        codigos = [l.codigo_externo for l in self.repo.obtener_seguimiento(limit=10, offset=0)]
+        self.assertEqual(codigos, ["TEST-02", "TEST-01"])
+
+    def test_cache_acotada_por_memoria(self):
+        """Las páginas menos usadas se expulsan al superar el presupuesto de memoria."""
+        cache = CachePaginas(limite_bytes=4000)
+        pagina = [Licitacion(codigo_externo=f"X-{i}", nombre="n" * 300) for i in range(2)]
+
+        for desplazamiento in range(0, 100, 10):
+            cache.guardar(EtapaLicitacion.CANDIDATA.value, 10, desplazamiento, pagina)
+
+        self.assertLessEqual(cache.bytes_en_uso, 4000)
+        self.assertIsNone(cache.obtener(EtapaLicitacion.CANDIDATA.value, 10, 0))
+        self.assertIsNotNone(cache.obtener(EtapaLicitacion.CANDIDATA.value, 10, 90))
+
+    def test_resumen_etapas_incremental(self):
+        """Los contadores se ajustan en cada movimiento y coinciden con un recálculo completo."""
+        with self.TestingSessionLocal() as sesion:
+            recalcular_resumen(sesion)
+            sesion.commit()
+
+        self.assertEqual(self.repo.obtener_totales_etapas(), {
+            EtapaLicitacion.CANDIDATA.value: 1,
+            EtapaLicitacion.SEGUIMIENTO.value: 1,
+        })
+
+        self.repo.mover_licitaciones(["TEST-01"], EtapaLicitacion.OFERTADA.value)
+        totales = self.repo.obtener_totales_etapas()
+        self.assertEqual(totales.get(EtapaLicitacion.CANDIDATA.value, 0), 0)
+        self.assertEqual(totales[EtapaLicitacion.OFERTADA.value], 1)
+
+        # Tramo de 50 a 99 puntos (ver LIMITES_TRAMOS_PUNTAJE)
+        self.assertEqual(self.repo.obtener_histograma_puntajes(EtapaLicitacion.OFERTADA.value), [0, 0, 0, 1, 0, 0])
+
+        with self.TestingSessionLocal() as sesion:
+            recalcular_resumen(sesion)
+            sesion.commit()
+        self.assertEqual(self.repo.obtener_totales_etapas(), totales)
+
+    def test_prefiltro_solo_lexemas_positivos(self):
+        """El prefiltro de los índices GIN es la disyunción de los lexemas que deja querytree."""
+        self.assertEqual(_prefiltro_lexemas("'mesa' <-> 'plegabl' & 'silla'"), "'mesa' | 'plegabl' | 'silla'")
+        self.assertEqual(_prefiltro_lexemas("'o''higgins' & 'o''higgins'"), "'o''higgins'")
+        self.assertIsNone(_prefiltro_lexemas("T"))
+
     def tearDown(self):
         """Limpia los recursos después de cada test."""
         Base.metadata.drop_all(self.engine)
 
+
+@unittest.skipUnless(POSTGRES_PRUEBAS_URL, "requiere POSTGRES_PRUEBAS_URL")
+class TestBusquedaTextoPostgreSQL(unittest.TestCase):
+    """
+    Búsqueda de texto completo contra un PostgreSQL real, con los índices GIN
+    y la columna generada que crea la migración del detalle.
+    """
+
+    def setUp(self):
+        self.engine = create_engine(POSTGRES_PRUEBAS_URL)
+        Base.metadata.create_all(self.engine)
+        with self.engine.begin() as conexion:
+            conexion.execute(text("""
+                CREATE INDEX ix_licitaciones_nombre_tsv ON licitaciones
+                USING gin (to_tsvector('spanish', coalesce(nombre, '')))
+            """))
+            conexion.execute(text("""
+                ALTER TABLE licitacion_detalle ADD COLUMN busqueda tsvector
+                GENERATED ALWAYS AS (
+                    setweight(to_tsvector('spanish', coalesce(descripcion, '')), 'B') ||
+                    setweight(to_tsvector('spanish', coalesce(detalle_productos, '')), 'C')
+                ) STORED
+            """))
+            conexion.execute(text(
+                "CREATE INDEX ix_licitacion_detalle_busqueda ON licitacion_detalle USING gin (busqueda)"
+            ))
+
+        self.TestingSessionLocal = sessionmaker(bind=self.engine)
+        self.repo = RepositorioLicitaciones(session_factory=self.TestingSessionLocal, cache=CachePaginas())
+
+        with self.TestingSessionLocal() as sesion:
+            sesion.add_all([
+                Licitacion(codigo_externo="PG-01", nombre="Adquisición de sillas",
+                           descripcion="Para el comedor del personal"),
+                Licitacion(codigo_externo="PG-02", nombre="Adquisición de sillas"),
+                Licitacion(codigo_externo="PG-03", nombre="Mesa plegable de aluminio"),
+                Licitacion(codigo_externo="PG-04", nombre="Mesa de centro",
+                           descripcion="Estructura plegable"),
+            ])
+            sesion.commit()
+
+    def _codigos(self, texto: str) -> set:
+        return {licitacion.codigo_externo for licitacion, _, _ in self.repo.buscar_licitaciones(texto)}
+
+    def test_varios_terminos_repartidos(self):
+        """Los términos pueden repartirse entre el nombre y el detalle."""
+        self.assertEqual(self._codigos("silla comedor"), {"PG-01"})
+
+    def test_termino_negado(self):
+        """Una negación no amplía la preselección ni deja pasar a las excluidas."""
+        self.assertEqual(self._codigos("silla -comedor"), {"PG-02"})
+
+    def test_frase(self):
+        """La frase exige los lexemas contiguos, no basta con que aparezcan ambos."""
+        self.assertEqual(self._codigos('"mesa plegable"'), {"PG-03"})
+
+    def test_solo_negaciones(self):
+        """Sin lexemas positivos se recorre la tabla completa."""
+        self.assertEqual(self._codigos("-comedor"), {"PG-02", "PG-03", "PG-04"})
+
+    def tearDown(self):
+        Base.metadata.drop_all(self.engine)
+        self.engine.dispose()
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
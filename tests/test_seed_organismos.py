@@ -0,0 +1,75 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.bd.database import Base
+from src.bd.models import Organismo
+from seed_organismos import cargar_organismos_desde_csv
+
+class TestSemillaOrganismos(unittest.TestCase):
+    """
+    Valida la carga masiva del directorio: diferencia en memoria contra
+    los códigos existentes y persistencia por bloques.
+    """
+
+    def setUp(self):
+        self.engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(self.engine)
+        self.TestingSessionLocal = sessionmaker(bind=self.engine)
+        self.directorio = tempfile.TemporaryDirectory()
+        self.ruta_csv = os.path.join(self.directorio.name, "organismos.csv")
+
+        with self.TestingSessionLocal() as sesion:
+            sesion.add(Organismo(codigo="100", nombre="MUNICIPALIDAD ANTIGUA", puntaje=50))
+            sesion.add(Organismo(codigo="200", nombre="HOSPITAL REGIONAL", puntaje=-10))
+            sesion.commit()
+
+    def _escribir_csv(self, filas):
+        with open(self.ruta_csv, "w", encoding="utf-8-sig") as archivo:
+            archivo.write("Nombre de la institución;Sector;Código;Id. Sector\n")
+            for nombre, codigo in filas:
+                archivo.write(f"{nombre};Otros;{codigo};6\n")
+
+    def test_inserta_nuevos_y_renombra_existentes(self):
+        """Los nuevos se insertan, los renombrados se actualizan y el puntaje se preserva."""
+        self._escribir_csv([
+            ("MUNICIPALIDAD RENOMBRADA", "100"),
+            ("HOSPITAL REGIONAL", "200"),
+            ("SERVICIO NUEVO", "300"),
+            ("SERVICIO NUEVO BIS", "400"),
+        ])
+
+        with redirect_stdout(io.StringIO()):
+            resumen = cargar_organismos_desde_csv(self.ruta_csv, self.TestingSessionLocal, tamanio_bloque=2)
+
+        self.assertEqual(resumen["nuevos"], 2)
+        self.assertEqual(resumen["actualizados"], 1)
+        self.assertEqual(resumen["sin_cambios"], 1)
+
+        with self.TestingSessionLocal() as sesion:
+            renombrado = sesion.get(Organismo, "100")
+            self.assertEqual(renombrado.nombre, "MUNICIPALIDAD RENOMBRADA")
+            self.assertEqual(renombrado.puntaje, 50)
+            self.assertEqual(sesion.get(Organismo, "300").puntaje, 0)
+            self.assertEqual(sesion.query(Organismo).count(), 4)
+
+    def test_codigos_repetidos_entre_bloques(self):
+        """Un código repetido en bloques distintos no provoca inserciones duplicadas."""
+        self._escribir_csv([("A", "500"), ("B", "600"), ("A CORREGIDO", "500")])
+
+        with redirect_stdout(io.StringIO()):
+            cargar_organismos_desde_csv(self.ruta_csv, self.TestingSessionLocal, tamanio_bloque=2)
+
+        with self.TestingSessionLocal() as sesion:
+            self.assertEqual(sesion.get(Organismo, "500").nombre, "A CORREGIDO")
+            self.assertEqual(sesion.query(Organismo).count(), 4)
+
+    def tearDown(self):
+        self.directorio.cleanup()
+        Base.metadata.drop_all(self.engine)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -65,6 +65,21 @@ class TestTransformadorAPI(unittest.TestCase):
         self.assertIn("Detalle: Silla de oficina negra", texto)
         self.assertIn("- Mesa de Escritorio (2 Unidad)", texto)
 
+    def test_extraer_items_estructurados(self):
+        """Los ítems se normalizan a registros con tipos nativos, listos para 'licitacion_items'."""
+        datos = {"Items": {"Listado": [
+            {"Correlativo": "1", "CodigoProducto": 56101504, "NombreProducto": "Silla",
+             "Cantidad": "10", "UnidadMedida": "Unidad", "Descripcion": "Silla de oficina"},
+            {"NombreProducto": "Mesa"},
+        ]}}
+        items = TransformadorAPI.extraer_items(datos)
+
+        self.assertEqual(items[0]["correlativo"], 1)
+        self.assertEqual(items[0]["codigo_producto"], "56101504")
+        self.assertEqual(items[0]["cantidad"], 10.0)
+        self.assertIsNone(items[1]["cantidad"])
+        self.assertEqual(TransformadorAPI.texto_evaluable_items(items), "Silla Silla de oficina Mesa ")
+
     def test_construir_texto_productos_vacio(self):
         """Asegura que el sistema no falle si la licitación no tiene ítems declarados."""
         datos_sin_items = {"Items": {"Listado": []}}
@@ -89,5 +104,20 @@ class TestTransformadorAPI(unittest.TestCase):
         self.assertIn("- Papel (1 Resma)", texto)
         self.assertNotIn("Detalle: papel", texto)
 
+    def test_construir_registro_db_no_retiene_payload(self):
+        """El registro compacto copia solo lo persistible y no admite atributos extra."""
+        datos = dict(self.datos_api_completos, CodigoExterno="100-1-LE24", Nombre="Sillas", Estado="Publicada",
+                     Comprador={"CodigoOrganismo": "7001", "NombreOrganismo": "Municipalidad"},
+                     _PuntajeCalculado=15, _TieneDetalle=True, _EstadoDescarga="exitoso")
+
+        registro = TransformadorAPI.construir_registro_db(datos)
+
+        self.assertFalse(hasattr(registro, "__dict__"))
+        self.assertEqual(registro.codigo_organismo, "7001")
+        self.assertEqual(registro.nombre_organismo, "Municipalidad")
+        self.assertEqual(registro.estado_descarga, "exitoso")
+        self.assertEqual(len(registro.items), 2)
+        self.assertEqual(registro.fecha_cierre, datetime(2024, 3, 20, 15, 0, tzinfo=timezone.utc))
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
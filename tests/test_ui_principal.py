@@ -53,4 +53,101 @@ def test_marcar_desactualizado_global(app):
     
     # Verificamos que se marcaron como True (Dirty Flag)
     assert app.vista_candidatas.necesita_actualizacion is True
-    assert app.vista_seguimiento.necesita_actualizacion is True
\ No newline at end of file
+    assert app.vista_seguimiento.necesita_actualizacion is True
+
+
+def _licitacion_falsa(codigo: str, puntaje: int):
+    """Construye un objeto mínimo con los atributos que consume poblar_tabla."""
+    from types import SimpleNamespace
+    return SimpleNamespace(codigo_externo=codigo, nombre=f"Licitación {codigo}", puntaje=puntaje,
+                           justificacion_puntaje="", fecha_cierre=None, estado=None, codigo_estado=5)
+
+
+def test_movimiento_optimista_confirmado(app, qtbot):
+    """
+    La fila desaparece de inmediato y, al confirmar la BD, solo la vista
+    de destino queda marcada para recarga.
+    """
+    from unittest.mock import MagicMock
+    vista = app.vista_candidatas
+    vista.repositorio = MagicMock()
+    vista.repositorio.mover_licitaciones.return_value = 1
+    vista.poblar_tabla([_licitacion_falsa("A-1", 30), _licitacion_falsa("B-2", 20)], Qt.darkGreen)
+    app.vista_seguimiento.necesita_actualizacion = False
+    app.vista_ofertadas.necesita_actualizacion = False
+
+    with qtbot.waitSignal(vista.licitacion_movida, timeout=3000):
+        vista.mover_etapa("A-1", "seguimiento")
+        assert vista.tabla.rowCount() == 1
+
+    assert vista.tabla.item(0, 1).text() == "B-2"
+    assert app.vista_seguimiento.necesita_actualizacion is True
+    assert app.vista_ofertadas.necesita_actualizacion is False
+
+def test_movimiento_optimista_revertido(app, qtbot, monkeypatch):
+    """Si la BD rechaza el cambio, la fila se restituye en su posición original."""
+    from unittest.mock import MagicMock
+    from PySide6.QtWidgets import QMessageBox
+    monkeypatch.setattr(QMessageBox, "warning", MagicMock())
+
+    vista = app.vista_candidatas
+    vista.repositorio = MagicMock()
+    vista.repositorio.mover_licitaciones.return_value = 0
+    vista.poblar_tabla([_licitacion_falsa("A-1", 30), _licitacion_falsa("B-2", 20)], Qt.darkGreen)
+
+    vista.mover_etapa("A-1", "ofertada")
+    assert vista.tabla.rowCount() == 1
+
+    qtbot.waitUntil(lambda: vista.tabla.rowCount() == 2, timeout=3000)
+    assert vista.tabla.item(0, 1).text() == "A-1"
+    QMessageBox.warning.assert_called_once()
+
+def test_movimiento_masivo_de_seleccion(app, qtbot):
+    """Varias filas seleccionadas se mueven con una única llamada al repositorio."""
+    from unittest.mock import MagicMock
+    from PySide6.QtCore import QItemSelectionModel
+    vista = app.vista_candidatas
+    vista.repositorio = MagicMock()
+    vista.repositorio.mover_licitaciones.return_value = 2
+    vista.poblar_tabla([_licitacion_falsa(c, 10) for c in ("A-1", "B-2", "C-3")], Qt.darkGreen)
+
+    vista.tabla.selectRow(0)
+    vista.tabla.selectionModel().select(
+        vista.tabla.model().index(2, 0),
+        QItemSelectionModel.Select | QItemSelectionModel.Rows
+    )
+    codigos = vista.codigos_seleccionados(vista.tabla.item(2, 1))
+    assert codigos == ["A-1", "C-3"]
+
+    with qtbot.waitSignal(vista.licitacion_movida, timeout=3000):
+        vista.mover_etapas(codigos, "seguimiento")
+
+    vista.repositorio.mover_licitaciones.assert_called_once_with(["A-1", "C-3"], "seguimiento")
+    assert vista.tabla.rowCount() == 1
+    assert vista.tabla.item(0, 1).text() == "B-2"
+
+def test_filtro_organismos_difuso(app):
+    """El filtro de organismos tolera tildes y errores de tipeo usando el índice de trigramas."""
+    from types import SimpleNamespace
+    from unittest.mock import MagicMock
+    vista = app.vista_herramientas.vista_puntajes.vista_organismos
+    vista.controlador = MagicMock()
+    vista.controlador.obtener_todos.return_value = [
+        SimpleNamespace(codigo="1", nombre="Municipalidad de Ñuñoa", puntaje=0),
+        SimpleNamespace(codigo="2", nombre="Ministerio de Salud", puntaje=100),
+        SimpleNamespace(codigo="3", nombre="Hospital San José", puntaje=-50),
+    ]
+    vista.cargar_datos()
+
+    vista.input_buscar.setText("minsterio")
+    vista.aplicar_filtro()
+
+    grupos_visibles = vista.proxy.rowCount()
+    assert grupos_visibles == 1
+    grupo = vista.proxy.index(0, 0)
+    assert vista.proxy.rowCount(grupo) == 1
+    assert vista.proxy.index(0, 0, grupo).data() == "Ministerio de Salud"
+
+    vista.input_buscar.setText("")
+    vista.aplicar_filtro()
+    assert vista.proxy.rowCount() == 2